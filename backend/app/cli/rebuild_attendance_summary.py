@@ -0,0 +1,51 @@
+"""
+Backfill or repair daily_attendance_summary from attendance_sessions.
+
+Each window of --window-days is rebuilt and committed in its own transaction, so a
+backfill of years of history holds no long-running transaction and can be interrupted
+and re-run. Run it once after migrating a database that already has attendance history.
+
+Usage (from backend/):
+    python -m app.cli.rebuild_attendance_summary [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import argparse
+from datetime import datetime
+
+from app.core.database import engine
+from app.services.attendance_summary_service import rebuild_daily_summary, summary_date_range, summary_windows
+
+
+def _date(value: str):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def rebuild_in_batches(bind, start_date=None, end_date=None, window_days: int = 31):
+    """Rebuild [start_date, end_date] (default: all history), committing each window. Returns rows written."""
+    if start_date is None or end_date is None:
+        with bind.connect() as conn:
+            history = summary_date_range(conn)
+        if history is None:
+            return 0
+        start_date = start_date or history[0]
+        end_date = end_date or history[1]
+
+    written = 0
+    for window_start, window_end in summary_windows(start_date, end_date, window_days):
+        with bind.begin() as conn:
+            written += rebuild_daily_summary(conn, window_start, window_end, window_days)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily_attendance_summary from attendance_sessions.")
+    parser.add_argument("--start", type=_date, help="First date to rebuild (default: earliest session)")
+    parser.add_argument("--end", type=_date, help="Last date to rebuild, inclusive (default: latest session)")
+    parser.add_argument("--window-days", type=int, default=31, help="Days rebuilt and committed per transaction")
+    args = parser.parse_args()
+
+    written = rebuild_in_batches(engine, args.start, args.end, args.window_days)
+    print(f"Rebuilt {written} daily summary rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,5 +13,105 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 
 
 
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL can be set directly (e.g. sqlite:///./bench.db for local benchmarks)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Async driver for the same database: aiomysql in production, aiosqlite for local SQLite runs
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    DATABASE_URL
+    .replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    .replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+# Connection pool (ignored for SQLite). Recycle below MySQL's wait_timeout so idle
+# connections are replaced before the server drops them.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Background export jobs (Excel/PDF rendering in a process pool)
+EXPORT_POOL_SIZE = int(os.getenv("EXPORT_POOL_SIZE", "2"))
+EXPORT_QUEUE_DEPTH = int(os.getenv("EXPORT_QUEUE_DEPTH", "20"))
+EXPORT_JOB_RETENTION_SECONDS = int(os.getenv("EXPORT_JOB_RETENTION_SECONDS", "3600"))
+
+# Validated access-token cache used by get_current_user
+TOKEN_CACHE_ENABLED = os.getenv("TOKEN_CACHE_ENABLED", "true").lower() == "true"
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+# Optional shared backend (e.g. redis://localhost:6379/0) so every worker sees logouts immediately
+TOKEN_CACHE_URL = os.getenv("TOKEN_CACHE_URL")
+
+# GET /user/ total counts are cached per search term for this long
+USER_COUNT_CACHE_TTL_SECONDS = int(os.getenv("USER_COUNT_CACHE_TTL_SECONDS", "60"))
+
+# Password hashing: bcrypt cost, and the process pool that verifies logins off the event loop.
+# Hashes outside [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS] are re-hashed at BCRYPT_ROUNDS on the next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", str(BCRYPT_ROUNDS)))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", str(BCRYPT_ROUNDS)))
+# 0 verifies in the thread pool of the serving process instead
+PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", "2"))
+PASSWORD_QUEUE_DEPTH = int(os.getenv("PASSWORD_QUEUE_DEPTH", "64"))
+
+# Per-request timing / SQL instrumentation (Server-Timing header and /metrics)
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "true").lower() == "true"
+# /metrics answers admins' access tokens, and this static bearer token when set (for Prometheus'
+# bearer_token / authorization scrape config)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Warn when one request runs the same statement shape more often than this (likely N+1)
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+# Stored punch responses are replayed for retries with the same Idempotency-Key for this long
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# Serialized admin daily view (GET /attendance/) cache; punches invalidate the day they touch
+DAILY_VIEW_CACHE_ENABLED = os.getenv("DAILY_VIEW_CACHE_ENABLED", "true").lower() == "true"
+# Upper bound on staleness for today when another worker (without a shared backend) takes the punch
+DAILY_VIEW_CACHE_TODAY_TTL_SECONDS = int(os.getenv("DAILY_VIEW_CACHE_TODAY_TTL_SECONDS", "30"))
+# Past days are only invalidated by punches, so this bounds staleness from user changes (0 keeps them
+# until evicted or invalidated)
+DAILY_VIEW_CACHE_PAST_TTL_SECONDS = int(os.getenv("DAILY_VIEW_CACHE_PAST_TTL_SECONDS", "3600"))
+DAILY_VIEW_CACHE_MAX_DATES = int(os.getenv("DAILY_VIEW_CACHE_MAX_DATES", "400"))
+# Optional shared backend (e.g. redis://localhost:6379/1) so every worker sees invalidations
+DAILY_VIEW_CACHE_URL = os.getenv("DAILY_VIEW_CACHE_URL")
+
+# Live attendance feed (SSE / WebSocket). Optional shared broker (e.g. redis://localhost:6379/2)
+# so punches taken by one uvicorn worker reach dashboards connected to the others
+LIVE_FEED_BROKER_URL = os.getenv("LIVE_FEED_BROKER_URL")
+# Unsent frames kept per connection before the oldest are dropped and the client is told to resync
+LIVE_FEED_BUFFER_SIZE = int(os.getenv("LIVE_FEED_BUFFER_SIZE", "256"))
+LIVE_FEED_HEARTBEAT_SECONDS = int(os.getenv("LIVE_FEED_HEARTBEAT_SECONDS", "25"))
+LIVE_FEED_MAX_CONNECTIONS = int(os.getenv("LIVE_FEED_MAX_CONNECTIONS", "10000"))
+
+# Range attendance reports (GET /attendance/report): local timezone of the office, the time after
+# which a first punch-in counts as late, the working weekdays (0 = Monday) and the longest range
+REPORT_TIMEZONE = os.getenv("REPORT_TIMEZONE", "Asia/Kolkata")
+LATE_ARRIVAL_AFTER = os.getenv("LATE_ARRIVAL_AFTER", "09:45")
+REPORT_WORKDAYS = [int(day) for day in os.getenv("REPORT_WORKDAYS", "0,1,2,3,4").split(",") if day.strip()]
+REPORT_MAX_DAYS = int(os.getenv("REPORT_MAX_DAYS", "366"))
+
+# Rows per row group (Parquet) / record batch (Arrow IPC) in typed exports
+EXPORT_ROW_GROUP_SIZE = int(os.getenv("EXPORT_ROW_GROUP_SIZE", "65536"))
+
+# Timezone export times are shown in unless a request passes its own (?tz=Europe/London)
+DISPLAY_TIMEZONE = os.getenv("DISPLAY_TIMEZONE", REPORT_TIMEZONE)
+
+# Export files are reused while their data is unchanged. The sweeper deletes files unused for
+# EXPORT_CACHE_TTL_SECONDS, then the least recently used ones until exports/ fits EXPORT_CACHE_MAX_MB
+EXPORT_CACHE_ENABLED = os.getenv("EXPORT_CACHE_ENABLED", "true").lower() == "true"
+EXPORT_CACHE_TTL_SECONDS = int(os.getenv("EXPORT_CACHE_TTL_SECONDS", "86400"))
+EXPORT_CACHE_MAX_MB = int(os.getenv("EXPORT_CACHE_MAX_MB", "2048"))
+# 0 disables the sweeper (e.g. when a cron job or another worker already runs it)
+EXPORT_CACHE_SWEEP_SECONDS = int(os.getenv("EXPORT_CACHE_SWEEP_SECONDS", "300"))
+
+# Export download links (GET /attendance/files/{name}) are signed with this key and expire after
+# DOWNLOAD_URL_TTL_SECONDS (links are reused for up to twice that, so repeat downloads hit caches)
+DOWNLOAD_URL_SECRET = os.getenv("DOWNLOAD_URL_SECRET") or JWT_SECRET
+DOWNLOAD_URL_TTL_SECONDS = int(os.getenv("DOWNLOAD_URL_TTL_SECONDS", "900"))
+# The sweeper keeps files used within this window, so a link handed out for a cached file stays valid
+EXPORT_CACHE_LEASE_SECONDS = int(os.getenv("EXPORT_CACHE_LEASE_SECONDS", str(2 * DOWNLOAD_URL_TTL_SECONDS)))
+# Hand the transfer to nginx (sendfile, ranges) through X-Accel-Redirect: the internal location that
+# aliases exports/, e.g. /protected-exports/. Unset, the API streams the file itself
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.getenv("DOWNLOAD_ACCEL_REDIRECT_PREFIX")
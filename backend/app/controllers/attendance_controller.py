@@ -1,59 +1,310 @@
-from fastapi import Depends, Request
+from fastapi import Depends, Request, HTTPException, WebSocket, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.utils.response import success_response, error_response
-from app.schemas.attendance_session import PunchInRequest
-from app.services.attendance_service import punch_in, handle_punch_out, fetch_user_attendance, fetch_all_attendance, get_attendance_export
+from app.utils.json_response import typed_json_response
+from app.schemas.attendance_session import PunchInRequest, ExportJobRequest, BulkPunchRequest, DAILY_ATTENDANCE_RESPONSE, USER_ATTENDANCE_RESPONSE
+from app.services.punch_ingestion_service import ingest_punch_events
+from app.services.export_job_service import create_export_job, get_export_job
+from app.services.attendance_report_service import REPORT_FORMATS, REPORT_GROUPINGS, stream_attendance_report, validate_report_range
+from app.services.attendance_service import punch_in, handle_punch_out, fetch_user_attendance, fetch_all_attendance, get_attendance_export, stream_attendance_csv
 from app.middlewares.auth import get_current_user
+from app.utils.timezones import business_date, resolve_display_timezone
+from app.utils.attendance_view_cache import CachedView, get_daily_view, store_daily_view
+from app.utils.export_cache import find_export
+from app.utils.file_exporter import check_export_format
+from app.utils.signed_downloads import sign_download, verify_download
+from app.core.live_feed import connection_count, subscribe, unsubscribe
+from app.config.settings import DOWNLOAD_ACCEL_REDIRECT_PREFIX, LIVE_FEED_HEARTBEAT_SECONDS, LIVE_FEED_MAX_CONNECTIONS
 from typing import Optional
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import os
+import time
 from datetime import date,datetime
 from app.schemas.user_schema import UserSchema
-from app.models.user import User
+from app.models.user import User, UserRole
 
 
-def punch_in_controller(request: PunchInRequest, db: Session = Depends(get_db), user = Depends(get_current_user)):
+async def punch_in_controller(request: PunchInRequest, db: AsyncSession = Depends(get_async_db), user = Depends(get_current_user)):
     try:
-        session = punch_in(user, db, request.date)
+        session = await punch_in(user.id, db)
         return success_response("Punch-in successful", session)
     except Exception as e:
         return error_response(str(e), status_code=400)
     
     
-def punch_out(user_id: int, db):
+async def punch_out(user_id: int, db: AsyncSession):
     try:
-        result = handle_punch_out(user_id, db)
+        result = await handle_punch_out(user_id, db)
         return success_response("Punch out successful", result)
     except Exception as e:
         return error_response(str(e), status_code=400)
     
 
-def get_user_attendance(user_id: int, db, date=None, month=None, year=None):
+async def get_user_attendance(user_id: int, db: AsyncSession, date=None, month=None, year=None,
+                              start_date=None, end_date=None):
     try:
-        result = fetch_user_attendance(user_id, db, date, month, year)
-        return success_response("Attendance fetched successfully", result)
+        if start_date and end_date and end_date < start_date:
+            raise ValueError("end_date must be on or after start_date.")
+        result = await fetch_user_attendance(user_id, db, date, month, year, start_date, end_date)
+        return typed_json_response(USER_ATTENDANCE_RESPONSE, success_response("Attendance fetched successfully", result))
     except Exception as e:
         return error_response(str(e), status_code=400)
    
     
-def get_all_attendance(selected_date: Optional[date], current_user: UserSchema):
+def _is_admin(user) -> bool:
+    return user.role in (UserRole.admin, UserRole.super_admin)
+
+
+# Company-wide attendance (the daily view, /download/all and scope="all" jobs) is for admins only
+ADMIN_ONLY = "Only admins can view or export everyone's attendance."
+
+
+def _not_modified(request: Request, etag: str, last_modified: float):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _cached_view_response(request: Request, view: CachedView):
+    headers = {
+        "ETag": view.etag,
+        "Last-Modified": formatdate(view.last_modified, usegmt=True),
+        # Browsers may keep the body but must revalidate; unchanged polls get a bodiless 304
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(request, view.etag, view.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=view.body, media_type="application/json", headers=headers)
+
+
+async def get_all_attendance(selected_date: Optional[date], db: AsyncSession, current_user: UserSchema, request: Request):
+    # The business day punches are dated (and invalidate) by, not the server's local date
+    if not _is_admin(current_user):
+        return error_response(ADMIN_ONLY, status_code=403)
+    selected_date = selected_date or business_date(datetime.utcnow())
     try:
-        result = fetch_all_attendance(selected_date)
-        return success_response("Users attendance fetched successfully", result)
+        view, generation = get_daily_view(selected_date)
+        if view is None:
+            result = await fetch_all_attendance(selected_date, db)
+            body = DAILY_ATTENDANCE_RESPONSE.dump_json(success_response("Users attendance fetched successfully", result))
+            view = store_daily_view(selected_date, body, generation)
     except Exception as e:
         return error_response(str(e), status_code=500)
+    return _cached_view_response(request, view)
+
+def _parse_date_range(selected_date: Optional[str], start_date: Optional[str], end_date: Optional[str]):
+    """start_date/end_date take precedence over the single selected_date (default: today)."""
+    if start_date:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else start
+    else:
+        start = datetime.strptime(selected_date, "%Y-%m-%d").date() if selected_date else date.today()
+        end = start
+
+    if end < start:
+        raise ValueError("end_date must be on or after start_date.")
+    return start, end
+
+
+def _stream_csv_response(current_user: User, start: date, end: date, export_all: bool, display_tz: str):
+    filename = f"attendance_{start.isoformat()}_{end.isoformat()}.csv"
+    return StreamingResponse(
+        stream_attendance_csv(current_user.id, start, end, export_all=export_all, display_tz=display_tz),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 
-def export_my_attendance_controller(format: str, selected_date: str, db: Session, current_user: User):
+def export_my_attendance_controller(format: str, selected_date: str, db: Session, current_user: User,
+                                    start_date: str = None, end_date: str = None, stream: bool = False, tz: str = None):
     try:
-        selected = datetime.strptime(selected_date, "%Y-%m-%d").date() if selected_date else date.today()
-        file_url = get_attendance_export(db, current_user, format, selected, export_all=False)
-        return success_response("Your attendance exported successfully", {"file_url": file_url})
+        start, end = _parse_date_range(selected_date, start_date, end_date)
+        display_tz = resolve_display_timezone(tz)
+        if stream:
+            if format != "csv":
+                return error_response("Streaming is only supported for CSV exports.")
+            return _stream_csv_response(current_user, start, end, False, display_tz)
+        file_name = get_attendance_export(db, current_user, format, start, end, export_all=False, display_tz=display_tz)
+        return success_response("Your attendance exported successfully",
+                                {"file_url": sign_download(file_name, current_user.id, current_user.access_token)})
     except Exception as e:
         return error_response(str(e))
 
-def export_all_attendance_controller(format: str, selected_date: str, db: Session, current_user: User):
+def export_all_attendance_controller(format: str, selected_date: str, db: Session, current_user: User,
+                                     start_date: str = None, end_date: str = None, stream: bool = False, tz: str = None):
+    if not _is_admin(current_user):
+        return error_response(ADMIN_ONLY, status_code=403)
     try:
-        selected = datetime.strptime(selected_date, "%Y-%m-%d").date() if selected_date else date.today()
-        file_url = get_attendance_export(db, current_user, format, selected, export_all=True)
-        return success_response("All user attendance exported successfully", {"file_url": file_url})
+        start, end = _parse_date_range(selected_date, start_date, end_date)
+        display_tz = resolve_display_timezone(tz)
+        if stream:
+            if format != "csv":
+                return error_response("Streaming is only supported for CSV exports.")
+            return _stream_csv_response(current_user, start, end, True, display_tz)
+        file_name = get_attendance_export(db, current_user, format, start, end, export_all=True, display_tz=display_tz)
+        return success_response("All user attendance exported successfully",
+                                {"file_url": sign_download(file_name, current_user.id, current_user.access_token)})
     except Exception as e:
-        return error_response(str(e))
\ No newline at end of file
+        return error_response(str(e))
+
+
+def attendance_report_controller(start_date: date, end_date: date, group_by: str, format: str,
+                                 user_id: Optional[int], current_user: User):
+    if group_by not in REPORT_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(REPORT_GROUPINGS)}.")
+    if format not in REPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(REPORT_FORMATS)}.")
+    try:
+        validate_report_range(start_date, end_date)
+    except ValueError as e:
+        return error_response(str(e))
+
+    # Employees only ever get their own report
+    if not _is_admin(current_user):
+        user_id = current_user.id
+
+    headers = {}
+    if format == "csv":
+        filename = f"attendance_report_{group_by}_{start_date.isoformat()}_{end_date.isoformat()}.csv"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        stream_attendance_report(start_date, end_date, user_id, group_by, format),
+        media_type="text/csv" if format == "csv" else "application/json",
+        headers=headers
+    )
+
+
+def create_export_job_controller(request: ExportJobRequest, current_user: User):
+    if request.scope == "all" and not _is_admin(current_user):
+        return error_response(ADMIN_ONLY, status_code=403)
+    try:
+        start = request.start_date or date.today()
+        end = request.end_date or start
+        if end < start:
+            raise ValueError("end_date must be on or after start_date.")
+        display_tz = resolve_display_timezone(request.timezone)
+        check_export_format(request.format)
+        job = create_export_job(current_user.id, current_user.access_token, request.format, start, end,
+                                export_all=request.scope == "all", display_tz=display_tz)
+        return success_response("Export job created", job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return error_response(str(e))
+
+
+def get_export_job_controller(job_id: str, current_user: User):
+    job = get_export_job(job_id, current_user.id, current_user.access_token)
+    return success_response("Export job fetched successfully", job)
+
+
+async def download_export_controller(name: str, user_id: int, expires: int, signature: str, request: Request,
+                                     db: AsyncSession):
+    # The link dies with the session it was issued in: logout clears the stored token
+    user = await db.get(User, user_id)
+    if user is None or not verify_download(name, user_id, expires, signature, user.access_token):
+        raise HTTPException(status_code=403, detail="Download link is invalid or has expired.")
+    path = find_export(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Export file not found. Please export it again.")
+
+    # A file never changes under its name, so the browser may keep it for as long as the link is valid
+    headers = {"Cache-Control": f"private, max-age={max(0, expires - int(time.time()))}, immutable"}
+    stat = os.stat(path)
+    # Range requests, Content-Length, ETag and Last-Modified; the body goes out through the
+    # server's http.response.pathsend extension when it offers one
+    response = FileResponse(path, filename=name, headers=headers, stat_result=stat)
+    if _not_modified(request, response.headers["etag"], stat.st_mtime):
+        return Response(status_code=304, headers={
+            key: response.headers[key] for key in ("etag", "last-modified", "cache-control")
+        })
+    if DOWNLOAD_ACCEL_REDIRECT_PREFIX:
+        # nginx serves the internal location with sendfile and handles Range itself
+        return Response(headers={
+            "X-Accel-Redirect": DOWNLOAD_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + name,
+            **{key: response.headers[key] for key in ("etag", "last-modified", "cache-control", "content-disposition")},
+        })
+    return response
+
+
+async def ingest_punches_controller(request: BulkPunchRequest, db: AsyncSession, current_user: User):
+    if not _is_admin(current_user):
+        return error_response("Only admins can upload device punches.", status_code=403)
+    try:
+        result = await ingest_punch_events(request.events, db)
+        return success_response("Punch events processed", result)
+    except Exception as e:
+        await db.rollback()
+        return error_response(str(e), status_code=400)
+
+
+def _check_live_capacity():
+    if connection_count() >= LIVE_FEED_MAX_CONNECTIONS:
+        raise HTTPException(status_code=503, detail="Too many live feed connections, retry later.")
+
+
+def _live_subscription(current_user: User):
+    # Admins follow every employee; employees only their own punches
+    return subscribe(None if _is_admin(current_user) else current_user.id)
+
+
+def _sse_frame(event):
+    return f"event: {event.type}\ndata: {event.data}\n\n"
+
+
+def live_attendance_stream_controller(current_user: User):
+    _check_live_capacity()
+
+    async def frames():
+        # Subscribed inside the generator so the finally below always pairs with it
+        subscription = _live_subscription(current_user)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                batch = await subscription.next_batch(LIVE_FEED_HEARTBEAT_SECONDS)
+                # A comment line keeps proxies from closing the idle connection
+                yield "".join(map(_sse_frame, batch)) if batch else ": keepalive\n\n"
+        finally:
+            unsubscribe(subscription)
+
+    return StreamingResponse(frames(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def live_attendance_websocket_controller(websocket: WebSocket, current_user: User):
+    try:
+        _check_live_capacity()
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=e.detail)
+        return
+    await websocket.accept()
+    subscription = _live_subscription(current_user)
+
+    async def pump():
+        while True:
+            batch = await subscription.next_batch(LIVE_FEED_HEARTBEAT_SECONDS)
+            for event in batch:
+                await websocket.send_text(event.data)
+            if not batch:
+                await websocket.send_text('{"type": "heartbeat"}')
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Client messages are ignored; receiving notices the disconnect
+        while (await websocket.receive())["type"] != "websocket.disconnect" and not sender.done():
+            pass
+    finally:
+        sender.cancel()
+        unsubscribe(subscription)
@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth_schema import LoginRequest
 from app.services.auth_service import authenticate_user, generate_and_return_token, get_today_attendance
 from app.core.database import SessionLocal
 from app.utils.response import success_response, error_response
 from app.middlewares.auth import get_current_user
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.schemas.auth_schema import UserSchema
+from app.utils.token_cache import invalidate_user_tokens, token_cache_stats
 
 def get_db():
     db = SessionLocal()
@@ -15,12 +17,12 @@ def get_db():
     finally:
         db.close()
 
-def login_controller(login_data: LoginRequest, db: Session):
-    user = authenticate_user(db, login_data.email, login_data.password)
+async def login_controller(login_data: LoginRequest, db: AsyncSession):
+    user = await authenticate_user(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(status_code=401, detail=error_response("Invalid email or password", 401))
     
-    token = generate_and_return_token(user,db)
+    token = await generate_and_return_token(user,db)
     return success_response("Login successful", token, 200)
 
 def get_me(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -30,6 +32,13 @@ def get_me(user: User = Depends(get_current_user), db: Session = Depends(get_db)
     return success_response("User details fetched successfully", user_data.dict(), 200)
 
 def logout_user(user: User, db: Session):
-    user.access_token = None
+    # user is a cached snapshot, so clear the token with an UPDATE rather than through the ORM object
+    db.query(User).filter(User.id == user.id).update({User.access_token: None})
     db.commit()
-    return success_response("Logout successful", {}, 200)
\ No newline at end of file
+    invalidate_user_tokens(user.id)
+    return success_response("Logout successful", {}, 200)
+
+def get_token_cache_stats(user: User):
+    if user.role not in (UserRole.admin, UserRole.super_admin):
+        return error_response("Only admins can view token cache stats.", status_code=403)
+    return success_response("Token cache stats fetched successfully", token_cache_stats(), 200)
\ No newline at end of file
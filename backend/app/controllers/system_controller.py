@@ -0,0 +1,53 @@
+from app.core.database import engine, async_engine, SYNC_POOL, ASYNC_POOL
+from app.core.pool_metrics import pool_status
+from app.services.password_service import password_pool_stats
+from app.core.live_feed import live_feed_stats
+from app.utils.attendance_view_cache import daily_view_cache_stats
+from app.utils.export_cache import export_cache_stats
+from app.models.user import User, UserRole
+from app.utils.response import error_response, success_response
+
+
+def _admin_only(current_user: User):
+    """Error response for non-admins, None for admins: system stats expose internals."""
+    if current_user.role not in (UserRole.admin, UserRole.super_admin):
+        return error_response("Only admins can view system stats.", status_code=403)
+    return None
+
+
+def get_pool_stats(current_user: User):
+    forbidden = _admin_only(current_user)
+    if forbidden:
+        return forbidden
+    return success_response("Connection pool stats fetched successfully", {
+        SYNC_POOL: pool_status(engine, SYNC_POOL),
+        ASYNC_POOL: pool_status(async_engine.sync_engine, ASYNC_POOL),
+    })
+
+
+def get_password_pool_stats(current_user: User):
+    forbidden = _admin_only(current_user)
+    if forbidden:
+        return forbidden
+    return success_response("Password pool stats fetched successfully", password_pool_stats())
+
+
+def get_daily_view_cache_stats(current_user: User):
+    forbidden = _admin_only(current_user)
+    if forbidden:
+        return forbidden
+    return success_response("Daily view cache stats fetched successfully", daily_view_cache_stats())
+
+
+def get_live_feed_stats(current_user: User):
+    forbidden = _admin_only(current_user)
+    if forbidden:
+        return forbidden
+    return success_response("Live feed stats fetched successfully", live_feed_stats())
+
+
+def get_export_cache_stats(current_user: User):
+    forbidden = _admin_only(current_user)
+    if forbidden:
+        return forbidden
+    return success_response("Export cache stats fetched successfully", export_cache_stats())
@@ -1,35 +1,28 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc, asc
-from app.models.user import User
-from app.schemas.user_schema import UserSchema
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.schemas.user_schema import USER_PAGE_RESPONSE
+from app.services.user_service import SORT_COLUMNS, SORT_ORDERS, list_users
+from app.utils.json_response import typed_json_response
 from app.utils.response import success_response
 
-def get_all_users(db: Session, skip: int, limit: int, search: str, sort_by: str, sort_order: str):
-    query = db.query(User)
+async def get_all_users(db: AsyncSession, limit: int, cursor: Optional[str], search: Optional[str],
+                        sort_by: str, sort_order: str, include_total: bool):
+    # Only indexed columns can be sorted on; anything else would scan the table
+    if sort_by not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by. Allowed: {', '.join(SORT_COLUMNS)}")
+    sort_order = sort_order.lower()
+    if sort_order not in SORT_ORDERS:
+        raise HTTPException(status_code=400, detail="Invalid sort_order. Allowed: asc, desc")
 
-    if search:
-        query = query.filter(
-            or_(
-                User.name.ilike(f"%{search}%"),
-                User.email.ilike(f"%{search}%")
-            )
-        )
+    users, next_cursor, total = await list_users(
+        db, limit, cursor, search, sort_by, sort_order, include_total
+    )
+    user_data = [user._asdict() for user in users]
 
-    # Handle sorting dynamically and safely
-    sort_column = getattr(User, sort_by, None)
-    if sort_column is not None:
-        sort_column = desc(sort_column) if sort_order.lower() == "desc" else asc(sort_column)
-        query = query.order_by(sort_column)
-    else:
-        query = query.order_by(desc(User.name))
-
-    total = query.count()
-    users = query.offset(skip).limit(limit).all()
-    user_data = [UserSchema.from_orm(user) for user in users]
-
-    return success_response("Users fetched successfully", {
+    return typed_json_response(USER_PAGE_RESPONSE, success_response("Users fetched successfully", {
         "total": total,
-        "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "users": user_data
-    })
\ No newline at end of file
+    }))
@@ -1,14 +1,55 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config.settings import DATABASE_URL
+from app.config.settings import (
+    DATABASE_URL, ASYNC_DATABASE_URL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
+from app.core.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool, instrument_engine
+from app.core.request_metrics import instrument_sql
 
-engine = create_engine(DATABASE_URL)
+SYNC_POOL = "sync"
+ASYNC_POOL = "async"
+
+
+def _engine_options(url: str, poolclass, pool_name: str):
+    options = {"pool_logging_name": pool_name}
+    if url.startswith("sqlite"):
+        # SQLite keeps its default single-file pooling
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, TimedQueuePool, SYNC_POOL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool, ASYNC_POOL)
+)
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+instrument_engine(engine, SYNC_POOL)
+instrument_engine(async_engine.sync_engine, ASYNC_POOL)
+instrument_sql(engine)
+instrument_sql(async_engine.sync_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
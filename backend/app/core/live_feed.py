@@ -0,0 +1,262 @@
+"""
+In-process pub/sub behind the live attendance feed (GET /attendance/live, /attendance/live/ws).
+
+Services publish punch deltas after they commit; every connected dashboard holds a
+Subscription that buffers the frames it has not sent yet. The broker decides how events
+reach the subscriptions: LocalBroker hands them straight to this worker's subscribers,
+RedisBroker (LIVE_FEED_BROKER_URL) sends them through a Redis channel so every uvicorn
+worker delivers them.
+
+Backpressure: a subscription buffers up to LIVE_FEED_BUFFER_SIZE frames in publish order.
+Deltas are never merged or dropped one by one, since a client applying what is left of
+in -> out -> in would end up with the wrong state. When the buffer overflows, the whole
+backlog is dropped and the client's next frame is a single "resync" event telling it to
+re-fetch GET /attendance/; events published until that frame is taken are covered by the
+re-fetch and dropped too. Subscribers also get a resync when the Redis listener
+reconnects, since events published while it was disconnected are lost.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config.settings import LIVE_FEED_BROKER_URL, LIVE_FEED_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "attendance:live"
+RESYNC = "resync"
+# Backoff between attempts to resubscribe after the Redis connection drops
+RECONNECT_DELAY_SECONDS = 0.5
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+class LiveEvent:
+    __slots__ = ("type", "user_id", "data")
+
+    def __init__(self, type: str, user_id: int, data: str):
+        self.type = type
+        self.user_id = user_id
+        self.data = data  # JSON, encoded once for every subscriber
+
+    @classmethod
+    def from_payload(cls, payload: dict):
+        return cls(payload["type"], payload["user_id"], json.dumps(jsonable_encoder(payload)))
+
+
+RESYNC_EVENT = LiveEvent(RESYNC, None, json.dumps({"type": RESYNC}))
+
+
+class Subscription:
+    """Pending frames of one connection. user_id limits it to that employee's events."""
+
+    __slots__ = ("user_id", "_limit", "_pending", "_ready", "_resync", "resyncs", "dropped")
+
+    def __init__(self, user_id=None, limit: int = LIVE_FEED_BUFFER_SIZE):
+        self.user_id = user_id
+        self._limit = limit
+        self._pending = deque()  # Unsent LiveEvents in publish order
+        self._ready = asyncio.Event()
+        self._resync = False  # The next frame is a resync; events until then are dropped
+        self.resyncs = 0
+        self.dropped = 0
+
+    def offer(self, event: LiveEvent):
+        if event.type == RESYNC:
+            self.resync()
+            return
+        if self.user_id is not None and event.user_id != self.user_id:
+            return
+        if self._resync:
+            self.dropped += 1
+        elif len(self._pending) >= self._limit:
+            self.dropped += 1
+            self.resync()
+        else:
+            self._pending.append(event)
+            self._ready.set()
+
+    def resync(self):
+        """Replace the backlog with a resync frame."""
+        self.dropped += len(self._pending)
+        self._pending.clear()
+        if not self._resync:
+            self._resync = True
+            self.resyncs += 1
+        self._ready.set()
+
+    async def next_batch(self, timeout: float):
+        """Frames ready to send, in publish order; empty when `timeout` passes without any."""
+        if not self._pending and not self._resync:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if self._resync:
+            batch = [RESYNC_EVENT]
+            self._resync = False
+        else:
+            batch = list(self._pending)
+            self._pending.clear()
+        self._ready.clear()
+        return batch
+
+
+class LocalBroker:
+    """Delivers events to the subscribers of this process only."""
+
+    backend = "local"
+
+    def __init__(self):
+        self._deliver = None
+
+    async def start(self, deliver):
+        self._deliver = deliver
+
+    async def publish(self, events):
+        for event in events:
+            self._deliver(event)
+
+    async def stop(self):
+        self._deliver = None
+
+
+class RedisBroker:
+    """Fans events out through a Redis channel so subscribers on every worker receive them."""
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # optional dependency, only needed when LIVE_FEED_BROKER_URL is set
+
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+
+    async def _subscribe(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(CHANNEL)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return pubsub
+
+    async def start(self, deliver):
+        # The first subscription happens here, so a publish right after start is received
+        pubsub = await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(pubsub, deliver))
+
+    async def _listen(self, pubsub, deliver):
+        """Deliver channel messages; resubscribe with backoff when the connection drops."""
+        delay = RECONNECT_DELAY_SECONDS
+        while True:
+            if pubsub is not None:
+                try:
+                    async for message in pubsub.listen():
+                        delay = RECONNECT_DELAY_SECONDS
+                        try:
+                            payload = json.loads(message["data"])
+                            event = LiveEvent(payload["type"], payload["user_id"], message["data"].decode())
+                        except (ValueError, KeyError, TypeError):
+                            logger.warning("Ignoring malformed live attendance message: %.200r", message["data"])
+                            continue
+                        deliver(event)
+                except Exception:
+                    logger.warning("Live feed lost its Redis subscription; reconnecting", exc_info=True)
+                finally:
+                    await pubsub.aclose()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+            try:
+                pubsub = await self._subscribe()
+            except Exception:
+                logger.warning("Could not resubscribe to %s; retrying in %.1fs", CHANNEL, delay, exc_info=True)
+                pubsub = None
+                continue
+            # Events published while disconnected are gone: every subscriber re-fetches
+            deliver(RESYNC_EVENT)
+
+    async def publish(self, events):
+        # This worker's subscribers receive them back through the listener, like everyone else's
+        pipe = self._redis.pipeline(transaction=False)
+        for event in events:
+            pipe.publish(CHANNEL, event.data)
+        await pipe.execute()
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._redis.aclose()
+
+
+def _build_broker():
+    if LIVE_FEED_BROKER_URL:
+        return RedisBroker(LIVE_FEED_BROKER_URL)
+    return LocalBroker()
+
+
+_broker = _build_broker()
+_subscriptions = set()
+_stats = {"published": 0, "delivered": 0, "connections_total": 0}
+_started = False
+
+
+def _deliver(event: LiveEvent):
+    for subscription in _subscriptions:
+        subscription.offer(event)
+    _stats["delivered"] += len(_subscriptions)
+
+
+async def start_live_feed():
+    global _started
+    if not _started:
+        await _broker.start(_deliver)
+        _started = True
+
+
+async def stop_live_feed():
+    global _started
+    if _started:
+        await _broker.stop()
+        _started = False
+
+
+def subscribe(user_id=None):
+    subscription = Subscription(user_id)
+    _subscriptions.add(subscription)
+    _stats["connections_total"] += 1
+    return subscription
+
+
+def unsubscribe(subscription: Subscription):
+    _subscriptions.discard(subscription)
+
+
+def connection_count():
+    return len(_subscriptions)
+
+
+async def publish_attendance_events(payloads):
+    """Publish punch deltas; each payload needs "type" and "user_id". Never raises: the punch is already committed."""
+    events = [LiveEvent.from_payload(payload) for payload in payloads]
+    if not events:
+        return
+    try:
+        await start_live_feed()
+        await _broker.publish(events)
+        _stats["published"] += len(events)
+    except Exception:
+        logger.exception("Could not publish %d live attendance events", len(events))
+
+
+def live_feed_stats():
+    return {
+        "backend": _broker.backend,
+        "connections": len(_subscriptions),
+        **_stats,
+        "resyncs": sum(subscription.resyncs for subscription in _subscriptions),
+        "dropped": sum(subscription.dropped for subscription in _subscriptions),
+    }
@@ -0,0 +1,104 @@
+"""
+Connection pool instrumentation.
+
+Counters come from SQLAlchemy pool events. Checkout wait time is measured by the
+Timed* pool classes, which time ``_do_get`` (the call that blocks when the pool is
+exhausted). Stats are keyed by the pool's logging name so they survive pool.recreate().
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is +Inf
+WAIT_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def _pool_stats(name: str):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "timeouts": 0,
+            "wait_count": 0,
+            "wait_sum_ms": 0.0,
+            "wait_buckets": [0] * (len(WAIT_BUCKETS_MS) + 1),
+        }
+    return stats
+
+
+def _increment(name: str, counter: str):
+    with _lock:
+        _pool_stats(name)[counter] += 1
+
+
+def _record_wait(name: str, waited_ms: float, timed_out: bool):
+    with _lock:
+        stats = _pool_stats(name)
+        stats["wait_count"] += 1
+        stats["wait_sum_ms"] += waited_ms
+        if timed_out:
+            stats["timeouts"] += 1
+        for index, bound in enumerate(WAIT_BUCKETS_MS):
+            if waited_ms <= bound:
+                stats["wait_buckets"][index] += 1
+                break
+        else:
+            stats["wait_buckets"][-1] += 1
+
+
+class _TimedPoolMixin:
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            _record_wait(self.logging_name, (time.perf_counter() - started) * 1000, timed_out)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str):
+    """Count connects/checkouts/checkins/invalidations for a (sync) Engine's pool."""
+    event.listen(engine, "connect", lambda *args: _increment(name, "connects"))
+    event.listen(engine, "checkout", lambda *args: _increment(name, "checkouts"))
+    event.listen(engine, "checkin", lambda *args: _increment(name, "checkins"))
+    event.listen(engine, "invalidate", lambda *args: _increment(name, "invalidations"))
+
+
+def pool_status(engine, name: str):
+    """Live pool gauges plus the accumulated counters and wait histogram."""
+    pool = engine.pool
+    with _lock:
+        stats = dict(_pool_stats(name))
+        buckets = list(stats.pop("wait_buckets"))
+
+    labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["le_inf"]
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if hasattr(pool, "size") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        **stats,
+        "wait_avg_ms": round(stats["wait_sum_ms"] / stats["wait_count"], 3) if stats["wait_count"] else None,
+        "wait_histogram_ms": dict(zip(labels, buckets)),
+    }
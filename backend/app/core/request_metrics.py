@@ -0,0 +1,191 @@
+"""
+Per-request timing and SQL statement instrumentation.
+
+SQLAlchemy cursor events add each statement's time (failed ones included) to the stats
+of the request that is currently running (a ContextVar set by RequestTimingMiddleware, which follows the request
+into the thread pool and into the async engine's greenlets). Finished requests are
+aggregated per (method, route template) and rendered in the Prometheus text format.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.core.pool_metrics import pool_status
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds; the last bucket is +Inf
+DURATION_BUCKETS_SECONDS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+STATEMENT_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 250]
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|:\w+|%\(\w+\)s))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestStats:
+    __slots__ = ("started", "db_seconds", "statements", "shapes")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.shapes = Counter()  # normalised statement -> executions
+
+    def record(self, statement: str, elapsed: float):
+        self.db_seconds += elapsed
+        self.statements += 1
+        self.shapes[statement_shape(statement)] += 1
+
+
+current_request = ContextVar("current_request", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with IN-lists and numeric literals folded, so repeats group together."""
+    shape = _NUMBER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+# Attribute on the statement's ExecutionContext holding its start time
+_STARTED = "_request_metrics_started"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_request.get() is not None:
+        setattr(context, _STARTED, time.perf_counter())
+
+
+def _record(context, statement):
+    started = getattr(context, _STARTED, None)
+    stats = current_request.get()
+    if started is None or stats is None:
+        return
+    delattr(context, _STARTED)
+    stats.record(statement, time.perf_counter() - started)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        _record(context, statement)
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; their time still counts
+    if exception_context.execution_context is not None and exception_context.statement is not None:
+        _record(exception_context.execution_context, exception_context.statement)
+
+
+def instrument_sql(engine):
+    """Attribute statement counts and DB time on a (sync) Engine to the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "buckets", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+
+_lock = threading.Lock()
+_requests = Counter()  # (method, route, status) -> count
+_n_plus_one = Counter()  # (method, route) -> requests flagged
+_histograms = {}  # (metric, method, route) -> _Histogram
+
+
+def _observe(metric: str, bounds, method: str, route: str, value):
+    key = (metric, method, route)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms[key] = _Histogram(bounds)
+    histogram.observe(value)
+
+
+def record_request(method: str, route: str, status: int, stats: RequestStats, threshold: int):
+    """Aggregate one finished request and warn about likely N+1 query patterns."""
+    elapsed = time.perf_counter() - stats.started
+    repeated = [(shape, count) for shape, count in stats.shapes.items() if count > threshold]
+    with _lock:
+        _requests[(method, route, status)] += 1
+        _observe("http_request_duration_seconds", DURATION_BUCKETS_SECONDS, method, route, elapsed)
+        _observe("http_request_db_duration_seconds", DURATION_BUCKETS_SECONDS, method, route, stats.db_seconds)
+        _observe("http_request_sql_statements", STATEMENT_BUCKETS, method, route, stats.statements)
+        if repeated:
+            _n_plus_one[(method, route)] += 1
+
+    for shape, count in repeated:
+        logger.warning("Possible N+1: %s %s ran %d similar statements: %.200s", method, route, count, shape)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def render_prometheus(pools=()):
+    """Prometheus text exposition of the request metrics plus gauges for the given (engine, name) pools."""
+    lines = []
+    with _lock:
+        lines.append("# HELP http_requests_total Requests by method, route template and status.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(_requests.items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+        for metric, help_text in (
+            ("http_request_duration_seconds", "Wall time per request."),
+            ("http_request_db_duration_seconds", "Time spent executing SQL per request."),
+            ("http_request_sql_statements", "SQL statements executed per request."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (name, method, route), histogram in sorted(_histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, bucket in zip(histogram.bounds + ["+Inf"], histogram.buckets):
+                    cumulative += bucket
+                    lines.append(f"{metric}_bucket{{{_labels(method=method, route=route, le=bound)}}} {cumulative}")
+                lines.append(f"{metric}_sum{{{_labels(method=method, route=route)}}} {histogram.total}")
+                lines.append(f"{metric}_count{{{_labels(method=method, route=route)}}} {histogram.count}")
+
+        lines.append("# HELP http_request_n_plus_one_total Requests that repeated one statement shape past the threshold.")
+        lines.append("# TYPE http_request_n_plus_one_total counter")
+        for (method, route), count in sorted(_n_plus_one.items()):
+            lines.append(f"http_request_n_plus_one_total{{{_labels(method=method, route=route)}}} {count}")
+
+    gauges = {
+        "db_pool_checked_out": "checked_out",
+        "db_pool_overflow": "overflow",
+        "db_pool_timeouts_total": "timeouts",
+    }
+    statuses = [(name, pool_status(engine, name)) for engine, name in pools]
+    for metric, key in gauges.items():
+        lines.append(f"# TYPE {metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+        for name, status in statuses:
+            if status.get(key) is not None:
+                lines.append(f"{metric}{{{_labels(pool=name)}}} {status[key]}")
+    return "\n".join(lines) + "\n"
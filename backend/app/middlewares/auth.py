@@ -1,19 +1,24 @@
-from fastapi import Request, HTTPException, Depends
+from fastapi import Request, HTTPException, Depends, WebSocketException, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config.settings import JWT_SECRET, JWT_ALGORITHM
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_async_db
 from app.models.user import User
+from app.utils.token_cache import UserSnapshot, get_cached_user, cache_user
 
 security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    return await resolve_token_user(credentials.credentials, db)
 
+
+async def resolve_token_user(token: str, db: AsyncSession) -> UserSnapshot:
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id: str = payload.get("sub")
@@ -22,9 +27,37 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token.")
 
+    cached = get_cached_user(token)
+    if cached:
+        return cached
+
     # Check if token exists in DB for the user
-    user = db.query(User).filter(User.id == user_id, User.access_token == token).first()
+    result = await db.execute(select(User).where(User.id == int(user_id), User.access_token == token))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token.")
 
-    return user
\ No newline at end of file
+    snapshot = UserSnapshot.from_user(user)
+    cache_user(token, snapshot, payload["exp"])
+    return snapshot
+
+
+async def get_stream_user(connection: HTTPConnection) -> UserSnapshot:
+    """
+    Auth for long-lived connections (SSE, WebSocket). Browsers cannot set headers on
+    EventSource or WebSocket, so the token may also come as ?access_token=. The DB
+    session is only held for the lookup, not for the lifetime of the stream.
+    """
+    token = connection.query_params.get("access_token")
+    authorization = connection.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    try:
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        async with AsyncSessionLocal() as db:
+            return await resolve_token_user(token, db)
+    except HTTPException as exc:
+        if connection.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+        raise
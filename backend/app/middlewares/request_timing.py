@@ -0,0 +1,58 @@
+import time
+
+from app.config.settings import N_PLUS_ONE_THRESHOLD
+from app.core.request_metrics import RequestStats, current_request, record_request
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope) -> str:
+    """
+    The matched route's full template: mount prefix, router prefix and path, e.g. /user/{user_id}.
+
+    FastAPI resolves included routers lazily and leaves the router's own route, whose path has no
+    include prefix, in scope["route"]; the prefixed template is on the effective route context.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(context, "path_format", None) or getattr(route, "path_format", None) or route.path
+    return scope.get("root_path", "").rstrip("/") + path_format
+
+
+class RequestTimingMiddleware:
+    """
+    Times every HTTP request and counts its SQL statements.
+
+    Adds a Server-Timing header (total, db) to the response and records the request under
+    its route template (e.g. /attendance/export-jobs/{job_id}) for /metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - stats.started) * 1000
+                header = (f'total;dur={total_ms:.1f}, '
+                          f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries"')
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            record_request(scope["method"], route_label(scope), status, stats, N_PLUS_ONE_THRESHOLD)
@@ -0,0 +1,76 @@
+"""
+Versioned schema migrations.
+
+Every module in this package named ``vNNN_<description>.py`` defines ``VERSION``,
+``DESCRIPTION`` and ``upgrade(connection)``. Applied versions are recorded in the
+``schema_migrations`` table so each migration runs exactly once per database.
+
+Run on startup from ``main.py``'s lifespan, or manually with:
+    python -m app.migrations
+"""
+import importlib
+import logging
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Serialises migrations when several workers start at once (MySQL only)
+MIGRATION_LOCK = "schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+
+def load_migrations():
+    """Import every vNNN_* module in this package, sorted by VERSION."""
+    modules = [
+        importlib.import_module(f"{__name__}.{info.name}")
+        for info in pkgutil.iter_modules(__path__)
+        if info.name.startswith("v")
+    ]
+    return sorted(modules, key=lambda module: module.VERSION)
+
+
+def run_migrations(engine):
+    """Apply every migration that has not been recorded in schema_migrations yet."""
+    with engine.connect() as lock_conn:
+        is_mysql = engine.dialect.name == "mysql"
+        if is_mysql:
+            acquired = lock_conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": MIGRATION_LOCK, "timeout": MIGRATION_LOCK_TIMEOUT}
+            ).scalar()
+            # 0 on timeout, NULL on error: migrating anyway would race the worker holding the lock
+            if acquired != 1:
+                raise RuntimeError(
+                    f"Could not acquire the {MIGRATION_LOCK!r} lock within {MIGRATION_LOCK_TIMEOUT}s; "
+                    "another process is still migrating"
+                )
+        try:
+            schema_migrations.create(engine, checkfirst=True)
+            with engine.connect() as conn:
+                applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+            for migration in load_migrations():
+                if migration.VERSION in applied:
+                    continue
+                logger.info("Applying migration %03d: %s", migration.VERSION, migration.DESCRIPTION)
+                with engine.begin() as conn:
+                    migration.upgrade(conn)
+                    conn.execute(insert(schema_migrations).values(
+                        version=migration.VERSION,
+                        description=migration.DESCRIPTION,
+                        applied_at=datetime.utcnow()
+                    ))
+        finally:
+            if is_mysql:
+                lock_conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK})
@@ -0,0 +1,9 @@
+import logging
+
+from app.core.database import engine
+from app.migrations import run_migrations
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migrations(engine)
+    print("Migrations completed.")
@@ -0,0 +1,30 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+
+
+def has_table(conn, table_name: str) -> bool:
+    return inspect(conn).has_table(table_name)
+
+
+def has_index(conn, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspect(conn).get_indexes(table_name))
+
+
+def has_column(conn, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspect(conn).get_columns(table_name))
+
+
+def create_index_online(conn, index):
+    """
+    Create an index if it is missing, without blocking writes where the backend allows it.
+
+    MySQL (InnoDB) builds secondary indexes in place, so ALGORITHM=INPLACE, LOCK=NONE
+    keeps the table readable and writable during the build.
+    """
+    if has_index(conn, index.table.name, index.name):
+        return
+    if conn.dialect.name == "mysql":
+        ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+        conn.execute(text(f"{ddl} ALGORITHM=INPLACE LOCK=NONE"))
+    else:
+        index.create(conn)
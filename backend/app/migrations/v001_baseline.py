@@ -0,0 +1,11 @@
+from app.core.database import Base
+from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+VERSION = 1
+DESCRIPTION = "Baseline schema"
+
+
+def upgrade(conn):
+    # Fresh databases get the full current schema; existing tables are left untouched
+    # and brought up to date by the migrations that follow.
+    Base.metadata.create_all(bind=conn)
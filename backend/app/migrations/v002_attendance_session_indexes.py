@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Date, DateTime, Index, Integer, MetaData, Table, text
+from app.migrations.helpers import create_index_online
+
+VERSION = 2
+DESCRIPTION = "Composite and open-session indexes on attendance_sessions"
+
+# The columns these indexes need, as they were at this version; later migrations add more
+attendance_sessions = Table(
+    "attendance_sessions",
+    MetaData(),
+    Column("user_id", Integer),
+    Column("date", Date),
+    Column("punch_in", DateTime),
+    Column("punch_out", DateTime),
+)
+
+INDEXES = [
+    Index("ix_attendance_sessions_user_date_punch_in",
+          attendance_sessions.c.user_id, attendance_sessions.c.date, attendance_sessions.c.punch_in),
+    Index("ix_attendance_sessions_date_user", attendance_sessions.c.date, attendance_sessions.c.user_id),
+    Index(
+        "ix_attendance_sessions_open",
+        attendance_sessions.c.user_id,
+        attendance_sessions.c.punch_out,
+        sqlite_where=text("punch_out IS NULL"),
+        postgresql_where=text("punch_out IS NULL"),
+    ),
+]
+
+
+def upgrade(conn):
+    for index in INDEXES:
+        create_index_online(conn, index)
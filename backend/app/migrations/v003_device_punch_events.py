@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+VERSION = 3
+DESCRIPTION = "device_punch_events table for bulk punch ingestion"
+
+# The table as this migration created it; v007 makes event_id unique per device instead
+metadata = MetaData()
+Table("users", metadata, Column("id", Integer, primary_key=True))
+device_punch_events = Table(
+    "device_punch_events",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("event_id", String(100), unique=True, nullable=False),
+    Column("device_id", String(100), nullable=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("timestamp", DateTime, nullable=False),
+    Column("direction", String(3), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("reason", String(255), nullable=True),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(conn):
+    device_punch_events.create(bind=conn, checkfirst=True)
@@ -0,0 +1,37 @@
+import logging
+
+from sqlalchemy import (Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, Table, func,
+                        select, text)
+
+logger = logging.getLogger(__name__)
+
+VERSION = 4
+DESCRIPTION = "daily_attendance_summary table"
+
+# The table as this migration created it
+metadata = MetaData()
+Table("users", metadata, Column("id", Integer, primary_key=True))
+daily_attendance_summary = Table(
+    "daily_attendance_summary",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("date", Date, primary_key=True),
+    Column("first_in", DateTime, nullable=False),
+    Column("last_out", DateTime, nullable=True),
+    Column("session_count", Integer, nullable=False),
+    Column("worked_hours", Float, nullable=False),
+    Column("has_open_session", Boolean, nullable=False),
+    Column("updated_at", DateTime),
+    Index("ix_daily_attendance_summary_date_user", "date", "user_id"),
+)
+
+
+def upgrade(conn):
+    daily_attendance_summary.create(bind=conn, checkfirst=True)
+    # Backfilling all history here would hold the migration lock (and startup) for as long as
+    # it takes, so existing sessions are summarised by the batched one-off command instead
+    if conn.execute(select(func.count()).select_from(text("attendance_sessions"))).scalar():
+        logger.warning(
+            "daily_attendance_summary is empty; backfill it with "
+            "`python -m app.cli.rebuild_attendance_summary` before serving attendance reads"
+        )
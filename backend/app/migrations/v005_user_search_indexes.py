@@ -0,0 +1,38 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table
+from app.migrations.helpers import create_index_online, has_index
+# The grams must match what search looks up, so they come from the live code
+from app.services.user_service import rebuild_user_search_grams
+
+VERSION = 5
+DESCRIPTION = "Keyset-pagination index on users.name and name/email search indexes"
+
+metadata = MetaData()
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100)),
+    Column("email", String(100)),
+)
+user_search_grams = Table(
+    "user_search_grams",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("gram", String(3), primary_key=True),
+    Index("ix_user_search_grams_gram_user", "gram", "user_id"),
+)
+NAME_ID_INDEX = Index("ix_users_name_id", users.c.name, users.c.id)
+FULLTEXT_INDEX = Index("ft_users_name_email", users.c.name, users.c.email,
+                       mysql_prefix="FULLTEXT", mysql_with_parser="ngram")
+
+
+def upgrade(conn):
+    create_index_online(conn, NAME_ID_INDEX)
+
+    if conn.dialect.name == "mysql":
+        # InnoDB cannot add a FULLTEXT index with LOCK=NONE, so this one is a plain CREATE INDEX
+        if not has_index(conn, "users", "ft_users_name_email"):
+            FULLTEXT_INDEX.create(conn)
+    else:
+        user_search_grams.create(bind=conn, checkfirst=True)
+        rebuild_user_search_grams(conn)
@@ -0,0 +1,84 @@
+import logging
+
+from sqlalchemy import (Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+                        select, update, func, text)
+from app.migrations.helpers import create_index_online, has_column
+
+logger = logging.getLogger(__name__)
+
+VERSION = 6
+DESCRIPTION = "Unique open session per user and day; idempotency_keys table"
+
+OPEN_DATE_EXPRESSION = "CASE WHEN punch_out IS NULL THEN date END"
+
+# The tables as of this migration
+metadata = MetaData()
+Table("users", metadata, Column("id", Integer, primary_key=True))
+attendance_sessions = Table(
+    "attendance_sessions",
+    metadata,
+    Column("user_id", Integer),
+    Column("date", Date),
+    Column("punch_in", DateTime),
+    Column("punch_out", DateTime),
+    Column("duration", Float),
+    Column("open_date", Date),
+)
+OPEN_PER_DAY_INDEX = Index(
+    "ux_attendance_sessions_open_per_day",
+    attendance_sessions.c.user_id,
+    attendance_sessions.c.open_date,
+    unique=True,
+)
+idempotency_keys = Table(
+    "idempotency_keys",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("key", String(255), primary_key=True),
+    Column("endpoint", String(100), nullable=False),
+    Column("response", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_idempotency_keys_created_at", "created_at"),
+)
+
+
+def _close_duplicate_open_sessions(conn):
+    """Keep the latest open session per (user, date); close older ones with zero duration."""
+    sessions = attendance_sessions.c
+    duplicates = conn.execute(
+        select(sessions.user_id, sessions.date, func.max(sessions.punch_in))
+        .where(sessions.punch_out == None)
+        .group_by(sessions.user_id, sessions.date)
+        .having(func.count() > 1)
+    ).all()
+    for user_id, day, latest_punch_in in duplicates:
+        conn.execute(update(attendance_sessions).where(
+            sessions.user_id == user_id,
+            sessions.date == day,
+            sessions.punch_out == None,
+            sessions.punch_in < latest_punch_in
+        ).values(punch_out=sessions.punch_in, duration=0))
+    if duplicates:
+        days = sorted(day for _, day, _ in duplicates)
+        # The summary rows for these days still count the closed sessions as open
+        logger.warning(
+            "Closed duplicate open sessions between %s and %s; refresh their summaries with "
+            "`python -m app.cli.rebuild_attendance_summary --start %s --end %s`",
+            days[0], days[-1], days[0], days[-1]
+        )
+
+
+def upgrade(conn):
+    _close_duplicate_open_sessions(conn)
+
+    if not has_column(conn, "attendance_sessions", "open_date"):
+        # SQLite and MySQL can only add generated columns as VIRTUAL; PostgreSQL only as STORED
+        storage = "STORED" if conn.dialect.name == "postgresql" else "VIRTUAL"
+        conn.execute(text(
+            f"ALTER TABLE attendance_sessions ADD COLUMN open_date DATE "
+            f"GENERATED ALWAYS AS ({OPEN_DATE_EXPRESSION}) {storage}"
+        ))
+
+    create_index_online(conn, OPEN_PER_DAY_INDEX)
+
+    idempotency_keys.create(bind=conn, checkfirst=True)
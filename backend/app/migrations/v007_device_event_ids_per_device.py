@@ -0,0 +1,90 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, inspect, insert, select, text
+from app.migrations.helpers import create_index_online
+
+VERSION = 7
+DESCRIPTION = "device_punch_events.event_id unique per device instead of across all devices"
+
+
+def _device_punch_events_table(name: str):
+    """The table as of this migration (under another name for SQLite's copy)."""
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Integer, primary_key=True))
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", String(100), nullable=False),
+        Column("device_id", String(100), nullable=True),
+        Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        Column("direction", String(3), nullable=False),
+        Column("status", String(20), nullable=False),
+        Column("reason", String(255), nullable=True),
+        Column("created_at", DateTime),
+    )
+
+
+device_punch_events = _device_punch_events_table("device_punch_events")
+ID_INDEX = Index("ix_device_punch_events_id", device_punch_events.c.id)
+DEVICE_EVENT_INDEX = Index(
+    "ux_device_punch_events_device_event",
+    device_punch_events.c.device_id,
+    device_punch_events.c.event_id,
+    unique=True,
+)
+
+
+def _global_event_id_uniques(conn):
+    """Names of unique constraints and unique indexes on event_id alone."""
+    inspector = inspect(conn)
+    constraints = [constraint["name"] for constraint in inspector.get_unique_constraints("device_punch_events")
+                   if constraint["column_names"] == ["event_id"]]
+    indexes = [index["name"] for index in inspector.get_indexes("device_punch_events")
+               if index["unique"] and index["column_names"] == ["event_id"] and index["name"] not in constraints]
+    return constraints, indexes
+
+
+def _sqlite_event_id_unique(conn) -> bool:
+    # Reflection misses column-level UNIQUE on SQLite; its automatic index shows up here with origin "u"
+    for index in conn.execute(text("PRAGMA index_list(device_punch_events)")).mappings():
+        if index["unique"] and index["origin"] == "u":
+            columns = conn.execute(text(f"PRAGMA index_info(\"{index['name']}\")")).mappings()
+            if [column["name"] for column in columns] == ["event_id"]:
+                return True
+    return False
+
+
+def _rebuild_sqlite_table(conn):
+    # SQLite cannot drop a column's UNIQUE constraint, so the table is copied without it
+    rebuild = _device_punch_events_table("device_punch_events_rebuild")
+    rebuild.create(conn)
+    columns = [column.name for column in device_punch_events.columns]
+    conn.execute(insert(rebuild).from_select(columns, select(*device_punch_events.columns)))
+    conn.execute(text("DROP TABLE device_punch_events"))
+    conn.execute(text("ALTER TABLE device_punch_events_rebuild RENAME TO device_punch_events"))
+    ID_INDEX.create(conn)
+    DEVICE_EVENT_INDEX.create(conn)
+
+
+def upgrade(conn):
+    if conn.dialect.name == "sqlite":
+        if _sqlite_event_id_unique(conn):
+            _rebuild_sqlite_table(conn)
+        else:
+            create_index_online(conn, DEVICE_EVENT_INDEX)
+        return
+
+    # Unique per device before the global constraint goes, so no moment is left without one
+    create_index_online(conn, DEVICE_EVENT_INDEX)
+    constraints, indexes = _global_event_id_uniques(conn)
+    quote = conn.dialect.identifier_preparer.quote
+    for name in constraints:
+        if conn.dialect.name == "mysql":
+            conn.execute(text(f"ALTER TABLE device_punch_events DROP INDEX {quote(name)}"))
+        else:
+            conn.execute(text(f"ALTER TABLE device_punch_events DROP CONSTRAINT {quote(name)}"))
+    for name in indexes:
+        if conn.dialect.name == "mysql":
+            conn.execute(text(f"ALTER TABLE device_punch_events DROP INDEX {quote(name)}"))
+        else:
+            conn.execute(text(f"DROP INDEX {quote(name)}"))
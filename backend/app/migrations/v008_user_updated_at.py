@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, Table, text
+from app.migrations.helpers import create_index_online, has_column
+
+VERSION = 8
+DESCRIPTION = "users.updated_at and its index, for the export cache version"
+
+users = Table(
+    "users",
+    MetaData(),
+    Column("id", Integer),
+    Column("updated_at", DateTime),
+)
+UPDATED_AT_INDEX = Index("ix_users_updated_at", users.c.updated_at)
+
+
+def upgrade(conn):
+    # Left NULL on existing rows rather than backfilled: the export version pairs max(updated_at)
+    # with count(*), and each row gets a value on its next change
+    if not has_column(conn, "users", "updated_at"):
+        column_type = users.c.updated_at.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE users ADD COLUMN updated_at {column_type} NULL"))
+    create_index_online(conn, UPDATED_AT_INDEX)
@@ -0,0 +1,75 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, MetaData, Table, select, update, func, text
+from app.migrations.helpers import create_index_online, has_column, has_index
+
+logger = logging.getLogger(__name__)
+
+VERSION = 9
+DESCRIPTION = "Unique open session per user, replacing the per-day constraint"
+
+OPEN_USER_EXPRESSION = "CASE WHEN punch_out IS NULL THEN user_id END"
+OPEN_PER_DAY_INDEX_NAME = "ux_attendance_sessions_open_per_day"
+
+# The columns this migration needs, as they were at this version
+attendance_sessions = Table(
+    "attendance_sessions",
+    MetaData(),
+    Column("user_id", Integer),
+    Column("date", Date),
+    Column("punch_in", DateTime),
+    Column("punch_out", DateTime),
+    Column("duration", Float),
+    Column("updated_at", DateTime),
+    Column("open_user_id", Integer),
+)
+OPEN_PER_USER_INDEX = Index("ux_attendance_sessions_open_per_user", attendance_sessions.c.open_user_id, unique=True)
+
+
+def _close_older_open_sessions(conn):
+    """Keep each user's latest open session; close the older ones (left open on earlier days) with zero duration."""
+    sessions = attendance_sessions.c
+    latest = conn.execute(
+        select(sessions.user_id, func.max(sessions.punch_in))
+        .where(sessions.punch_out == None)
+        .group_by(sessions.user_id)
+        .having(func.count() > 1)
+    ).all()
+    days = []
+    for user_id, latest_punch_in in latest:
+        stale = sessions.user_id == user_id, sessions.punch_out == None, sessions.punch_in < latest_punch_in
+        days += conn.execute(select(sessions.date).where(*stale)).scalars().all()
+        conn.execute(update(attendance_sessions).where(*stale).values(
+            punch_out=sessions.punch_in, duration=0, updated_at=datetime.utcnow()
+        ))
+    if days:
+        # The summary rows for these days still count the closed sessions as open
+        logger.warning(
+            "Closed %d sessions left open on earlier days; refresh their summaries with "
+            "`python -m app.cli.rebuild_attendance_summary --start %s --end %s`",
+            len(days), min(days), max(days)
+        )
+
+
+def upgrade(conn):
+    _close_older_open_sessions(conn)
+
+    if not has_column(conn, "attendance_sessions", "open_user_id"):
+        # SQLite and MySQL can only add generated columns as VIRTUAL; PostgreSQL only as STORED
+        storage = "STORED" if conn.dialect.name == "postgresql" else "VIRTUAL"
+        conn.execute(text(
+            f"ALTER TABLE attendance_sessions ADD COLUMN open_user_id INTEGER "
+            f"GENERATED ALWAYS AS ({OPEN_USER_EXPRESSION}) {storage}"
+        ))
+
+    create_index_online(conn, OPEN_PER_USER_INDEX)
+
+    # The per-day constraint and its column are superseded (an index must go before its column)
+    if has_index(conn, "attendance_sessions", OPEN_PER_DAY_INDEX_NAME):
+        if conn.dialect.name == "mysql":
+            conn.execute(text(f"ALTER TABLE attendance_sessions DROP INDEX {OPEN_PER_DAY_INDEX_NAME}"))
+        else:
+            conn.execute(text(f"DROP INDEX {OPEN_PER_DAY_INDEX_NAME}"))
+    if has_column(conn, "attendance_sessions", "open_date"):
+        conn.execute(text("ALTER TABLE attendance_sessions DROP COLUMN open_date"))
@@ -1,2 +1,6 @@
 from .user import User
 from .attendance_session import AttendanceSession
+from .device_punch_event import DevicePunchEvent
+from .daily_attendance_summary import DailyAttendanceSummary
+from .user_search_gram import UserSearchGram
+from .idempotency_key import IdempotencyKey
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Float
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Float, Index, Computed, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -6,6 +6,22 @@ from app.core.database import Base
 
 class AttendanceSession(Base):
     __tablename__ = "attendance_sessions"
+    __table_args__ = (
+        # Per-user day lookups ordered by punch_in (punch in/out, /attendance/me, /auth/me)
+        Index("ix_attendance_sessions_user_date_punch_in", "user_id", "date", "punch_in"),
+        # All users for one day (admin daily view and exports)
+        Index("ix_attendance_sessions_date_user", "date", "user_id"),
+        # Open session lookups; partial where the backend supports it, plain index on MySQL
+        Index(
+            "ix_attendance_sessions_open",
+            "user_id",
+            "punch_out",
+            sqlite_where=text("punch_out IS NULL"),
+            postgresql_where=text("punch_out IS NULL"),
+        ),
+        # At most one open session per user, enforced by the database
+        Index("ux_attendance_sessions_open_per_user", "open_user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -13,6 +29,10 @@ class AttendanceSession(Base):
     punch_in = Column(DateTime, nullable=False)
     punch_out = Column(DateTime, nullable=True)
     duration = Column(Float, nullable=True)  # In hours (e.g., 2.5 = 2h 30m)
+    # The session's user while it is open, NULL once closed (NULLs never collide in a unique index).
+    # A generated column rather than a partial index, which MySQL lacks. No storage given, so fresh
+    # schemas match v009: VIRTUAL on SQLite/MySQL, STORED on PostgreSQL.
+    open_user_id = Column(Integer, Computed("CASE WHEN punch_out IS NULL THEN user_id END"))
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -26,4 +46,4 @@ class AttendanceSession(Base):
             "punch_in": self.punch_in,
             "punch_out": self.punch_out,
             "date": self.date,
-        }
\ No newline at end of file
+        }
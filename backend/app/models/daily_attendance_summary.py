@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Float, Boolean, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class DailyAttendanceSummary(Base):
+    """Per (user, date) rollup of attendance_sessions, kept current by the punch paths."""
+    __tablename__ = "daily_attendance_summary"
+    __table_args__ = (
+        # All users for one day (admin daily view and exports)
+        Index("ix_daily_attendance_summary_date_user", "date", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    first_in = Column(DateTime, nullable=False)
+    last_out = Column(DateTime, nullable=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    worked_hours = Column(Float, nullable=False, default=0)  # Sum of session durations
+    has_open_session = Column(Boolean, nullable=False, default=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class DevicePunchEvent(Base):
+    """One processed event from a biometric/turnstile device; (device_id, event_id) makes uploads idempotent."""
+    __tablename__ = "device_punch_events"
+    __table_args__ = (
+        # Devices number their events independently, so ids only need to be unique per device
+        Index("ux_device_punch_events_device_event", "device_id", "event_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(String(100), nullable=False)
+    device_id = Column(String(100), nullable=True)  # NULL only on events stored before it was required
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    direction = Column(String(3), nullable=False)  # "in" or "out"
+    status = Column(String(20), nullable=False)  # "accepted" or "rejected"
+    reason = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Response of a successful write, replayed when a client retries with the same Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)  # JSON body
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
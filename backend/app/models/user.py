@@ -1,6 +1,7 @@
 # In app/models/user.py
 
-from sqlalchemy import Column, Integer, String, Enum
+from sqlalchemy import Column, Integer, String, Enum, Index, DateTime
+from datetime import datetime
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 import enum
@@ -13,6 +14,15 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination ordered by name (id breaks ties); email is already unique
+        Index("ix_users_name_id", "name", "id"),
+        # max(updated_at) for the export cache version reads the end of this index
+        Index("ix_users_updated_at", "updated_at"),
+        # Substring search on MySQL; other databases use user_search_grams
+        Index("ft_users_name_email", "name", "email",
+              mysql_prefix="FULLTEXT", mysql_with_parser="ngram").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -20,5 +30,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.employee)
     access_token = Column(String(255), nullable=True)
+    # Part of the export cache version; NULL on rows not changed since the column was added
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     attendance_sessions = relationship(AttendanceSession, back_populates="user")  # Use class directly
@@ -0,0 +1,62 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event, delete, insert, inspect
+from app.core.database import Base
+from app.models.user import User
+
+SEARCH_GRAM_SIZE = 3
+
+
+def search_grams(*values):
+    """
+    Every substring of up to SEARCH_GRAM_SIZE characters starting at each position,
+    lowercased. Full trigrams answer longer terms; the shorter tail grams make every
+    1-2 character substring a prefix of some stored gram.
+    """
+    grams = set()
+    for value in values:
+        value = (value or "").lower()
+        for start in range(len(value)):
+            grams.add(value[start:start + SEARCH_GRAM_SIZE])
+    return grams
+
+
+class UserSearchGram(Base):
+    """
+    Gram index over users.name and users.email, used for search on databases without
+    a FULLTEXT ngram parser (SQLite). MySQL searches its FULLTEXT index instead and
+    leaves this table empty.
+    """
+    __tablename__ = "user_search_grams"
+    __table_args__ = (
+        Index("ix_user_search_grams_gram_user", "gram", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    gram = Column(String(SEARCH_GRAM_SIZE), primary_key=True)
+
+
+def _uses_gram_index(connection):
+    return connection.dialect.name != "mysql"
+
+
+def _index_user(connection, user):
+    table = UserSearchGram.__table__
+    connection.execute(delete(table).where(table.c.user_id == user.id))
+    rows = [{"user_id": user.id, "gram": gram} for gram in search_grams(user.name, user.email)]
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+# Kept in step with ORM writes; bulk Core inserts call rebuild_user_search_grams instead
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, user):
+    if _uses_gram_index(connection):
+        _index_user(connection, user)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, user):
+    if not _uses_gram_index(connection):
+        return
+    changes = inspect(user).attrs
+    if changes.name.history.has_changes() or changes.email.history.has_changes():
+        _index_user(connection, user)
@@ -1,66 +1,138 @@
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Header, WebSocket
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
 from app.services.attendance_service import punch_in, handle_punch_out
-from app.middlewares.auth import get_current_user
+from app.middlewares.auth import get_current_user, get_stream_user
 from app.models.user import User
-from app.controllers.attendance_controller import get_user_attendance,get_all_attendance, export_my_attendance_controller, export_all_attendance_controller
+from app.controllers.attendance_controller import get_user_attendance,get_all_attendance, export_my_attendance_controller, export_all_attendance_controller, create_export_job_controller, get_export_job_controller, download_export_controller, ingest_punches_controller, live_attendance_stream_controller, live_attendance_websocket_controller, attendance_report_controller
 from typing import Optional
 from datetime import date  as Date
 from app.schemas.user_schema import UserSchema
+from app.schemas.attendance_session import ExportJobRequest, BulkPunchRequest
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
 @router.post("/punch-in")
-def punch_in_controller(
-    db: Session = Depends(get_db),
+async def punch_in_controller(
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    return punch_in(current_user.id, db)
+    return await punch_in(current_user.id, db, idempotency_key)
 
 @router.post("/punch-out")
-def punch_out_controller(
-    db: Session = Depends(get_db),
+async def punch_out_controller(
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    return handle_punch_out(current_user.id, db)
+    return await handle_punch_out(current_user.id, db, idempotency_key)
+
+
+@router.post("/punches/bulk", summary="Ingest buffered punch events from biometric/turnstile devices")
+async def ingest_punches(
+    request: BulkPunchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await ingest_punches_controller(request, db, current_user)
 
 
 @router.get("/me")
-def get_my_attendance(
+async def get_my_attendance(
     date: int = None,
     month: int = None,
     year: int = None,
-    db: Session = Depends(get_db),
+    start_date: Optional[Date] = Query(None, description="Range start; overrides date/month/year"),
+    end_date: Optional[Date] = Query(None, description="Range end, inclusive; defaults to start_date"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_user_attendance(current_user.id, db, date, month, year)
+    return await get_user_attendance(current_user.id, db, date, month, year, start_date, end_date)
 
 @router.get("/", summary="Get all users' attendance")
-def get_attendance_report(
+async def get_attendance_report(
+    request: Request,
     selected_date: Optional[Date] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    return get_all_attendance(selected_date, current_user)
+    return await get_all_attendance(selected_date, db, current_user, request)
+
+
+@router.get("/report", summary="Per-day or per-employee attendance totals for a date range")
+def get_attendance_range_report(
+    start_date: Date = Query(..., description="Range start, e.g. the 26th of the previous month"),
+    end_date: Date = Query(..., description="Range end, inclusive"),
+    group_by: str = Query("day", enum=["day", "user"]),
+    format: str = Query("json", enum=["json", "csv"]),
+    user_id: Optional[int] = Query(None, description="Admins only: limit the report to one employee"),
+    current_user: User = Depends(get_current_user)
+):
+    return attendance_report_controller(start_date, end_date, group_by, format, user_id, current_user)
+
 
+@router.get("/live", summary="Server-sent events with punch-in/punch-out deltas")
+async def live_attendance_stream(current_user: UserSchema = Depends(get_stream_user)):
+    return live_attendance_stream_controller(current_user)
+
+@router.websocket("/live/ws")
+async def live_attendance_websocket(websocket: WebSocket, current_user: UserSchema = Depends(get_stream_user)):
+    await live_attendance_websocket_controller(websocket, current_user)
 
 
 @router.get("/download/me")
 def download_my_attendance(
     request: Request,
-    format: str = Query("csv", enum=["csv", "excel", "pdf"]),
+    format: str = Query("csv", enum=["csv", "excel", "pdf", "parquet", "arrow"]),
     selected_date: str = Query(None),
+    start_date: str = Query(None, description="Range start (YYYY-MM-DD); overrides selected_date"),
+    end_date: str = Query(None, description="Range end (YYYY-MM-DD), inclusive; defaults to start_date"),
+    stream: bool = Query(False, description="Stream the CSV directly instead of returning a file URL"),
+    tz: Optional[str] = Query(None, description="IANA timezone for punch times (default: DISPLAY_TIMEZONE)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return export_my_attendance_controller(format, selected_date, db, current_user)
+    return export_my_attendance_controller(format, selected_date, db, current_user, start_date, end_date, stream, tz)
 
 @router.get("/download/all")
 def download_all_attendance(
     request: Request,
-    format: str = Query("csv", enum=["csv", "excel", "pdf"]),
+    format: str = Query("csv", enum=["csv", "excel", "pdf", "parquet", "arrow"]),
     selected_date: str = Query(None),
+    start_date: str = Query(None, description="Range start (YYYY-MM-DD); overrides selected_date"),
+    end_date: str = Query(None, description="Range end (YYYY-MM-DD), inclusive; defaults to start_date"),
+    stream: bool = Query(False, description="Stream the CSV directly instead of returning a file URL"),
+    tz: Optional[str] = Query(None, description="IANA timezone for punch times (default: DISPLAY_TIMEZONE)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return export_all_attendance_controller(format, selected_date, db, current_user)
\ No newline at end of file
+    return export_all_attendance_controller(format, selected_date, db, current_user, start_date, end_date, stream, tz)
+
+
+@router.post("/export-jobs", summary="Render an export in the background")
+def create_export_job(
+    request: ExportJobRequest,
+    current_user: User = Depends(get_current_user)
+):
+    return create_export_job_controller(request, current_user)
+
+@router.get("/export-jobs/{job_id}", summary="Export job status, progress and download URL")
+def get_export_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    return get_export_job_controller(job_id, current_user)
+
+
+@router.api_route("/files/{name}", methods=["GET", "HEAD"], summary="Download an export file through its signed link")
+async def download_export_file(
+    name: str,
+    request: Request,
+    user_id: int = Query(...),
+    expires: int = Query(...),
+    signature: str = Query(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await download_export_controller(name, user_id, expires, signature, request, db)
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends
 from app.schemas.auth_schema import LoginRequest
-from app.controllers.auth_controller import login_controller, get_db, get_me, logout_user
+from app.controllers.auth_controller import login_controller, get_db, get_me, logout_user, get_token_cache_stats
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.middlewares.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
 
 @router.post("/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    return login_controller(data, db)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    return await login_controller(data, db)
 
 @router.get("/me")
 def me(
@@ -23,4 +25,8 @@ def logout(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return logout_user(user, db)
\ No newline at end of file
+    return logout_user(user, db)
+
+@router.get("/token-cache/stats")
+def token_cache_stats(user: User = Depends(get_current_user)):
+    return get_token_cache_stats(user)
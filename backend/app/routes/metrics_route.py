@@ -0,0 +1,35 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import METRICS_TOKEN
+from app.core.database import engine, async_engine, get_async_db, SYNC_POOL, ASYNC_POOL
+from app.core.request_metrics import render_prometheus
+from app.middlewares.auth import resolve_token_user, security
+from app.models.user import UserRole
+
+router = APIRouter()
+
+
+async def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """The scrape token (METRICS_TOKEN) or an admin's access token: metrics expose routes, SQL and pools."""
+    if METRICS_TOKEN and hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        return
+    user = await resolve_token_user(credentials.credentials, db)
+    if user.role not in (UserRole.admin, UserRole.super_admin):
+        raise HTTPException(status_code=403, detail="Only admins can view metrics.")
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+            dependencies=[Depends(require_metrics_access)])
+def metrics():
+    # Prometheus text exposition format 0.0.4
+    return PlainTextResponse(
+        render_prometheus([(engine, SYNC_POOL), (async_engine.sync_engine, ASYNC_POOL)]),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from app.controllers.system_controller import get_pool_stats, get_password_pool_stats, get_daily_view_cache_stats, get_live_feed_stats, get_export_cache_stats
+from app.middlewares.auth import get_current_user
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/db-pool", summary="Connection pool usage, overflow and checkout wait times")
+def db_pool_stats(current_user: User = Depends(get_current_user)):
+    return get_pool_stats(current_user)
+
+
+@router.get("/password-pool", summary="Login password verifications in flight and the admission limit")
+def password_pool(current_user: User = Depends(get_current_user)):
+    return get_password_pool_stats(current_user)
+
+
+@router.get("/daily-view-cache", summary="Hit rate and size of the admin daily view cache")
+def daily_view_cache(current_user: User = Depends(get_current_user)):
+    return get_daily_view_cache_stats(current_user)
+
+
+@router.get("/live-feed", summary="Connections and backpressure counters of the live attendance feed")
+def live_feed(current_user: User = Depends(get_current_user)):
+    return get_live_feed_stats(current_user)
+
+
+@router.get("/export-cache", summary="Files, disk usage and hit rate of the export file cache")
+def export_cache(current_user: User = Depends(get_current_user)):
+    return get_export_cache_stats(current_user)
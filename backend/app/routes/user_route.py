@@ -1,28 +1,30 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.controllers.user_controller import get_all_users
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.middlewares.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
 
 @router.get("/")
-def list_users(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, le=100),
+async def list_users(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     search: Optional[str] = None,
-    sort_by: str = Query("created_at"),
+    sort_by: str = Query("id", description="id, name or email"),
     sort_order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    include_total: bool = Query(False, description="Also return the (cached) number of matching users"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_all_users(
+    return await get_all_users(
         db=db,
-        skip=skip,
         limit=limit,
+        cursor=cursor,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
-    )
\ No newline at end of file
+        sort_order=sort_order,
+        include_total=include_total
+    )
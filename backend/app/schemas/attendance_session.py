@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime, date
+from typing import List, Literal, Optional
+from typing_extensions import TypedDict
 
 class PunchInRequest(BaseModel):
     date: date
@@ -13,4 +15,68 @@ class AttendanceSessionResponse(BaseModel):
     class Config:
         orm_mode = True
         from_attributes = True
-        
\ No newline at end of file
+
+
+class ExportJobRequest(BaseModel):
+    format: Literal["csv", "excel", "pdf", "parquet", "arrow"] = "excel"
+    scope: Literal["me", "all"] = "me"
+    start_date: Optional[date] = None  # defaults to today
+    end_date: Optional[date] = None  # inclusive, defaults to start_date
+    timezone: Optional[str] = None  # IANA name for punch times, defaults to DISPLAY_TIMEZONE
+
+
+class PunchEvent(BaseModel):
+    event_id: str = Field(..., min_length=1, max_length=100)  # unique per device, used for idempotency
+    device_id: str = Field(..., min_length=1, max_length=100)
+    user_id: int
+    timestamp: datetime  # naive timestamps are treated as UTC
+    direction: Literal["in", "out"]
+
+
+class BulkPunchRequest(BaseModel):
+    events: List[PunchEvent] = Field(..., min_length=1, max_length=5000)
+
+
+# Response shapes serialized straight from SQL rows (TypeAdapter, no model instances)
+class SessionRow(TypedDict):
+    punch_in: datetime
+    punch_out: Optional[datetime]
+    duration: Optional[float]
+
+
+class DailyAttendanceRow(TypedDict):
+    user_id: int
+    name: str
+    email: str
+    date: date
+    first_punch_in: Optional[datetime]
+    last_punch_out: Optional[datetime]
+    total_duration: Optional[float]
+    sessions: List[SessionRow]
+
+
+class UserAttendanceDay(TypedDict):
+    date: date
+    first_punch_in: datetime
+    last_punch_out: Optional[datetime]
+    total_hours: float  # First punch-in to last punch-out
+    worked_hours: float  # Sum of session durations
+    sessions: List[SessionRow]
+
+
+class DailyAttendanceResponse(TypedDict):
+    success: bool
+    status_code: int
+    message: str
+    data: List[DailyAttendanceRow]
+
+
+class UserAttendanceResponse(TypedDict):
+    success: bool
+    status_code: int
+    message: str
+    data: List[UserAttendanceDay]
+
+
+DAILY_ATTENDANCE_RESPONSE = TypeAdapter(DailyAttendanceResponse)
+USER_ATTENDANCE_RESPONSE = TypeAdapter(UserAttendanceResponse)
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, TypeAdapter
+from typing import List, Optional
+from typing_extensions import TypedDict
 from datetime import datetime
+from app.models.user import UserRole
 
 class UserSchema(BaseModel):
     id: int
@@ -9,4 +11,29 @@ class UserSchema(BaseModel):
     role: str
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Response shapes serialized straight from SQL rows (TypeAdapter, no model instances)
+class UserRow(TypedDict):
+    id: int
+    name: str
+    email: str
+    role: UserRole
+
+
+class UserPage(TypedDict):
+    total: Optional[int]
+    limit: int
+    next_cursor: Optional[str]
+    users: List[UserRow]
+
+
+class UserPageResponse(TypedDict):
+    success: bool
+    status_code: int
+    message: str
+    data: UserPage
+
+
+USER_PAGE_RESPONSE = TypeAdapter(UserPageResponse)
@@ -1,35 +1,35 @@
+from sqlalchemy import select
 from app.models.user import User, UserRole
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal, engine
+from app.migrations import run_migrations
 from app.utils.hashing import hash_password
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-Base.metadata.create_all(bind=engine)
-
-db = SessionLocal()
-
 def seed_users():
+    run_migrations(engine)
+    db = SessionLocal()
+
     users = [
         {"name": "Super Admin", "email": "superadmin@yopmail.com", "role": UserRole.super_admin},
         {"name": "Admin", "email": "admin@yopmail.com", "role": UserRole.admin},
         {"name": "Employee", "email": "employee@yopmail.com", "role": UserRole.employee},
     ]
 
-    for u in users:
-        existing = db.query(User).filter(User.email == u["email"]).first()
-        if not existing:
-            user = User(
-                name=u["name"],
-                email=u["email"],
-                hashed_password=hash_password("Test@1234"),
-                role=u["role"]
-            )
-            db.add(user)
-    
-    db.commit()
-    db.close()
+    try:
+        existing = set(db.scalars(select(User.email).where(User.email.in_([u["email"] for u in users]))))
+        missing = [u for u in users if u["email"] not in existing]
+        if missing:
+            hashed_password = hash_password("Test@1234")  # Same password for every demo account
+            db.add_all([
+                User(name=u["name"], email=u["email"], hashed_password=hashed_password, role=u["role"])
+                for u in missing
+            ])
+            db.commit()
+    finally:
+        db.close()
     print("Seeding completed.")
 
 if __name__ == "__main__":
-    seed_users()
\ No newline at end of file
+    seed_users()
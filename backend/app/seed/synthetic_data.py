@@ -0,0 +1,168 @@
+"""
+Synthetic users and attendance history for load testing and benchmarks.
+
+Generates N users and M days of attendance ending today: one to three sessions per
+working day with random breaks, occasional absences, weekend shifts, and sessions
+still open on the last day (earlier days are always closed, since a user can have
+only one open session). Output is deterministic for a given --seed, user count and
+day count. Rows go in with bulk INSERTs, and every user shares one password hash.
+
+Usage (from backend/):
+    python -m app.seed.synthetic_data --users 10000 --days 365 --seed 42
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, time as clock_time, timedelta, timezone
+
+from sqlalchemy import insert, select
+
+from app.config.settings import REPORT_TIMEZONE
+from app.core.database import engine
+from app.migrations import run_migrations
+from app.models.attendance_session import AttendanceSession
+from app.models.user import User, UserRole
+from app.services.attendance_summary_service import rebuild_daily_summary
+from app.services.user_service import rebuild_user_search_grams
+from app.utils.hashing import hash_password
+from app.utils.timezones import get_zone
+
+EMAIL_DOMAIN = "load.example.com"
+DEFAULT_PASSWORD = "Test@1234"
+ADMIN_RATIO = 0.01
+WEEKDAY_ABSENCE_RATE = 0.05
+WEEKEND_ATTENDANCE_RATE = 0.05
+STILL_AT_WORK_RATE = 0.7  # Sessions left open on the last (current) day
+# Shifts start around 09:30 in REPORT_TIMEZONE; sessions are stored in naive UTC
+SHIFT_START = clock_time(9, 30)
+SHIFT_START_JITTER_MINUTES = 30
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Arjun", "Ananya", "Dev", "Diya", "Ishaan", "Kavya", "Krishna", "Meera",
+    "Neha", "Nikhil", "Priya", "Rahul", "Riya", "Rohan", "Saanvi", "Sahil", "Tanvi", "Vikram",
+]
+LAST_NAMES = [
+    "Agarwal", "Bose", "Chopra", "Das", "Gupta", "Iyer", "Jain", "Kapoor", "Khan", "Kumar",
+    "Menon", "Mehta", "Nair", "Patel", "Rao", "Reddy", "Shah", "Sharma", "Singh", "Verma",
+]
+
+
+def generate_users(rng: random.Random, count: int, hashed_password: str):
+    for index in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{index}@{EMAIL_DOMAIN}",
+            "hashed_password": hashed_password,
+            "role": UserRole.admin if rng.random() < ADMIN_RATIO else UserRole.employee,
+        }
+
+
+def generate_day(rng: random.Random, user_id: int, day: date, is_last_day: bool, created_at: datetime):
+    """Sessions of one user on one day (empty when absent)."""
+    if day.weekday() >= 5:
+        if rng.random() >= WEEKEND_ATTENDANCE_RATE:
+            return []
+    elif rng.random() < WEEKDAY_ABSENCE_RATE:
+        return []
+
+    shift_start = datetime.combine(day, SHIFT_START, tzinfo=get_zone(REPORT_TIMEZONE))
+    start = shift_start.astimezone(timezone.utc).replace(tzinfo=None) + timedelta(
+        minutes=rng.randint(-SHIFT_START_JITTER_MINUTES, SHIFT_START_JITTER_MINUTES)
+    )
+    session_count = rng.choices((1, 2, 3), weights=(25, 55, 20))[0]
+    remaining = rng.uniform(6.5, 9.5) * 60  # Minutes worked over the day
+
+    sessions = []
+    punch_in = start
+    for number in range(session_count):
+        last = number == session_count - 1
+        worked = remaining if last else rng.uniform(0.3, 0.6) * remaining
+        remaining -= worked
+        punch_out = punch_in + timedelta(seconds=int(worked * 60))
+        sessions.append({
+            "user_id": user_id,
+            "date": day,
+            "punch_in": punch_in,
+            "punch_out": punch_out,
+            "duration": round(worked / 60, 2),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        punch_in = punch_out + timedelta(minutes=rng.randint(15, 60))  # Break
+
+    if is_last_day and rng.random() < STILL_AT_WORK_RATE:
+        sessions[-1]["punch_out"] = None
+        sessions[-1]["duration"] = None
+    return sessions
+
+
+def seed_synthetic_data(users: int, days: int, seed: int = 42, end_date: date = None,
+                        password: str = DEFAULT_PASSWORD, batch_size: int = 10000, log=print):
+    """Insert the users and their attendance for the `days` days ending at end_date (default today)."""
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    created_at = datetime.utcnow()
+    started = time.perf_counter()
+
+    run_migrations(engine)
+    hashed_password = hash_password(password)  # bcrypt once, shared by every user
+
+    with engine.begin() as conn:
+        first_new_id = (conn.execute(select(User.id).order_by(User.id.desc()).limit(1)).scalar() or 0) + 1
+        rows = list(generate_users(rng, users, hashed_password))
+        for offset in range(0, len(rows), batch_size):
+            conn.execute(insert(User), rows[offset:offset + batch_size])
+        user_ids = list(conn.execute(
+            select(User.id).where(User.id >= first_new_id, User.email.like(f"%@{EMAIL_DOMAIN}")).order_by(User.id)
+        ).scalars())
+    log(f"Inserted {len(user_ids)} users ({time.perf_counter() - started:.1f}s)")
+
+    sessions = 0
+    with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            # Throw-away load data: skip the fsync per commit
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        batch = []
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            for user_id in user_ids:
+                batch.extend(generate_day(rng, user_id, day, day == end_date, created_at))
+                if len(batch) >= batch_size:
+                    conn.execute(insert(AttendanceSession), batch)
+                    conn.commit()
+                    sessions += len(batch)
+                    batch = []
+            if (offset + 1) % 30 == 0:
+                log(f"  {offset + 1}/{days} days, {sessions} sessions ({time.perf_counter() - started:.1f}s)")
+        if batch:
+            conn.execute(insert(AttendanceSession), batch)
+            conn.commit()
+            sessions += len(batch)
+    log(f"Inserted {sessions} attendance sessions ({time.perf_counter() - started:.1f}s)")
+
+    # Bulk inserts bypass the ORM hooks that keep these up to date
+    with engine.begin() as conn:
+        summaries = rebuild_daily_summary(conn, start_date, end_date)
+        rebuild_user_search_grams(conn)
+    log(f"Rebuilt {summaries} daily summaries and the user search index ({time.perf_counter() - started:.1f}s)")
+    return {"users": len(user_ids), "sessions": sessions, "summaries": summaries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        help="Last day of generated history (default: today)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per INSERT batch")
+    args = parser.parse_args()
+
+    seed_synthetic_data(args.users, args.days, args.seed, args.end_date, args.password, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
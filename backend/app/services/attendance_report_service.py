@@ -0,0 +1,195 @@
+"""
+Range attendance reports (e.g. a payroll period from the 26th to the 25th) aggregated in SQL.
+
+One query returns every (user, day) of the range: users are cross-joined with a calendar
+of the requested days and outer-joined to daily_attendance_summary, so absences come back
+as rows without sessions instead of being filled in by a Python loop. Per-day figures
+follow fetch_user_attendance: first punch-in, last punch-out and total_hours as the span
+between them, plus worked_hours (sum of session durations) and the session count. Each
+calendar day carries its late-arrival threshold already converted to naive UTC, so late
+arrivals are a plain comparison with first_in. group_by="user" wraps the same query in a
+GROUP BY for per-employee totals.
+
+The calendar is a recursive CTE counting day offsets from start_date; everything else a
+day needs (weekday, whether it is past, the REPORT_TIMEZONE offset) is integer arithmetic
+on that offset, with the offset's DST changes found in Python. MySQL caps the recursion at
+cte_max_recursion_depth (1000 by default), above the default REPORT_MAX_DAYS.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Integer, and_, case, cast, func, literal, literal_column, select, true
+from sqlalchemy.orm import Session
+
+from app.config.settings import LATE_ARRIVAL_AFTER, REPORT_MAX_DAYS, REPORT_TIMEZONE, REPORT_WORKDAYS
+from app.core.database import SessionLocal
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+from app.models.user import User
+from app.services.attendance_service import _hours_between
+from app.utils.file_exporter import stream_csv
+from app.utils.json_response import dumps
+from app.utils.timezones import get_zone
+
+REPORT_GROUPINGS = ["day", "user"]
+REPORT_FORMATS = ["json", "csv"]
+DAY_COLUMNS = ["user_id", "name", "email", "date", "first_punch_in", "last_punch_out",
+               "total_hours", "worked_hours", "sessions", "late", "absent"]
+USER_COLUMNS = ["user_id", "name", "email", "days_present", "absences", "late_arrivals",
+                "sessions", "total_hours", "worked_hours"]
+HOUR_COLUMNS = {"total_hours", "worked_hours"}
+
+
+def validate_report_range(start_date: date, end_date: date):
+    if end_date < start_date:
+        raise ValueError("end_date must be on or after start_date.")
+    if (end_date - start_date).days + 1 > REPORT_MAX_DAYS:
+        raise ValueError(f"Reports cover at most {REPORT_MAX_DAYS} days.")
+
+
+def _add_days(dialect: str, start_date: date, days):
+    """SQL date expression: start_date plus an integer column of days."""
+    if dialect == "sqlite":
+        return func.date(start_date.isoformat(), func.printf("+%d days", days))
+    if dialect == "mysql":
+        return func.adddate(cast(literal(start_date), Date), days)
+    return cast(literal(start_date), Date) + days
+
+
+def _add_seconds(dialect: str, start: datetime, seconds):
+    """SQL naive datetime expression: start plus an integer column of seconds."""
+    if dialect == "sqlite":
+        # Same text format as stored DateTime values, so comparisons with first_in stay exact
+        return func.strftime("%Y-%m-%d %H:%M:%f", start.isoformat(" "), func.printf("+%d seconds", seconds)).concat("000")
+    if dialect == "mysql":
+        return func.timestampadd(literal_column("SECOND"), seconds, cast(literal(start), DateTime))
+    return cast(literal(start), DateTime) + seconds * literal_column("INTERVAL '1 second'")
+
+
+def _utc_offsets(start_date: date, day_count: int, late_time: time, zone):
+    """[(first day offset, UTC offset in seconds at late_time)] for each run of days sharing one offset."""
+    runs = []
+    for offset in range(day_count):
+        day = start_date + timedelta(days=offset)
+        seconds = int(datetime.combine(day, late_time, tzinfo=zone).utcoffset().total_seconds())
+        if not runs or runs[-1][1] != seconds:
+            runs.append((offset, seconds))
+    return runs
+
+
+def _calendar(dialect: str, start_date: date, end_date: date):
+    """CTE with one row per day: (day, late_after in naive UTC, expected = 1 on past/current working days)."""
+    zone = get_zone(REPORT_TIMEZONE)
+    late_time = time.fromisoformat(LATE_ARRIVAL_AFTER)
+    day_count = (end_date - start_date).days + 1
+    today_offset = (datetime.now(zone).date() - start_date).days
+
+    offsets = select(literal(0, Integer).label("n")).cte("calendar_days", recursive=True)
+    offsets = offsets.union_all(select(offsets.c.n + 1).where(offsets.c.n < day_count - 1))
+    n = offsets.c.n
+
+    runs = _utc_offsets(start_date, day_count, late_time, zone)
+    utc_offset = literal(runs[0][1], Integer) if len(runs) == 1 else case(
+        *[(n < first, previous) for (_, previous), (first, _) in zip(runs, runs[1:])], else_=runs[-1][1]
+    )
+    late_seconds = late_time.hour * 3600 + late_time.minute * 60 + late_time.second
+    weekday = (n + start_date.weekday()) % 7
+
+    return select(
+        _add_days(dialect, start_date, n).label("day"),
+        _add_seconds(dialect, datetime.combine(start_date, time()), n * 86400 + late_seconds - utc_offset)
+        .label("late_after"),
+        case((and_(weekday.in_(REPORT_WORKDAYS), n <= today_offset), 1), else_=0).label("expected"),
+    ).cte("calendar")
+
+
+def report_day_query(dialect: str, start_date: date, end_date: date, user_id: Optional[int] = None):
+    """Every user (or one) for every day of the range, ordered by name, user and day."""
+    calendar = _calendar(dialect, start_date, end_date)
+    summary = DailyAttendanceSummary
+    query = select(
+        User.id.label("user_id"),
+        User.name,
+        User.email,
+        calendar.c.day.label("date"),
+        summary.first_in.label("first_punch_in"),
+        summary.last_out.label("last_punch_out"),
+        func.coalesce(_hours_between(dialect, summary.first_in, summary.last_out), 0).label("total_hours"),
+        func.coalesce(summary.worked_hours, 0).label("worked_hours"),
+        func.coalesce(summary.session_count, 0).label("sessions"),
+        case((summary.first_in > calendar.c.late_after, 1), else_=0).label("late"),
+        case((and_(summary.user_id == None, calendar.c.expected == 1), 1), else_=0).label("absent"),
+    ).select_from(User).join(calendar, true()).outerjoin(
+        summary,
+        and_(summary.user_id == User.id, summary.date == calendar.c.day)
+    )
+    if user_id is not None:
+        query = query.where(User.id == user_id)
+    return query.order_by(User.name, User.id, calendar.c.day)
+
+
+def report_user_query(dialect: str, start_date: date, end_date: date, user_id: Optional[int] = None):
+    """Per-user totals over the range, ordered by name and user."""
+    days = report_day_query(dialect, start_date, end_date, user_id).order_by(None).subquery()
+    return select(
+        days.c.user_id,
+        days.c.name,
+        days.c.email,
+        func.sum(case((days.c.sessions > 0, 1), else_=0)).label("days_present"),
+        func.sum(days.c.absent).label("absences"),
+        func.sum(days.c.late).label("late_arrivals"),
+        func.sum(days.c.sessions).label("sessions"),
+        func.sum(days.c.total_hours).label("total_hours"),
+        func.sum(days.c.worked_hours).label("worked_hours"),
+    ).group_by(days.c.user_id, days.c.name, days.c.email).order_by(days.c.name, days.c.user_id)
+
+
+def iter_attendance_report(db: Session, start_date: date, end_date: date, user_id: Optional[int] = None,
+                           group_by: str = "day", batch_size: int = 1000):
+    """Report rows as dicts, read through a server-side cursor."""
+    validate_report_range(start_date, end_date)
+    build = report_user_query if group_by == "user" else report_day_query
+    columns = USER_COLUMNS if group_by == "user" else DAY_COLUMNS
+    query = build(db.get_bind().dialect.name, start_date, end_date, user_id)
+    for row in db.execute(query.execution_options(yield_per=batch_size)):
+        record = dict(zip(columns, row))
+        for column in HOUR_COLUMNS:
+            record[column] = round(float(record[column] or 0), 2)
+        if group_by == "day" and isinstance(record["date"], str):
+            # SQLite returns the calendar literal untyped
+            record["date"] = date.fromisoformat(record["date"])
+        yield record
+
+
+def _json_members(fields: dict) -> bytes:
+    """Encoded `"key":value,` pairs, to open an object whose last member is streamed after them."""
+    return b"".join(dumps(key) + b":" + dumps(value) + b"," for key, value in fields.items())
+
+
+def _json_chunks(rows, meta: dict, chunk_rows: int = 500):
+    """The success_response envelope around a streamed data.rows array, encoded straight from the row dicts."""
+    envelope = {"success": True, "status_code": 200, "message": "Attendance report generated successfully"}
+    chunk = [b"{" + _json_members(envelope) + b'"data":{' + _json_members(meta) + b'"rows":[']
+    separator = b""
+    for count, row in enumerate(rows, start=1):
+        chunk.append(separator + dumps(row))
+        separator = b","
+        if count % chunk_rows == 0:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(b"]}}")
+    yield b"".join(chunk)
+
+
+def stream_attendance_report(start_date: date, end_date: date, user_id: Optional[int] = None,
+                             group_by: str = "day", report_format: str = "json"):
+    """JSON or CSV chunks for a StreamingResponse; owns its DB session for the lifetime of the stream."""
+    db = SessionLocal()
+    try:
+        rows = iter_attendance_report(db, start_date, end_date, user_id, group_by)
+        if report_format == "csv":
+            yield from stream_csv(rows, headers=USER_COLUMNS if group_by == "user" else DAY_COLUMNS)
+        else:
+            meta = {"start_date": start_date, "end_date": end_date, "group_by": group_by}
+            yield from _json_chunks(rows, meta)
+    finally:
+        db.close()
@@ -1,196 +1,279 @@
-from sqlalchemy.orm import Session,joinedload
-from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, literal_column
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from app.models.attendance_session import AttendanceSession
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+from app.services.attendance_summary_service import refresh_daily_summaries
+from app.services.idempotency_service import get_replay, store_response
+from app.core.live_feed import publish_attendance_events
+from app.utils.attendance_view_cache import invalidate_daily_views
 from app.utils.response import error_response, success_response
 from fastapi import HTTPException
-from collections import defaultdict
-from app.core.database import get_db
+from app.core.database import SessionLocal
 from app.models.user import User
-from pytz import timezone
-from app.utils.file_exporter import (
-    get_export_filename,
-    export_to_csv,
-    export_to_excel,
-    export_to_pdf
-)
-
-def punch_in(user_id: int, db: Session):
-    today = date.today()
-
-    # Check if there's an existing session today without punch_out
-    existing_session = db.query(AttendanceSession).filter(
+from itertools import chain, islice
+from app.config.settings import DISPLAY_TIMEZONE, EXPORT_ROW_GROUP_SIZE
+from app.utils.timezones import business_date, format_local_times
+from app.utils.export_cache import cached_export_path, lookup_export, publishing
+from app.utils.file_exporter import EXPORT_COLUMNS, check_export_format, get_exporter, stream_csv
+
+# Typed, columnar formats written in row groups straight from the query
+COLUMNAR_FORMATS = ["parquet", "arrow"]
+# How often (in rows) render_attendance_export reports progress
+EXPORT_PROGRESS_EVERY = 1000
+# Endpoint names recorded with Idempotency-Key responses
+PUNCH_IN = "punch-in"
+PUNCH_OUT = "punch-out"
+ALREADY_PUNCHED_IN = "You have already punched in and not punched out yet."
+NO_ACTIVE_SESSION = "No active punch-in session found."
+# Live feed event types
+PUNCH_IN_EVENT = "punch_in"
+PUNCH_OUT_EVENT = "punch_out"
+
+
+async def _replay_after_conflict(db: AsyncSession, user_id: int, idempotency_key: Optional[str], endpoint: str):
+    # A concurrent request won the race; if it was a retry of this one, replay its response
+    await db.rollback()
+    return await get_replay(db, user_id, idempotency_key, endpoint)
+
+
+async def punch_in(user_id: int, db: AsyncSession, idempotency_key: Optional[str] = None):
+    replay = await get_replay(db, user_id, idempotency_key, PUNCH_IN)
+    if replay:
+        return replay
+
+    now = datetime.utcnow()
+    today = business_date(now)
+
+    # Check if there's an existing session without punch_out, including one left open on an earlier day
+    result = await db.execute(select(AttendanceSession).where(
         AttendanceSession.user_id == user_id,
-        AttendanceSession.date == today,
         AttendanceSession.punch_out == None
-    ).first()
+    ).limit(1))
+    existing_session = result.scalars().first()
 
     if existing_session:
-        return error_response("You have already punched in and not punched out yet.", 400)
+        return error_response(ALREADY_PUNCHED_IN, 400)
 
     # Otherwise, create a new punch-in session
     new_session = AttendanceSession(
         user_id=user_id,
         date=today,
-        punch_in=datetime.utcnow()
+        punch_in=now
     )
 
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
-
-    return success_response("Punched in successfully", {
+    try:
+        # The unique open-session index rejects a concurrent punch-in that passed the check above
+        await db.flush()
+    except IntegrityError:
+        return await _replay_after_conflict(db, user_id, idempotency_key, PUNCH_IN) or error_response(ALREADY_PUNCHED_IN, 400)
+
+    await refresh_daily_summaries(db, [(user_id, today)])
+    response = success_response("Punched in successfully", {
         "session_id": new_session.id,
         "punch_in": new_session.punch_in
     })
+    try:
+        await store_response(db, user_id, idempotency_key, PUNCH_IN, response)
+    except IntegrityError:
+        return await _replay_after_conflict(db, user_id, idempotency_key, PUNCH_IN) or error_response(ALREADY_PUNCHED_IN, 400)
+    await db.commit()
+    invalidate_daily_views([today])
+    await publish_attendance_events([{
+        "type": PUNCH_IN_EVENT, "user_id": user_id, "date": today, "session_id": new_session.id,
+        "timestamp": new_session.punch_in, "source": "app",
+    }])
+
+    return response
 
 
-def handle_punch_out(user_id: int, db: Session):
-    today = datetime.utcnow().date()
+async def handle_punch_out(user_id: int, db: AsyncSession, idempotency_key: Optional[str] = None):
+    replay = await get_replay(db, user_id, idempotency_key, PUNCH_OUT)
+    if replay:
+        return replay
 
-    # Get today's last punch-in session without punch-out
-    session = db.query(AttendanceSession).filter_by(
+    now = datetime.utcnow()
+
+    # The user's open session (a shift may have started the day before), locked so concurrent punch-outs queue on it
+    result = await db.execute(select(AttendanceSession).filter_by(
         user_id=user_id,
-        date=today,
         punch_out=None
-    ).order_by(AttendanceSession.punch_in.desc()).first()
+    ).limit(1).with_for_update())
+    session = result.scalars().first()
 
     if not session:
-        raise HTTPException(status_code=404, detail="No active punch-in session found for today.")
-
-    now = datetime.utcnow()
-    session.punch_out = now
+        raise HTTPException(status_code=404, detail=NO_ACTIVE_SESSION)
 
     # Calculate duration in hours
     delta = now - session.punch_in
-    session.duration = round(delta.total_seconds() / 3600, 2)
-
-    db.commit()
-    db.refresh(session)
+    duration = round(delta.total_seconds() / 3600, 2)
 
-    return {
+    # Only closes the session if it is still open (SQLite has no row locks)
+    closed = await db.execute(update(AttendanceSession).where(
+        AttendanceSession.id == session.id,
+        AttendanceSession.punch_out == None
+    ).values(punch_out=now, duration=duration, updated_at=now))
+    if closed.rowcount == 0:
+        replay = await _replay_after_conflict(db, user_id, idempotency_key, PUNCH_OUT)
+        if replay:
+            return replay
+        raise HTTPException(status_code=404, detail=NO_ACTIVE_SESSION)
+
+    await refresh_daily_summaries(db, [(user_id, session.date)])
+    response = {
         "punch_in": session.punch_in,
-        "punch_out": session.punch_out,
-        "duration": session.duration
+        "punch_out": now,
+        "duration": duration
     }
-    
-    
-def fetch_user_attendance(user_id: int, db: Session, date=None, month=None, year=None):
+    try:
+        await store_response(db, user_id, idempotency_key, PUNCH_OUT, response)
+    except IntegrityError:
+        replay = await _replay_after_conflict(db, user_id, idempotency_key, PUNCH_OUT)
+        if replay:
+            return replay
+        raise HTTPException(status_code=404, detail=NO_ACTIVE_SESSION)
+    await db.commit()
+    invalidate_daily_views([session.date])
+    await publish_attendance_events([{
+        "type": PUNCH_OUT_EVENT, "user_id": user_id, "date": session.date, "session_id": session.id,
+        "timestamp": now, "punch_in": session.punch_in, "duration": duration, "source": "app",
+    }])
+
+    return response
+
+async def fetch_user_attendance(user_id: int, db: AsyncSession, date=None, month=None, year=None,
+                                start_date=None, end_date=None):
     now = datetime.utcnow()
     year = year or now.year
     month = month or now.month
 
-    if date:
+    if start_date:
+        # Arbitrary range (e.g. a payroll period), inclusive
+        end_date = end_date or start_date
+    elif date:
         # Filter by specific date
-        target_date = datetime(year, month, date).date()
-        sessions = db.query(AttendanceSession).filter_by(user_id=user_id, date=target_date).all()
+        start_date = end_date = datetime(year, month, date).date()
     else:
         # Filter by month and year
         start_date = datetime(year, month, 1).date()
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1).date()
-        else:
-            end_date = datetime(year, month + 1, 1).date()
-
-        sessions = db.query(AttendanceSession).filter(
-            AttendanceSession.user_id == user_id,
-            AttendanceSession.date >= start_date,
-            AttendanceSession.date < end_date
-        ).all()
-
-    # Group sessions by date
-    grouped = defaultdict(list)
-    for session in sessions:
-        grouped[session.date].append(session)
+        next_month = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+        end_date = next_month.date() - timedelta(days=1)
+
+    # Per-day aggregates come from the maintained summary table, sessions only for their own columns
+    summary = DailyAttendanceSummary
+    total_hours = _hours_between(db.get_bind().dialect.name, summary.first_in, summary.last_out)
+    query = select(
+        summary.date,
+        summary.first_in,
+        summary.last_out,
+        total_hours.label("total_hours"),
+        summary.worked_hours,
+        AttendanceSession.punch_in,
+        AttendanceSession.punch_out,
+        AttendanceSession.duration,
+    ).join(
+        AttendanceSession,
+        and_(AttendanceSession.user_id == summary.user_id, AttendanceSession.date == summary.date)
+    ).where(
+        summary.user_id == user_id,
+        summary.date >= start_date,
+        summary.date <= end_date
+    ).order_by(summary.date.desc(), AttendanceSession.punch_in)
 
     response = []
-    for session_date, records in grouped.items():
-        records = sorted(records, key=lambda s: s.punch_in)
-
-        first_punch_in = records[0].punch_in
-        last_punch_out = next((r.punch_out for r in reversed(records) if r.punch_out), None)
-
-        total_hours = 0
-        if first_punch_in and last_punch_out:
-            delta = last_punch_out - first_punch_in
-            total_hours = round(delta.total_seconds() / 3600, 2)
-
-        response.append({
-            "date": session_date,
-            "first_punch_in": first_punch_in,
-            "last_punch_out": last_punch_out,
-            "total_hours": total_hours,
-            "sessions": [
-                {
-                    "punch_in": r.punch_in,
-                    "punch_out": r.punch_out,
-                    "duration": r.duration
-                } for r in records
-            ]
+    current = None
+    for row in (await db.execute(query)).all():
+        if current is None or current["date"] != row.date:
+            current = {
+                "date": row.date,
+                "first_punch_in": row.first_in,
+                "last_punch_out": row.last_out,
+                "total_hours": round(row.total_hours or 0, 2),
+                "worked_hours": row.worked_hours,
+                "sessions": [],
+            }
+            response.append(current)
+        current["sessions"].append({
+            "punch_in": row.punch_in,
+            "punch_out": row.punch_out,
+            "duration": row.duration,
         })
 
-    # Sort by date descending
-    response.sort(key=lambda x: x["date"], reverse=True)
     return response
 
-def fetch_all_attendance(selected_date: Optional[date]):
-        session = next(get_db())
-
-        if not selected_date:
-            selected_date = date.today()
-
-        users = session.query(User).options(
-            joinedload(User.attendance_sessions)
-        ).all()
-
-        results = []
-        for user in users:
-            sessions = [
-                s for s in user.attendance_sessions
-                if s.date == selected_date
-            ]
-
-            if sessions:
-                punch_ins = [s.punch_in for s in sessions]
-                punch_outs = [s.punch_out for s in sessions if s.punch_out]
-
-                first_punch_in = min(punch_ins) if punch_ins else None
-                last_punch_out = max(punch_outs) if punch_outs else None
-
-                total_duration = (
-                    (last_punch_out - first_punch_in).total_seconds() / 3600
-                    if first_punch_in and last_punch_out else 0
-                )
-
-                session_data = [
-                    {
-                        "punch_in": s.punch_in,
-                        "punch_out": s.punch_out,
-                        "duration": s.duration,
-                    }
-                    for s in sessions
-                ]
-            else:
-                first_punch_in = None
-                last_punch_out = None
-                total_duration = None
-                session_data = []
-
-            results.append({
-                "user_id": user.id,
-                "name": user.name,
-                "email": user.email,
+def _hours_between(dialect: str, start, end):
+    """SQL expression for the number of hours between two datetime columns."""
+    if dialect == "mysql":
+        seconds = func.timestampdiff(literal_column("SECOND"), start, end)
+    elif dialect == "sqlite":
+        seconds = (func.julianday(end) - func.julianday(start)) * 86400
+    else:
+        seconds = func.extract("epoch", end - start)
+    return seconds / 3600.0
+
+
+async def fetch_all_attendance(selected_date: Optional[date], db: AsyncSession):
+    if not selected_date:
+        selected_date = date.today()
+
+    # Per-user aggregates for the selected date come from the maintained summary table
+    summary = DailyAttendanceSummary
+    total_duration = _hours_between(db.get_bind().dialect.name, summary.first_in, summary.last_out)
+
+    # Users outer-joined to their sessions of the day; absent users get a single NULL row
+    query = select(
+        User.id,
+        User.name,
+        User.email,
+        summary.first_in.label("first_punch_in"),
+        summary.last_out.label("last_punch_out"),
+        total_duration.label("total_duration"),
+        AttendanceSession.punch_in,
+        AttendanceSession.punch_out,
+        AttendanceSession.duration,
+    ).outerjoin(
+        summary,
+        and_(summary.user_id == User.id, summary.date == selected_date)
+    ).outerjoin(
+        AttendanceSession,
+        and_(
+            AttendanceSession.user_id == User.id,
+            AttendanceSession.date == selected_date
+        )
+    ).order_by(User.id, AttendanceSession.punch_in)
+
+    rows = (await db.execute(query)).all()
+
+    results = []
+    current = None
+    for row in rows:
+        if current is None or current["user_id"] != row.id:
+            has_sessions = row.first_punch_in is not None
+            current = {
+                "user_id": row.id,
+                "name": row.name,
+                "email": row.email,
                 "date": selected_date,
-                "first_punch_in": first_punch_in,
-                "last_punch_out": last_punch_out,
-                "total_duration": round(total_duration, 2) if total_duration is not None else None,
-                "sessions": session_data
+                "first_punch_in": row.first_punch_in,
+                "last_punch_out": row.last_punch_out,
+                "total_duration": round(row.total_duration or 0, 2) if has_sessions else None,
+                "sessions": []
+            }
+            results.append(current)
+
+        if row.punch_in is not None:
+            current["sessions"].append({
+                "punch_in": row.punch_in,
+                "punch_out": row.punch_out,
+                "duration": row.duration,
             })
 
-        session.close()
-        return results
+    return results
     
 def format_attendance_data(records):
     formatted = []
@@ -207,112 +290,305 @@ def format_attendance_data(records):
             })
     return formatted
 
-def convert_utc_to_ist(utc_datetime):
-    """Convert UTC datetime to Indian Standard Time"""
-    if utc_datetime is None:
-        return None
-    utc_tz = timezone('UTC')
-    ist_tz = timezone('Asia/Kolkata')
-    
-    # If datetime is naive, assume it's UTC
-    if utc_datetime.tzinfo is None:
-        utc_datetime = utc_tz.localize(utc_datetime)
-    
-    return utc_datetime.astimezone(ist_tz)
+def _export_row(row, first_entry: bool, punch_in: Optional[str], punch_out: Optional[str]):
+    # punch_in / punch_out are wall-clock times already converted to the display timezone
+    punch_out_status = punch_out or "In Progress"
+    duration = round(row.duration, 2) if row.duration else 0
+
+    if first_entry:
+        return {
+            "Date": row.date.isoformat(),
+            "Name": row.name,
+            "Email": row.email,
+            "Punch In": punch_in or "N/A",
+            "Punch Out": punch_out_status,
+            "Duration (hours)": duration,
+            "Total Hours": round(row.total_duration or 0, 2),
+            "is_first_entry": True  # Flag for formatting
+        }
+
+    # Additional entries for multiple punch-ins/outs (merged rows)
+    return {
+        "Date": "",  # Empty for merged cells
+        "Name": "",  # Empty for merged cells
+        "Email": "",  # Empty for merged cells
+        "Punch In": punch_in or "N/A",
+        "Punch Out": punch_out_status,
+        "Duration (hours)": duration,
+        "Total Hours": "",  # Empty for merged cells
+        "is_first_entry": False
+    }
 
-def get_attendance_export(db: Session, user: User, export_format: str, selected_date: date, export_all=False):
-    if export_format not in ["csv", "excel", "pdf"]:
-        raise HTTPException(status_code=400, detail="Invalid export format")
+
+def _absent_rows(name: str, email: str, start_date: date, end_date: date):
+    day = start_date
+    while day <= end_date:
+        yield {
+            "Date": day.isoformat(),
+            "Name": name,
+            "Email": email,
+            "Punch In": "Absent",
+            "Punch Out": "Absent",
+            "Duration (hours)": 0,
+            "Total Hours": 0,
+            "is_first_entry": True
+        }
+        day += timedelta(days=1)
+
+
+def _attendance_export_query(db: Session, user_id: int, start_date: date, end_date: date, export_all=False):
+    """Users outer-joined to their sessions in [start_date, end_date], ordered by name, user, date and punch-in."""
+    query = db.query(
+        User.id,
+        User.name,
+        User.email,
+        AttendanceSession.date,
+        AttendanceSession.punch_in,
+        AttendanceSession.punch_out,
+        AttendanceSession.duration,
+        DailyAttendanceSummary.worked_hours.label("total_duration"),
+    ).outerjoin(
+        AttendanceSession,
+        and_(
+            AttendanceSession.user_id == User.id,
+            AttendanceSession.date >= start_date,
+            AttendanceSession.date <= end_date
+        )
+    ).outerjoin(
+        DailyAttendanceSummary,
+        and_(
+            DailyAttendanceSummary.user_id == AttendanceSession.user_id,
+            DailyAttendanceSummary.date == AttendanceSession.date
+        )
+    )
 
     # Handle single user (employee) or all users (admin)
     if not export_all:
-        users_data = db.query(User).options(
-            joinedload(User.attendance_sessions)
-        ).filter(User.id == user.id).all()
-    else:
-        users_data = db.query(User).options(
-            joinedload(User.attendance_sessions)
-        ).order_by(User.name.asc()).all()  # Order by name ascending
-
-    # Prepare data for selected date
-    export_data = []
-    
-    for user_obj in users_data:
-        # Filter sessions for the selected date and order by punch_in time (ascending)
-        sessions = [
-            s for s in user_obj.attendance_sessions
-            if s.date == selected_date
-        ]
-        sessions.sort(key=lambda x: x.punch_in if x.punch_in else datetime.min)
-
-        if sessions:
-            # Calculate total time worked
-            total_duration = sum(s.duration for s in sessions if s.duration) or 0
-            
-            # First entry with user details
-            first_session = sessions[0]
-            
-            # Convert UTC times to IST
-            punch_in_ist = convert_utc_to_ist(first_session.punch_in)
-            punch_out_ist = convert_utc_to_ist(first_session.punch_out) if first_session.punch_out else None
-            
-            punch_out_status = "In Progress" if not punch_out_ist else punch_out_ist.strftime('%H:%M:%S')
-            duration = round(first_session.duration, 2) if first_session.duration else 0
-            
-            export_data.append({
-                "Date": first_session.date.strftime('%Y-%m-%d'),
-                "Name": user_obj.name,
-                "Email": user_obj.email,
-                "Punch In": punch_in_ist.strftime('%H:%M:%S') if punch_in_ist else "N/A",
-                "Punch Out": punch_out_status,
-                "Duration (hours)": duration,
-                "Total Hours": round(total_duration, 2),
-                "is_first_entry": True  # Flag for formatting
-            })
-            
-            # Additional entries for multiple punch-ins/outs (merged rows)
-            for session in sessions[1:]:
-                # Convert UTC times to IST
-                punch_in_ist = convert_utc_to_ist(session.punch_in)
-                punch_out_ist = convert_utc_to_ist(session.punch_out) if session.punch_out else None
-                
-                punch_out_status = "In Progress" if not punch_out_ist else punch_out_ist.strftime('%H:%M:%S')
-                duration = round(session.duration, 2) if session.duration else 0
-                
-                export_data.append({
-                    "Date": "",  # Empty for merged cells
-                    "Name": "",  # Empty for merged cells
-                    "Email": "",  # Empty for merged cells
-                    "Punch In": punch_in_ist.strftime('%H:%M:%S') if punch_in_ist else "N/A",
-                    "Punch Out": punch_out_status,
-                    "Duration (hours)": duration,
-                    "Total Hours": "",  # Empty for merged cells
-                    "is_first_entry": False
-                })
+        query = query.filter(User.id == user_id)
+
+    return query.order_by(User.name.asc(), User.id, AttendanceSession.date, AttendanceSession.punch_in)
+
+
+def _with_local_times(query, batch_size: int, display_tz: str):
+    """(row, punch-in, punch-out) with the times formatted in display_tz, converted batch_size rows at a time."""
+    rows = iter(query)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        punch_ins = format_local_times([row.punch_in for row in batch], display_tz)
+        punch_outs = format_local_times([row.punch_out for row in batch], display_tz)
+        yield from zip(batch, punch_ins, punch_outs)
+
+
+def iter_attendance_export_rows(db: Session, user_id: int, start_date: date, end_date: date, export_all=False,
+                                batch_size: int = 5000, display_tz: str = DISPLAY_TIMEZONE):
+    """
+    Yield export rows for [start_date, end_date], one session at a time.
+
+    Rows are read through a server-side cursor and grouped per (user, date) as they
+    stream past, so memory stays constant regardless of the size of the report.
+    Punch times are shown in display_tz, converted a cursor batch at a time.
+    Users are ordered by name; with export_all, days without sessions become "Absent" rows.
+    """
+    query = _attendance_export_query(db, user_id, start_date, end_date, export_all).yield_per(batch_size)
+
+    current_user = None
+    current_date = None
+    next_day = start_date
+    for row, punch_in, punch_out in _with_local_times(query, batch_size, display_tz):
+        if row.id != current_user:
+            if current_user is not None and export_all:
+                yield from _absent_rows(previous.name, previous.email, next_day, end_date)
+            current_user = row.id
+            current_date = None
+            next_day = start_date
+
+        previous = row
+        if row.date is None:
+            # User without any session in the range
+            continue
+
+        if row.date != current_date:
+            if export_all:
+                yield from _absent_rows(row.name, row.email, next_day, row.date - timedelta(days=1))
+            current_date = row.date
+            next_day = row.date + timedelta(days=1)
+            yield _export_row(row, True, punch_in, punch_out)
         else:
-            # User with no attendance (only for export_all)
+            yield _export_row(row, False, punch_in, punch_out)
+
+    if current_user is not None and export_all:
+        yield from _absent_rows(previous.name, previous.email, next_day, end_date)
+
+
+def iter_attendance_export_columns(db: Session, user_id: int, start_date: date, end_date: date, export_all=False,
+                                   batch_size: int = EXPORT_ROW_GROUP_SIZE):
+    """
+    Yield the export as column batches ({column: [values]}, up to batch_size rows each)
+    for the typed formats, straight from the cursor. One row per session with naive UTC
+    timestamps and float hours; with export_all, days without sessions become rows with
+    absent=True and no times.
+    """
+    query = _attendance_export_query(db, user_id, start_date, end_date, export_all).yield_per(min(batch_size, 10000))
+    batch = {column: [] for column in EXPORT_COLUMNS}
+
+    def add(row, day, punch_in=None, punch_out=None, duration=None, total_hours=None, absent=False):
+        batch["user_id"].append(row.id)
+        batch["name"].append(row.name)
+        batch["email"].append(row.email)
+        batch["date"].append(day)
+        batch["punch_in"].append(punch_in)
+        batch["punch_out"].append(punch_out)
+        batch["duration_hours"].append(duration)
+        batch["total_hours"].append(total_hours)
+        batch["absent"].append(absent)
+
+    def add_absent(row, first: date, last: date):
+        day = first
+        while day <= last:
+            add(row, day, total_hours=0.0, absent=True)
+            day += timedelta(days=1)
+
+    previous = None
+    next_day = start_date
+    for row in query:
+        if previous is not None and row.id != previous.id:
             if export_all:
-                export_data.append({
-                    "Date": selected_date.strftime('%Y-%m-%d'),
-                    "Name": user_obj.name,
-                    "Email": user_obj.email,
-                    "Punch In": "Absent",
-                    "Punch Out": "Absent",
-                    "Duration (hours)": 0,
-                    "Total Hours": 0,
-                    "is_first_entry": True
-                })
-
-    if not export_data:
+                add_absent(previous, next_day, end_date)
+            next_day = start_date
+        previous = row
+
+        if row.date is not None:
+            if export_all and row.date > next_day:
+                add_absent(row, next_day, row.date - timedelta(days=1))
+            next_day = row.date + timedelta(days=1)
+            add(row, row.date, row.punch_in, row.punch_out, row.duration, row.total_duration)
+
+        if len(batch["user_id"]) >= batch_size:
+            yield batch
+            batch = {column: [] for column in EXPORT_COLUMNS}
+
+    if previous is not None and export_all:
+        add_absent(previous, next_day, end_date)
+    if batch["user_id"]:
+        yield batch
+
+
+def stream_attendance_csv(user_id: int, start_date: date, end_date: date, export_all=False,
+                          display_tz: str = DISPLAY_TIMEZONE):
+    """CSV chunks for a StreamingResponse; owns its DB session for the lifetime of the stream."""
+    db = SessionLocal()
+    try:
+        yield from stream_csv(iter_attendance_export_rows(db, user_id, start_date, end_date, export_all,
+                                                          display_tz=display_tz))
+    finally:
+        db.close()
+
+
+def _export_data_version(db: Session, user_id: int, start_date: date, end_date: date, export_all=False):
+    """
+    Changes whenever a session in the range or a user in the export is added, updated or removed:
+    the latest updated_at and the row count of each, read as aggregates instead of the rows.
+    """
+    sessions = db.query(func.max(AttendanceSession.updated_at), func.count(AttendanceSession.id)).filter(
+        AttendanceSession.date >= start_date,
+        AttendanceSession.date <= end_date
+    )
+    users = db.query(func.max(User.updated_at), func.count(User.id))
+    if not export_all:
+        sessions = sessions.filter(AttendanceSession.user_id == user_id)
+        users = users.filter(User.id == user_id)
+    return tuple(sessions.one()) + tuple(users.one())
+
+
+def _export_row_count(db: Session, user_id: int, start_date: date, end_date: date, export_all=False):
+    """
+    Rows an export of [start_date, end_date] holds, counted in SQL: one per session plus,
+    with export_all, one per day each user has no session. Reported for cache hits.
+    """
+    sessions = db.query(AttendanceSession.user_id, AttendanceSession.date).filter(
+        AttendanceSession.date >= start_date,
+        AttendanceSession.date <= end_date
+    )
+    if not export_all:
+        return sessions.filter(AttendanceSession.user_id == user_id).count()
+
+    days_with_sessions = sessions.distinct().count()
+    days = (end_date - start_date).days + 1
+    return sessions.count() + db.query(User).count() * days - days_with_sessions
+
+
+def _render_columnar_export(db: Session, user_id: int, export_format: str, start_date: date, end_date: date,
+                            export_all: bool, filename, on_progress):
+    rows = 0
+
+    def batches():
+        nonlocal rows
+        for batch in iter_attendance_export_columns(db, user_id, start_date, end_date, export_all):
+            rows += len(batch["user_id"])
+            if on_progress:
+                on_progress(rows)
+            yield batch
+
+    get_exporter(export_format)(batches(), filename)
+
+
+def _render_row_export(db: Session, user_id: int, export_format: str, start_date: date, end_date: date,
+                       export_all: bool, filename, on_progress, display_tz: str):
+    rows = iter_attendance_export_rows(db, user_id, start_date, end_date, export_all, display_tz=display_tz)
+    first = next(rows, None)
+    if first is None:
         raise HTTPException(status_code=404, detail="No attendance records found for selected date.")
+    written = 0
+
+    def counted():
+        # Rows go straight from the cursor to the writer
+        nonlocal written
+        for row in chain([first], rows):
+            written += 1
+            if on_progress and written % EXPORT_PROGRESS_EVERY == 0:
+                on_progress(written)
+            yield row
+
+    get_exporter(export_format)(counted(), filename)
+    if on_progress:
+        on_progress(written)
+
+
+def render_attendance_export(db: Session, user_id: int, export_format: str, start_date: date, end_date: date,
+                             export_all=False, filename_prefix: str = "attendance", on_progress=None,
+                             display_tz: str = DISPLAY_TIMEZONE):
+    """
+    Build the export file and return its name in EXPORT_DIR; on_progress(rows) is called as rows are prepared.
+
+    Identical requests over unchanged data get the file already rendered (app.utils.export_cache),
+    and on_progress gets its row count.
+    """
+    columnar = export_format in COLUMNAR_FORMATS
+    filename = cached_export_path(
+        filename_prefix, export_format,
+        export_format, "all" if export_all else user_id, start_date, end_date,
+        None if columnar else display_tz,  # Typed exports store UTC timestamps
+        _export_data_version(db, user_id, start_date, end_date, export_all)
+    )
+    if lookup_export(filename):
+        if on_progress:
+            on_progress(_export_row_count(db, user_id, start_date, end_date, export_all))
+        return filename.name
+
+    with publishing(filename) as temp:
+        if columnar:
+            _render_columnar_export(db, user_id, export_format, start_date, end_date, export_all, temp, on_progress)
+        else:
+            _render_row_export(db, user_id, export_format, start_date, end_date, export_all, temp, on_progress,
+                               display_tz)
 
-    filename = get_export_filename("attendance", export_format)
+    return filename.name
 
-    if export_format == "csv":
-        export_to_csv(export_data, filename)
-    elif export_format == "excel":
-        export_to_excel(export_data, filename)
-    else:
-        export_to_pdf(export_data, filename)
 
-    return f"/{filename}"
\ No newline at end of file
+def get_attendance_export(db: Session, user: User, export_format: str, start_date: date, end_date: Optional[date] = None,
+                          export_all=False, display_tz: str = DISPLAY_TIMEZONE):
+    check_export_format(export_format)
+    return render_attendance_export(db, user.id, export_format, start_date, end_date or start_date, export_all,
+                                    display_tz=display_tz)
@@ -0,0 +1,160 @@
+"""
+Maintenance of the daily_attendance_summary table.
+
+Every write path that touches attendance_sessions calls refresh_daily_summaries for the
+(user, date) keys it changed, inside its own transaction, so a key is re-aggregated from
+its handful of sessions. rebuild_daily_summary backfills history in date windows and
+drops summary rows whose sessions no longer exist; app.cli.rebuild_attendance_summary runs
+it one committed window at a time.
+"""
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import select, func, case, delete, exists, and_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.attendance_session import AttendanceSession
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+
+SUMMARY_COLUMNS = ["first_in", "last_out", "session_count", "worked_hours", "has_open_session", "updated_at"]
+UPSERT_BATCH_SIZE = 1000
+
+
+def summary_aggregate_query():
+    """Aggregate sessions per (user_id, date); callers add their own WHERE clause."""
+    return select(
+        AttendanceSession.user_id,
+        AttendanceSession.date,
+        func.min(AttendanceSession.punch_in).label("first_in"),
+        func.max(AttendanceSession.punch_out).label("last_out"),
+        func.count(AttendanceSession.id).label("session_count"),
+        func.coalesce(func.sum(AttendanceSession.duration), 0).label("worked_hours"),
+        func.max(case((AttendanceSession.punch_out == None, 1), else_=0)).label("has_open_session"),
+    ).group_by(AttendanceSession.user_id, AttendanceSession.date)
+
+
+def summary_upsert_statement(dialect: str):
+    """INSERT ... ON DUPLICATE KEY / ON CONFLICT DO UPDATE for summary rows."""
+    table = DailyAttendanceSummary.__table__
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in SUMMARY_COLUMNS})
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={column: stmt.excluded[column] for column in SUMMARY_COLUMNS}
+    )
+
+
+def _summary_rows(aggregates):
+    now = datetime.utcnow()
+    return [
+        {
+            "user_id": row.user_id,
+            "date": row.date,
+            "first_in": row.first_in,
+            "last_out": row.last_out,
+            "session_count": row.session_count,
+            "worked_hours": round(row.worked_hours or 0, 2),
+            "has_open_session": bool(row.has_open_session),
+            "updated_at": now,
+        }
+        for row in aggregates
+    ]
+
+
+async def refresh_daily_summaries(db: AsyncSession, keys: Iterable[Tuple[int, date]]):
+    """Re-aggregate the given (user_id, date) keys. Does not commit."""
+    keys = set(keys)
+    if not keys:
+        return
+    await db.flush()
+
+    user_ids = {user_id for user_id, _ in keys}
+    days = {day for _, day in keys}
+    aggregates = await db.execute(summary_aggregate_query().where(
+        AttendanceSession.user_id.in_(user_ids),
+        AttendanceSession.date.in_(days)
+    ))
+    rows = [row for row in _summary_rows(aggregates) if (row["user_id"], row["date"]) in keys]
+    if rows:
+        await db.execute(summary_upsert_statement(db.get_bind().dialect.name), rows)
+
+    # Keys whose sessions are all gone lose their summary row
+    emptied = keys - {(row["user_id"], row["date"]) for row in rows}
+    if emptied:
+        summary = DailyAttendanceSummary.__table__
+        await db.execute(delete(summary).where(
+            tuple_(summary.c.user_id, summary.c.date).in_(list(emptied))
+        ))
+
+
+def _delete_orphan_summaries(conn, start_date: date, end_date: date):
+    """Delete summary rows in [start_date, end_date] that no session backs any more."""
+    summary = DailyAttendanceSummary.__table__
+    return conn.execute(delete(summary).where(
+        summary.c.date >= start_date,
+        summary.c.date <= end_date,
+        ~exists().where(and_(
+            AttendanceSession.user_id == summary.c.user_id,
+            AttendanceSession.date == summary.c.date
+        ))
+    )).rowcount
+
+
+def summary_date_range(conn) -> Optional[Tuple[date, date]]:
+    """
+    First and last date of all history on a sync Connection, counting summary rows too so
+    days whose sessions are all gone get cleaned up. None when both tables are empty.
+    """
+    bounds = [
+        conn.execute(select(func.min(AttendanceSession.date), func.max(AttendanceSession.date))).one(),
+        conn.execute(select(func.min(DailyAttendanceSummary.date), func.max(DailyAttendanceSummary.date))).one(),
+    ]
+    firsts = [first for first, _ in bounds if first is not None]
+    lasts = [last for _, last in bounds if last is not None]
+    if not firsts:
+        return None
+    return min(firsts), max(lasts)
+
+
+def summary_windows(start_date: date, end_date: date, window_days: int = 31):
+    """Split [start_date, end_date] into consecutive (start, end) windows of window_days."""
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=window_days - 1), end_date)
+        yield window_start, window_end
+        window_start = window_end + timedelta(days=1)
+
+
+def rebuild_daily_summary(conn, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                          window_days: int = 31):
+    """
+    Recompute summary rows from attendance_sessions for [start_date, end_date]
+    (default: all history) on a sync Connection, deleting rows left without sessions.
+    Returns the number of rows written.
+    """
+    if start_date is None or end_date is None:
+        history = summary_date_range(conn)
+        if history is None:
+            return 0
+        start_date = start_date or history[0]
+        end_date = end_date or history[1]
+
+    upsert = summary_upsert_statement(conn.dialect.name)
+    written = 0
+    for window_start, window_end in summary_windows(start_date, end_date, window_days):
+        _delete_orphan_summaries(conn, window_start, window_end)
+        aggregates = conn.execute(summary_aggregate_query().where(
+            AttendanceSession.date >= window_start,
+            AttendanceSession.date <= window_end
+        ))
+        rows = _summary_rows(aggregates)
+        for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+            conn.execute(upsert, rows[offset:offset + UPSERT_BATCH_SIZE])
+        written += len(rows)
+    return written
@@ -1,52 +1,53 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
-from app.utils.hashing import verify_password
+from app.services.password_service import verify_password_async
 from app.utils.jwt_token import create_access_token
-from app.models.attendance_session import AttendanceSession
-from datetime import datetime, date
+from app.utils.token_cache import invalidate_user_tokens
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+from datetime import datetime
 from app.schemas.auth_schema import TodayAttendanceSchema
+from app.utils.timezones import business_date
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+    if not user:
         return None
+    valid, new_hash = await verify_password_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # Stored with outdated bcrypt settings; persisted with the new access token
+        user.hashed_password = new_hash
     return user
 
-def generate_and_return_token(user: User, db: Session):
+async def generate_and_return_token(user: User, db: AsyncSession):
     token_data = {"sub": str(user.id), "role": user.role.value}
     token = create_access_token(token_data)
 
     user.access_token = token  # store token in DB
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    # The previous token is no longer valid
+    invalidate_user_tokens(user.id)
 
     return {"access_token": token, "token_type": "bearer"}
 
 def get_today_attendance(db: Session, user_id: int) -> TodayAttendanceSchema:
-    today = date.today()
+    today = business_date(datetime.utcnow())
 
-    sessions = db.query(AttendanceSession).filter(
-        AttendanceSession.user_id == user_id,
-        AttendanceSession.date == today
-    ).order_by(AttendanceSession.punch_in.asc()).all()
+    summary = db.get(DailyAttendanceSummary, (user_id, today))
 
-    if not sessions:
+    if not summary:
         return TodayAttendanceSchema(
             first_punch_in=None,
             last_punch_out=None,
             next_action="punch_in"
         )
 
-    first_punch_in = sessions[0].punch_in
-    last_punch_out = None
-
-    for session in reversed(sessions):
-        if session.punch_out:
-            last_punch_out = session.punch_out
-            break
-
-    last_session = sessions[-1]
-    next_action = "punch_in" if last_session.punch_out else "punch_out"
+    first_punch_in = summary.first_in
+    last_punch_out = summary.last_out
+    next_action = "punch_out" if summary.has_open_session else "punch_in"
 
     return TodayAttendanceSchema(
         first_punch_in=first_punch_in,
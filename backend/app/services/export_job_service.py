@@ -0,0 +1,191 @@
+"""
+Background export jobs.
+
+Excel/PDF rendering is CPU bound, so jobs run in a process pool instead of the request
+thread. Job state lives in this worker process: poll the same API instance that created
+the job. Identical in-flight requests (format, date range and scope) share one job.
+"""
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+
+from fastapi import HTTPException
+
+from app.config.settings import DISPLAY_TIMEZONE, EXPORT_POOL_SIZE, EXPORT_QUEUE_DEPTH, EXPORT_JOB_RETENTION_SECONDS
+from app.utils.export_cache import lease_export
+from app.utils.file_exporter import EXPORT_DIR
+from app.utils.signed_downloads import sign_download
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_jobs = {}
+_active_jobs = {}  # coalescing key -> job_id for queued/running jobs
+_lock = threading.Lock()
+_executor = None
+_manager = None
+_progress = None  # job_id -> rows written, shared with the pool processes
+
+
+def _get_executor():
+    global _executor, _manager, _progress
+    if _executor is None:
+        # spawn: children must not inherit the parent's DB connections or threads
+        context = multiprocessing.get_context("spawn")
+        _manager = context.Manager()
+        _progress = _manager.dict()
+        _executor = ProcessPoolExecutor(max_workers=EXPORT_POOL_SIZE, mp_context=context)
+    return _executor
+
+
+def _reset_executor():
+    """Drop a pool that can no longer take work (a worker died); the next job starts a fresh one."""
+    global _executor, _manager, _progress
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _manager.shutdown()
+        _executor = _manager = _progress = None
+
+
+def _submit(*args):
+    """Submit to the pool, replacing it once if it is broken. Returns (future, progress dict)."""
+    for _ in range(2):
+        executor = _get_executor()
+        try:
+            return executor.submit(_render_in_worker, *args, _progress), _progress
+        except BrokenProcessPool:
+            _reset_executor()
+    raise HTTPException(status_code=503, detail="Export workers are unavailable. Please retry shortly.",
+                        headers={"Retry-After": "30"})
+
+
+def _render_in_worker(job_id: str, export_format: str, user_id: int, start_date: date, end_date: date,
+                      export_all: bool, display_tz: str, progress):
+    """Runs in a pool process with its own engine and session."""
+    from app.core.database import SessionLocal
+    from app.services.attendance_service import render_attendance_export
+
+    def on_progress(rows):
+        progress[job_id] = rows
+
+    on_progress(0)
+    db = SessionLocal()
+    try:
+        return render_attendance_export(
+            db, user_id, export_format, start_date, end_date, export_all,
+            on_progress=on_progress, display_tz=display_tz
+        )
+    except HTTPException as e:
+        # HTTPException does not survive unpickling in the parent, which would break the whole pool
+        raise RuntimeError(e.detail) from None
+    finally:
+        db.close()
+
+
+def _on_done(job_id: str, key: tuple, progress, future):
+    with _lock:
+        job = _jobs[job_id]
+        _active_jobs.pop(key, None)
+        job["finished_at"] = datetime.utcnow()
+        try:
+            job["rows_written"] = progress.get(job_id, job["rows_written"])
+            progress.pop(job_id, None)
+        except (OSError, EOFError):
+            pass  # The pool (and its manager) was replaced after this job's worker died
+
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled():
+            job["status"] = FAILED
+            job["error"] = "Export job was cancelled."
+        elif error is None:
+            job["status"] = COMPLETED
+            job["file_name"] = future.result()
+        else:
+            job["status"] = FAILED
+            job["error"] = str(error)
+
+
+def _prune_finished_jobs():
+    cutoff = time.time() - EXPORT_JOB_RETENTION_SECONDS
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if job["finished_at"] and job["finished_at"].timestamp() < cutoff]:
+        del _jobs[job_id]
+
+
+def _public_view(job: dict, user_id: int, access_token: str):
+    """The job as the API returns it, with a download link signed for the user's session once the file is ready."""
+    view = {key: value for key, value in job.items() if key not in ("requested_by", "file_name")}
+    if job["file_name"]:
+        lease_export(EXPORT_DIR / job["file_name"])  # Keep the file for as long as the new link is valid
+        view["file_url"] = sign_download(job["file_name"], user_id, access_token)
+    return view
+
+
+def create_export_job(user_id: int, access_token: str, export_format: str, start_date: date, end_date: date,
+                      export_all=False, display_tz: str = DISPLAY_TIMEZONE):
+    """Queue an export (or join an identical in-flight one) and return its job record."""
+    key = (export_format, start_date, end_date, export_all, display_tz, None if export_all else user_id)
+
+    with _lock:
+        _prune_finished_jobs()
+
+        job_id = _active_jobs.get(key)
+        if job_id:
+            _jobs[job_id]["requested_by"].add(user_id)
+            return _public_view(_jobs[job_id], user_id, access_token)
+
+        if len(_active_jobs) >= EXPORT_QUEUE_DEPTH:
+            raise HTTPException(status_code=503, detail="Export queue is full. Please retry shortly.",
+                                headers={"Retry-After": "30"})
+
+        job_id = uuid.uuid4().hex
+        future, progress = _submit(job_id, export_format, user_id, start_date, end_date, export_all, display_tz)
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "format": export_format,
+            "scope": "all" if export_all else "me",
+            "start_date": start_date,
+            "end_date": end_date,
+            "timezone": display_tz,
+            "rows_written": 0,
+            "file_url": None,
+            "file_name": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "finished_at": None,
+            "requested_by": {user_id},
+        }
+        # Registered only once the pool accepted the job, so a failed submit leaves no stuck entry
+        _jobs[job_id] = job
+        _active_jobs[key] = job_id
+        view = _public_view(job, user_id, access_token)
+
+    # Outside the lock: a future that is already done runs the callback inline, and _on_done takes the lock
+    future.add_done_callback(lambda f: _on_done(job_id, key, progress, f))
+    return view
+
+
+def get_export_job(job_id: str, user_id: int, access_token: str):
+    with _lock:
+        job = _jobs.get(job_id)
+        if not job or user_id not in job["requested_by"]:
+            raise HTTPException(status_code=404, detail="Export job not found.")
+
+        if _progress is None:
+            return _public_view(job, user_id, access_token)
+        if job["status"] == QUEUED and job_id in _progress:
+            job["status"] = RUNNING
+        if job["status"] == RUNNING:
+            job["rows_written"] = _progress.get(job_id, job["rows_written"])
+        return _public_view(job, user_id, access_token)
+
+
+def shutdown_export_jobs():
+    _reset_executor()
@@ -0,0 +1,50 @@
+"""
+Idempotency-Key support for the punch endpoints.
+
+A successful write stores its response in the same transaction as the write, so a retry
+with the same key either sees the stored response (and replays it) or loses the race on
+the primary key and replays the winner's response. Nothing is applied twice.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import IDEMPOTENCY_KEY_TTL_HOURS
+from app.models.idempotency_key import IdempotencyKey
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+async def get_replay(db: AsyncSession, user_id: int, key: Optional[str], endpoint: str):
+    """JSONResponse replaying the stored response for this key, or None if the key is new."""
+    if not key:
+        return None
+    cutoff = datetime.utcnow() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+    stored = (await db.execute(select(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at >= cutoff
+    ))).scalar_one_or_none()
+    if stored is None:
+        return None
+    if stored.endpoint != endpoint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request.")
+    return JSONResponse(content=json.loads(stored.response), headers={REPLAY_HEADER: "true"})
+
+
+async def store_response(db: AsyncSession, user_id: int, key: Optional[str], endpoint: str, response):
+    """Record the response for this key in the current transaction. Flushes; does not commit."""
+    if not key:
+        return
+    # Expired keys of this user may be reused
+    await db.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.created_at < datetime.utcnow() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+    ))
+    db.add(IdempotencyKey(user_id=user_id, key=key, endpoint=endpoint,
+                          response=json.dumps(jsonable_encoder(response))))
+    await db.flush()
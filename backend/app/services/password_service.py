@@ -0,0 +1,93 @@
+"""
+Login password verification off the event loop.
+
+bcrypt burns a few hundred milliseconds of CPU per check, so verifications run in a
+small dedicated process pool and never compete with request handling for the GIL.
+Admission is bounded: once PASSWORD_QUEUE_DEPTH checks are queued or running, further
+logins are turned away with 503 and Retry-After instead of piling up behind them.
+A pool broken by a dying worker is replaced, and the check retried once on the new one.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+from app.config.settings import PASSWORD_POOL_SIZE, PASSWORD_QUEUE_DEPTH
+from app.utils.hashing import verify_and_update_password
+
+RETRY_AFTER_SECONDS = 2
+
+_executor = None
+_in_flight = 0
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None and PASSWORD_POOL_SIZE > 0:
+            # spawn: children must not inherit the parent's DB connections or threads
+            context = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_POOL_SIZE, mp_context=context)
+        return _executor
+
+
+def _reset_executor(broken):
+    """Drop a pool that can no longer take work (a worker died); the next check starts a fresh one."""
+    global _executor
+    with _lock:
+        if _executor is not broken:
+            return  # Another request already replaced it
+        _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _admit():
+    global _in_flight
+    with _lock:
+        if _in_flight >= PASSWORD_QUEUE_DEPTH:
+            raise HTTPException(status_code=503, detail="Too many logins in progress. Please retry shortly.",
+                                headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+        _in_flight += 1
+
+
+def _release():
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    """(valid, new_hash) as from verify_and_update_password, computed in the password pool."""
+    _admit()
+    try:
+        for _ in range(2):
+            # None (PASSWORD_POOL_SIZE=0) runs the check in the event loop's default thread pool
+            executor = _get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, verify_and_update_password, plain_password, hashed_password
+                )
+            except BrokenProcessPool:
+                _reset_executor(executor)
+        raise HTTPException(status_code=503, detail="Password workers are unavailable. Please retry shortly.",
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    finally:
+        _release()
+
+
+def password_pool_stats():
+    with _lock:
+        return {
+            "pool_size": PASSWORD_POOL_SIZE,
+            "queue_depth": PASSWORD_QUEUE_DEPTH,
+            "in_flight": _in_flight,
+        }
+
+
+def shutdown_password_pool():
+    if _executor is not None:
+        _reset_executor(_executor)
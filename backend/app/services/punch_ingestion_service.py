@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from sqlalchemy import select, insert, update, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.attendance_session import AttendanceSession
+from app.models.device_punch_event import DevicePunchEvent
+from app.models.user import User
+from app.services.attendance_summary_service import refresh_daily_summaries
+from app.utils.attendance_view_cache import invalidate_daily_views
+from app.core.live_feed import publish_attendance_events
+from app.utils.timezones import business_date
+
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+DUPLICATE = "duplicate"
+
+
+def _to_utc_naive(timestamp: datetime):
+    # Sessions are stored as naive UTC, like datetime.utcnow() in punch_in
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def ingest_punch_events(events, db: AsyncSession):
+    """
+    Pair a batch of device punch events into attendance sessions in one transaction.
+
+    Events are applied per user in timestamp order with the same rules as the punch
+    endpoints: an "in" opens a session for that business day unless the user has one open,
+    an "out" closes the user's open session, whichever day it started. Event ids are unique per device. Events
+    accepted by an earlier upload are reported as duplicates and not applied again. Events
+    an earlier upload rejected are evaluated again, since devices may upload out of order
+    (a punch-out before its punch-in).
+    """
+    results = {}
+    event_keys = [(event.device_id, event.event_id) for event in events]
+
+    # Idempotency: events applied by earlier uploads; rejected ones get another try
+    previous = await db.execute(
+        select(DevicePunchEvent.id, DevicePunchEvent.device_id, DevicePunchEvent.event_id, DevicePunchEvent.status,
+               DevicePunchEvent.reason)
+        .where(tuple_(DevicePunchEvent.device_id, DevicePunchEvent.event_id).in_(set(event_keys)))
+    )
+    retried = {}  # (device_id, event_id) -> device_punch_events.id of the earlier rejection
+    for row_id, device_id, event_id, status, reason in previous:
+        if status == ACCEPTED:
+            results[device_id, event_id] = {"event_id": event_id, "device_id": device_id, "status": DUPLICATE,
+                                            "original_status": status, "reason": reason}
+        else:
+            retried[device_id, event_id] = row_id
+
+    pending = []
+    for event, key in zip(events, event_keys):
+        if key in results:
+            continue
+        # Repeated ids within the batch: the first occurrence wins
+        results[key] = None
+        timestamp = _to_utc_naive(event.timestamp)
+        pending.append((event, timestamp, business_date(timestamp)))
+
+    user_ids = {event.user_id for event, _, _ in pending}
+
+    known_users = set((await db.execute(select(User.id).where(User.id.in_(user_ids)))).scalars()) if user_ids else set()
+
+    # Sessions already open for the users in this batch (at most one each), locked until the batch commits
+    open_sessions = {}
+    if pending:
+        rows = await db.execute(
+            select(AttendanceSession.id, AttendanceSession.user_id, AttendanceSession.date, AttendanceSession.punch_in)
+            .where(AttendanceSession.user_id.in_(user_ids), AttendanceSession.punch_out == None)
+            .with_for_update()
+        )
+        for row in rows:
+            open_sessions[row.user_id] = {"id": row.id, "date": row.date, "punch_in": row.punch_in}
+
+    new_sessions = []
+    closed_sessions = []
+    event_rows = []
+    now = datetime.utcnow()
+
+    for event, timestamp, day in sorted(pending, key=lambda item: (item[0].user_id, item[1])):
+        current = open_sessions.get(event.user_id)
+        reason = None
+
+        if event.user_id not in known_users:
+            reason = "Unknown user."
+        elif event.direction == "in":
+            if current:
+                reason = "User has already punched in and not punched out yet."
+            else:
+                current = {"user_id": event.user_id, "date": day, "punch_in": timestamp,
+                           "punch_out": None, "duration": None}
+                new_sessions.append(current)
+                open_sessions[event.user_id] = current
+        else:
+            if not current:
+                reason = "No active punch-in session found."
+            elif timestamp < current["punch_in"]:
+                reason = "Punch-out is earlier than the open punch-in."
+            else:
+                duration = round((timestamp - current["punch_in"]).total_seconds() / 3600, 2)
+                if "id" in current:
+                    closed_sessions.append({"id": current["id"], "punch_out": timestamp,
+                                            "duration": duration, "updated_at": now})
+                else:
+                    current["punch_out"] = timestamp
+                    current["duration"] = duration
+                # A punch-out after midnight belongs to the day its session started
+                day = current["date"]
+                del open_sessions[event.user_id]
+
+        status = REJECTED if reason else ACCEPTED
+        results[event.device_id, event.event_id] = {"event_id": event.event_id, "device_id": event.device_id,
+                                                    "status": status, "reason": reason}
+        event_rows.append({
+            "event_id": event.event_id,
+            "device_id": event.device_id,
+            "user_id": event.user_id,
+            "timestamp": timestamp,
+            "direction": event.direction,
+            "date": day,
+            "status": status,
+            "reason": reason,
+        })
+
+    # Bulk INSERT of new sessions; everything below commits as one transaction
+    if new_sessions:
+        await db.execute(insert(AttendanceSession), new_sessions)
+    for closed in closed_sessions:
+        # Only while still open: SQLite has no row locks, so an app punch-out may have closed it meanwhile
+        outcome = await db.execute(
+            update(AttendanceSession)
+            .where(AttendanceSession.id == closed["id"], AttendanceSession.punch_out == None)
+            .values(punch_out=closed["punch_out"], duration=closed["duration"], updated_at=closed["updated_at"])
+        )
+        if outcome.rowcount == 0:
+            raise RuntimeError("A session in this upload was closed concurrently; retry the upload.")
+    changed = {(row["user_id"], row["date"]) for row in event_rows if row["status"] == ACCEPTED}
+    await refresh_daily_summaries(db, changed)
+    stored = [{column: value for column, value in row.items() if column != "date"} for row in event_rows]
+    # Unknown users cannot be stored (foreign key); they are reported but not recorded
+    recorded = [row for row in stored
+                if row["user_id"] in known_users and (row["device_id"], row["event_id"]) not in retried]
+    if recorded:
+        await db.execute(insert(DevicePunchEvent), recorded)
+    for row in stored:
+        row_id = retried.get((row["device_id"], row["event_id"]))
+        if row_id is None:
+            continue
+        # Only while still rejected: a concurrent upload may have applied the same event meanwhile
+        outcome = await db.execute(
+            update(DevicePunchEvent)
+            .where(DevicePunchEvent.id == row_id, DevicePunchEvent.status == REJECTED)
+            .values(status=row["status"], reason=row["reason"], timestamp=row["timestamp"])
+        )
+        if outcome.rowcount == 0 and row["status"] == ACCEPTED:
+            raise RuntimeError("Events in this upload were applied by a concurrent upload; retry the upload.")
+    await db.commit()
+    invalidate_daily_views(day for _, day in changed)
+    await publish_attendance_events(
+        {"type": "punch_in" if row["direction"] == "in" else "punch_out", "user_id": row["user_id"],
+         "date": row["date"], "timestamp": row["timestamp"], "source": "device",
+         "device_id": row["device_id"]}
+        for row in event_rows if row["status"] == ACCEPTED
+    )
+
+    ordered = [results[key] for key in dict.fromkeys(event_keys)]
+    return {
+        "accepted": sum(1 for result in ordered if result["status"] == ACCEPTED),
+        "rejected": sum(1 for result in ordered if result["status"] == REJECTED),
+        "duplicates": sum(1 for result in ordered if result["status"] == DUPLICATE),
+        "results": ordered,
+    }
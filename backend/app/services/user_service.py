@@ -0,0 +1,171 @@
+"""
+User directory listing: keyset (cursor) pagination and name/email search.
+
+Pages are ordered by an indexed column with id as tie-breaker, and the next page starts
+after the last row of the previous one, so every page costs the same index range scan.
+Search uses the FULLTEXT ngram index on MySQL and the user_search_grams table elsewhere.
+"""
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import select, func, and_, or_, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.settings import USER_COUNT_CACHE_TTL_SECONDS
+from app.models.user import User
+from app.models.user_search_gram import SEARCH_GRAM_SIZE, UserSearchGram, search_grams
+
+# sort_by values backed by an index that ends in (or is) the primary key
+SORT_COLUMNS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+}
+SORT_ORDERS = ("asc", "desc")
+# ngram_token_size defaults to 2; shorter terms cannot use the FULLTEXT index
+MYSQL_MIN_FULLTEXT_TERM = 2
+COUNT_CACHE_MAX_SIZE = 1024
+REBUILD_BATCH_SIZE = 1000
+
+_count_cache = OrderedDict()  # search term -> (expires_at, total)
+_count_lock = threading.Lock()
+
+
+def encode_cursor(sort_by: str, sort_order: str, value, user_id: int) -> str:
+    payload = json.dumps([sort_by, sort_order, value, user_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str):
+    """Return (value, id) of the row the page starts after."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_order, value, user_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (cursor_sort_by, cursor_order) != (sort_by, sort_order) or not isinstance(user_id, int):
+        raise HTTPException(status_code=400, detail="Cursor does not match sort_by/sort_order")
+    return value, user_id
+
+
+def _search_filter(dialect: str, term: str):
+    term = term.strip()
+    substring = or_(User.name.icontains(term, autoescape=True), User.email.icontains(term, autoescape=True))
+
+    if dialect == "mysql":
+        if len(term) < MYSQL_MIN_FULLTEXT_TERM:
+            return substring
+        from sqlalchemy.dialects.mysql import match
+        phrase = '"' + term.replace('"', " ") + '"'
+        return and_(match(User.name, User.email, against=phrase).in_boolean_mode(), substring)
+
+    lowered = term.lower()
+    if len(lowered) >= SEARCH_GRAM_SIZE:
+        grams = {lowered[start:start + SEARCH_GRAM_SIZE] for start in range(len(lowered) - SEARCH_GRAM_SIZE + 1)}
+        candidates = select(UserSearchGram.user_id).where(
+            UserSearchGram.gram.in_(grams)
+        ).group_by(UserSearchGram.user_id).having(func.count() == len(grams))
+    else:
+        # Short terms: range scan over grams that start with the term
+        candidates = select(UserSearchGram.user_id).where(
+            UserSearchGram.gram >= lowered,
+            UserSearchGram.gram < lowered + "\uffff"
+        ).distinct()
+    # The gram index narrows the candidates; the substring check removes false positives
+    return and_(User.id.in_(candidates), substring)
+
+
+def _cached_count(term: str):
+    with _count_lock:
+        entry = _count_cache.get(term)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+
+def _store_count(term: str, total: int):
+    with _count_lock:
+        _count_cache[term] = (time.monotonic() + USER_COUNT_CACHE_TTL_SECONDS, total)
+        _count_cache.move_to_end(term)
+        while len(_count_cache) > COUNT_CACHE_MAX_SIZE:
+            _count_cache.popitem(last=False)
+
+
+async def count_users(db: AsyncSession, search: Optional[str], search_filter=None):
+    """Total matching users, cached for USER_COUNT_CACHE_TTL_SECONDS per search term."""
+    key = (search or "").strip().lower()
+    total = _cached_count(key)
+    if total is None:
+        query = select(func.count(User.id))
+        if search_filter is not None:
+            query = query.where(search_filter)
+        total = await db.scalar(query)
+        _store_count(key, total)
+    return total
+
+
+async def list_users(db: AsyncSession, limit: int, cursor: Optional[str], search: Optional[str],
+                     sort_by: str, sort_order: str, include_total: bool = False):
+    """One page of users (id, name, email, role rows) plus the cursor of the next page (None on the last page)."""
+    sort_column = SORT_COLUMNS[sort_by]
+    descending = sort_order == "desc"
+
+    # Plain column rows: the response is serialized from these without ORM objects
+    query = select(User.id, User.name, User.email, User.role)
+    search_filter = None
+    if search and search.strip():
+        search_filter = _search_filter(db.get_bind().dialect.name, search)
+        query = query.where(search_filter)
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        if sort_column is User.id:
+            query = query.where(User.id < last_id if descending else User.id > last_id)
+        elif descending:
+            query = query.where(or_(sort_column < value, and_(sort_column == value, User.id < last_id)))
+        else:
+            query = query.where(or_(sort_column > value, and_(sort_column == value, User.id > last_id)))
+
+    if sort_column is User.id:
+        order = [User.id.desc() if descending else User.id.asc()]
+    else:
+        order = [sort_column.desc(), User.id.desc()] if descending else [sort_column.asc(), User.id.asc()]
+
+    # One extra row tells whether another page follows
+    users = (await db.execute(query.order_by(*order).limit(limit + 1))).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        last = users[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_column.key), last.id)
+
+    total = await count_users(db, search, search_filter) if include_total else None
+    return users, next_cursor, total
+
+
+def rebuild_user_search_grams(conn, batch_size: int = REBUILD_BATCH_SIZE):
+    """Rebuild user_search_grams from users on a sync Connection. Returns the number of users indexed."""
+    if conn.dialect.name == "mysql":
+        return 0
+    table = UserSearchGram.__table__
+    indexed = 0
+    last_id = 0
+    while True:
+        users = conn.execute(
+            select(User.id, User.name, User.email).where(User.id > last_id).order_by(User.id).limit(batch_size)
+        ).all()
+        if not users:
+            return indexed
+        ids = [user.id for user in users]
+        conn.execute(delete(table).where(table.c.user_id.in_(ids)))
+        conn.execute(insert(table), [
+            {"user_id": user.id, "gram": gram}
+            for user in users
+            for gram in search_grams(user.name, user.email)
+        ])
+        indexed += len(users)
+        last_id = ids[-1]
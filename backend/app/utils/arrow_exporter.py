@@ -0,0 +1,50 @@
+"""
+Parquet and Arrow IPC exports, imported by file_exporter.get_exporter on the first export
+in either format. Columns and types follow file_exporter.EXPORT_COLUMNS.
+"""
+import pyarrow as pa  # optional dependency, only needed for the parquet and arrow formats
+import pyarrow.parquet as pq
+from fastapi import HTTPException
+
+
+def _arrow_schema():
+    return pa.schema([
+        pa.field("user_id", pa.int64(), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("email", pa.string(), nullable=False),
+        pa.field("date", pa.date32(), nullable=False),
+        pa.field("punch_in", pa.timestamp("us", tz="UTC")),
+        pa.field("punch_out", pa.timestamp("us", tz="UTC")),
+        pa.field("duration_hours", pa.float64()),
+        pa.field("total_hours", pa.float64()),
+        pa.field("absent", pa.bool_(), nullable=False),
+    ])
+
+
+def _write_batches(batches, open_writer):
+    """Write {column: [values]} batches through the writer open_writer(schema) returns; 404 when there are none."""
+    schema = _arrow_schema()
+    writer = None
+    try:
+        for batch in batches:
+            if writer is None:
+                writer = open_writer(schema)
+            # Naive datetimes are stored as UTC, which is what the sessions hold
+            writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise HTTPException(status_code=404, detail="No data to export.")
+
+
+def export_batches_to_parquet(batches, filename):
+    """Each batch becomes one Parquet row group."""
+    _write_batches(batches, lambda schema: pq.ParquetWriter(filename, schema, compression="zstd"))
+    return filename
+
+
+def export_batches_to_arrow(batches, filename):
+    """Arrow IPC file format (Feather v2), one record batch per batch."""
+    _write_batches(batches, lambda schema: pa.ipc.new_file(filename, schema))
+    return filename
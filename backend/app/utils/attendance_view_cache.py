@@ -0,0 +1,197 @@
+"""
+Cache of the serialized admin daily view (GET /attendance/), keyed by date.
+
+Entries hold the response body as JSON bytes with its ETag and Last-Modified, so a hit
+is served without touching the database or re-encoding. Punch-in/out and device
+ingestion invalidate the dates they write to. Today's entry additionally expires after
+DAILY_VIEW_CACHE_TODAY_TTL_SECONDS to bound staleness from writes on other workers;
+with DAILY_VIEW_CACHE_URL every worker shares one Redis backend and sees invalidations
+immediately.
+
+Each date carries a generation number that invalidation bumps. A view computed while a
+punch commits is only stored if the generation it started from is still current. Users are
+not versioned here: a past day picks up a renamed or added user once its entry expires
+after DAILY_VIEW_CACHE_PAST_TTL_SECONDS.
+"""
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from app.config.settings import (
+    DAILY_VIEW_CACHE_ENABLED, DAILY_VIEW_CACHE_MAX_DATES, DAILY_VIEW_CACHE_PAST_TTL_SECONDS,
+    DAILY_VIEW_CACHE_TODAY_TTL_SECONDS, DAILY_VIEW_CACHE_URL
+)
+from app.utils.timezones import business_date
+
+# Redis generation counters of days no longer written to expire after this long
+GENERATION_TTL_SECONDS = 86400
+
+
+@dataclass(frozen=True)
+class CachedView:
+    body: bytes
+    etag: str
+    last_modified: float  # Unix time
+
+
+def make_view(body: bytes):
+    return CachedView(body=body, etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"', last_modified=time.time())
+
+
+class LocalViewCache:
+    """
+    Thread-safe in-process LRU with per-entry expiry.
+
+    Generations come from one increasing counter and are kept for the max_size most recently
+    invalidated dates. A date whose generation was dropped reports the highest dropped value,
+    so a view started before the drop still fails the check in set instead of passing it.
+    """
+
+    backend = "local"
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # date -> (expires_at or None, CachedView)
+        self._generations = OrderedDict()  # date -> generation, oldest invalidation first
+        self._dropped_generation = 0
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, day: date):
+        with self._lock:
+            entry = self._entries.get(day)
+            if entry is None:
+                return None
+            expires_at, view = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[day]
+                return None
+            self._entries.move_to_end(day)
+            return view
+
+    def _generation(self, day: date):
+        return self._generations.get(day, self._dropped_generation)
+
+    def generation(self, day: date):
+        with self._lock:
+            return self._generation(day)
+
+    def set(self, day: date, view: CachedView, ttl: int, generation: int):
+        with self._lock:
+            if self._generation(day) != generation:
+                return  # Invalidated while the view was being computed
+            self._entries[day] = (time.time() + ttl if ttl else None, view)
+            self._entries.move_to_end(day)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, day: date):
+        with self._lock:
+            self._entries.pop(day, None)
+            self._generations[day] = next(self._counter)
+            self._generations.move_to_end(day)
+            while len(self._generations) > self.max_size:
+                _, dropped = self._generations.popitem(last=False)
+                self._dropped_generation = max(self._dropped_generation, dropped)
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisViewCache:
+    """Shared backend so a punch on one worker invalidates the view on all of them."""
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when DAILY_VIEW_CACHE_URL is set
+
+        self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(day: date):
+        return f"attendance:daily:{day.isoformat()}"
+
+    @staticmethod
+    def _generation_key(day: date):
+        return f"attendance:daily:{day.isoformat()}:generation"
+
+    def get(self, day: date):
+        raw = self._redis.hgetall(self._key(day))
+        if not raw:
+            return None
+        return CachedView(body=raw[b"body"], etag=raw[b"etag"].decode(), last_modified=float(raw[b"last_modified"]))
+
+    def generation(self, day: date):
+        return int(self._redis.get(self._generation_key(day)) or 0)
+
+    def set(self, day: date, view: CachedView, ttl: int, generation: int):
+        if self.generation(day) != generation:
+            return
+        key = self._key(day)
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping={"body": view.body, "etag": view.etag, "last_modified": view.last_modified})
+        if ttl:
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def invalidate(self, day: date):
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(day))
+        pipe.incr(self._generation_key(day))
+        pipe.expire(self._generation_key(day), GENERATION_TTL_SECONDS)
+        pipe.execute()
+
+    def size(self):
+        return None
+
+
+def _build_cache():
+    if not DAILY_VIEW_CACHE_ENABLED:
+        return None
+    if DAILY_VIEW_CACHE_URL:
+        return RedisViewCache(DAILY_VIEW_CACHE_URL)
+    return LocalViewCache(DAILY_VIEW_CACHE_MAX_DATES)
+
+
+_cache = _build_cache()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def get_daily_view(day: date):
+    """(cached view or None, generation to pass to store_daily_view)."""
+    if _cache is None:
+        return None, 0
+    view = _cache.get(day)
+    _stats["hits" if view else "misses"] += 1
+    return view, (0 if view else _cache.generation(day))
+
+
+def store_daily_view(day: date, body: bytes, generation: int):
+    view = make_view(body)
+    if _cache is not None:
+        ttl = DAILY_VIEW_CACHE_TODAY_TTL_SECONDS if day >= business_date(datetime.utcnow()) else DAILY_VIEW_CACHE_PAST_TTL_SECONDS
+        _cache.set(day, view, ttl, generation)
+    return view
+
+
+def invalidate_daily_views(days):
+    if _cache is not None:
+        for day in set(days):
+            _cache.invalidate(day)
+            _stats["invalidations"] += 1
+
+
+def daily_view_cache_stats():
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": _cache is not None,
+        "backend": _cache.backend if _cache is not None else None,
+        "size": _cache.size() if _cache is not None else 0,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
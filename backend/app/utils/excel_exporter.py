@@ -0,0 +1,97 @@
+"""Excel (.xlsx) export, imported by file_exporter.get_exporter on the first Excel export."""
+from itertools import chain, islice
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+from fastapi import HTTPException
+
+from app.utils.file_exporter import CSV_HEADERS
+
+# Columns repeated for every session of a (user, date); merged across that user's extra sessions
+EXCEL_MERGED_COLUMNS = ["Date", "Name", "Email", "Total Hours"]
+EXCEL_MAX_COLUMN_WIDTH = 50
+# Column widths precede the rows in the file, so they are sized from the first rows only
+EXCEL_WIDTH_SAMPLE_ROWS = 1000
+
+
+def _add_excel_styles(workbook):
+    """Register the shared named styles once per workbook instead of styling every cell."""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    centered = Alignment(horizontal="center", vertical="center")
+
+    workbook.add_named_style(NamedStyle(
+        name="attendance_header",
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill("solid", fgColor="366092"),
+        alignment=centered,
+        border=border,
+    ))
+    workbook.add_named_style(NamedStyle(name="attendance_cell", alignment=centered, border=border))
+
+
+def _excel_column_widths(sample):
+    """Width per column fitting the header and the sampled values."""
+    return [
+        min(max([len(header)] + [len(str(row.get(header, ""))) for row in sample]) + 2, EXCEL_MAX_COLUMN_WIDTH)
+        for header in CSV_HEADERS
+    ]
+
+
+def _excel_merge_ranges(first_row: int, last_row: int):
+    """Ranges merging the per-day columns over an entry's rows (sheet rows, inclusive)."""
+    for name in EXCEL_MERGED_COLUMNS:
+        letter = get_column_letter(CSV_HEADERS.index(name) + 1)
+        yield f"{letter}{first_row}:{letter}{last_row}"
+
+
+def export_to_excel(data, filename):
+    """Write an iterable of export rows, streaming them to disk: only the merge ranges are kept in memory."""
+    rows = iter(data)
+    sample = list(islice(rows, EXCEL_WIDTH_SAMPLE_ROWS))
+    if not sample:
+        raise HTTPException(status_code=404, detail="No data to export.")
+
+    # Write-only mode streams rows to disk; widths are written before the rows, merges after them
+    workbook = Workbook(write_only=True)
+    _add_excel_styles(workbook)
+    worksheet = workbook.create_sheet("Attendance Report")
+
+    for column, width in enumerate(_excel_column_widths(sample), start=1):
+        worksheet.column_dimensions[get_column_letter(column)].width = width
+
+    def styled_cells(style):
+        cells = [WriteOnlyCell(worksheet) for _ in CSV_HEADERS]
+        for cell in cells:
+            cell.style = style
+        return cells
+
+    header = styled_cells("attendance_header")
+    for cell, value in zip(header, CSV_HEADERS):
+        cell.value = value
+    worksheet.append(header)
+
+    # Write-only rows are serialized on append, so one set of styled cells serves every row
+    row_cells = styled_cells("attendance_cell")
+    merges = []
+    entry_start = None
+    sheet_row = 1
+    for row in chain(sample, rows):
+        sheet_row += 1
+        if row.get("is_first_entry", True):
+            if entry_start is not None and sheet_row - 1 > entry_start:
+                merges.extend(_excel_merge_ranges(entry_start, sheet_row - 1))
+            entry_start = sheet_row
+        for cell, header in zip(row_cells, CSV_HEADERS):
+            cell.value = row.get(header)
+        worksheet.append(row_cells)
+    if entry_start is not None and sheet_row > entry_start:
+        merges.extend(_excel_merge_ranges(entry_start, sheet_row))
+
+    # Built in one go: MultiCellRange.add() checks containment against every existing range
+    worksheet.merged_cells = MultiCellRange({CellRange(cell_range) for cell_range in merges})
+    workbook.save(filename)
+    return filename
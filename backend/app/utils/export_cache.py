@@ -0,0 +1,182 @@
+"""
+Content-addressed cache of the export files in exports/.
+
+A file's name is a digest of everything that determines its bytes: format, scope, user,
+date range, display timezone and the data version (latest updated_at and row count of the
+sessions it covers and of its users). A repeat request finds the file already on disk and
+skips the query and rendering, while a punch inside the range or a renamed user changes
+the version and with it the name.
+Files are rendered under a temporary name and renamed into place, so readers never see a
+partial file and workers rendering the same export just race to the same name.
+
+Each hit (and each link handed out for a file) refreshes its access time; its mtime stays
+the render time, which downloads report as Last-Modified and build their ETag from. The
+sweeper deletes files unused for EXPORT_CACHE_TTL_SECONDS, then the least recently used ones
+until the directory fits EXPORT_CACHE_MAX_MB. Files used within EXPORT_CACHE_LEASE_SECONDS
+are never deleted, so a hit cannot turn into a missing file before its link expires.
+Counters are per process (jobs count in the pool process).
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.config.settings import (
+    EXPORT_CACHE_ENABLED, EXPORT_CACHE_LEASE_SECONDS, EXPORT_CACHE_MAX_MB, EXPORT_CACHE_SWEEP_SECONDS,
+    EXPORT_CACHE_TTL_SECONDS
+)
+from app.utils.file_exporter import EXPORT_DIR, EXPORT_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+TEMP_PREFIX = ".tmp-"
+MAX_BYTES = EXPORT_CACHE_MAX_MB * 1024 * 1024
+
+_stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "leased": 0}
+_sweeper = None
+
+
+def cached_export_path(prefix: str, export_format: str, *key) -> Path:
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+    return EXPORT_DIR / f"{prefix}_{digest}.{EXPORT_EXTENSIONS.get(export_format, export_format)}"
+
+
+def lease_export(path: Path) -> bool:
+    """Mark path as recently used so the sweeper keeps it for EXPORT_CACHE_LEASE_SECONDS. False if it is gone."""
+    try:
+        os.utime(path, (time.time(), os.stat(path).st_mtime))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def lookup_export(path: Path) -> bool:
+    """True when path is already rendered; leases it to the caller."""
+    if EXPORT_CACHE_ENABLED and lease_export(path):
+        _stats["hits"] += 1
+        return True
+    _stats["misses"] += 1
+    return False
+
+
+def find_export(name: str):
+    """The rendered file called `name` in EXPORT_DIR, or None (also for paths and temporary files)."""
+    if not name or Path(name).name != name or name.startswith("."):
+        return None
+    path = EXPORT_DIR / name
+    return path if path.is_file() else None
+
+
+@contextmanager
+def publishing(path: Path):
+    """Yields a temporary path to render into; it replaces `path` only if rendering succeeds."""
+    EXPORT_DIR.mkdir(exist_ok=True)
+    # Keep the extension last: writers such as openpyxl check it
+    temp = path.with_name(f"{TEMP_PREFIX}{uuid.uuid4().hex}-{path.name}")
+    try:
+        yield temp
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def _leased(atime: float, now: float) -> bool:
+    return now - atime < EXPORT_CACHE_LEASE_SECONDS
+
+
+def _remove(path: str, now: float):
+    try:
+        # Re-check right before deleting: a lookup may have leased the file since the scan
+        if _leased(os.stat(path).st_atime, now):
+            return False
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False  # Another worker's sweeper got there first
+
+
+def sweep_exports(now: float = None):
+    """
+    Delete expired files (and abandoned temporary ones), then evict LRU files over the size cap.
+    Files used within EXPORT_CACHE_LEASE_SECONDS are kept either way.
+    """
+    now = now or time.time()
+    files = []
+    leased_bytes = 0
+    try:
+        entries = list(os.scandir(EXPORT_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if not entry.is_file():
+            continue
+        if _leased(stat.st_atime, now):
+            _stats["leased"] += 1
+            leased_bytes += stat.st_size
+        elif now - stat.st_atime > EXPORT_CACHE_TTL_SECONDS:
+            _stats["expired"] += _remove(entry.path, now)
+        elif not entry.name.startswith(TEMP_PREFIX):  # Still being written
+            files.append((stat.st_atime, stat.st_size, entry.path))
+
+    # Leased files count towards the cap but are not evicted
+    total = leased_bytes + sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= MAX_BYTES:
+            break
+        if _remove(path, now):
+            _stats["evicted"] += 1
+            total -= size
+
+
+async def _sweep_periodically():
+    while True:
+        try:
+            await asyncio.to_thread(sweep_exports)
+        except Exception:
+            logger.exception("Export cache sweep failed")
+        await asyncio.sleep(EXPORT_CACHE_SWEEP_SECONDS)
+
+
+def start_export_sweeper():
+    global _sweeper
+    if _sweeper is None and EXPORT_CACHE_SWEEP_SECONDS > 0:
+        _sweeper = asyncio.create_task(_sweep_periodically())
+
+
+async def stop_export_sweeper():
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.cancel()
+        try:
+            await _sweeper
+        except asyncio.CancelledError:
+            pass
+        _sweeper = None
+
+
+def export_cache_stats():
+    try:
+        sizes = [entry.stat().st_size for entry in os.scandir(EXPORT_DIR)
+                 if entry.is_file() and not entry.name.startswith(TEMP_PREFIX)]
+    except FileNotFoundError:
+        sizes = []
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": EXPORT_CACHE_ENABLED,
+        "files": len(sizes),
+        "bytes": sum(sizes),
+        "max_bytes": MAX_BYTES,
+        "ttl_seconds": EXPORT_CACHE_TTL_SECONDS,
+        "lease_seconds": EXPORT_CACHE_LEASE_SECONDS,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
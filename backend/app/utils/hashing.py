@@ -1,9 +1,20 @@
 from passlib.context import CryptContext
+from app.config.settings import BCRYPT_ROUNDS, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_MIN_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_MAX_ROUNDS,
+)
 
 def hash_password(password: str):
     return pwd_context.hash(password)
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password, hashed_password):
+    """(valid, new_hash); new_hash is set when the stored hash uses outdated settings."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,51 @@
+"""
+JSON encoding for responses: orjson when it is installed, the standard library otherwise.
+
+FastJSONResponse is the app's default response class. A route that returns a plain dict
+still passes through FastAPI's jsonable_encoder before rendering, so hot paths return a
+response themselves: json_response() for dicts built from SQL rows, or
+typed_json_response() with a pydantic TypeAdapter over TypedDicts, which serializes in
+pydantic-core without instantiating any model.
+"""
+import json
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    # Types orjson does not know natively (datetimes, dates, enums and UUIDs it does)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content, status_code: int = 200, headers=None):
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def typed_json_response(adapter: TypeAdapter, content, status_code: int = 200, headers=None):
+    return Response(adapter.dump_json(content), status_code=status_code, headers=headers,
+                    media_type="application/json")
@@ -0,0 +1,87 @@
+"""PDF export, imported by file_exporter.get_exporter on the first PDF export."""
+from datetime import datetime
+from itertools import chain
+from fpdf import FPDF
+from fastapi import HTTPException
+
+
+def export_to_pdf(data, filename):
+    """Write an iterable of export rows; rows are drawn as they arrive rather than collected first."""
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail="No data to export.")
+
+    pdf = FPDF(orientation="L", unit="mm", format="A4")
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    
+    # Title
+    pdf.set_font("Arial", "B", 16)
+    pdf.set_text_color(54, 96, 146)  # Professional blue color
+    pdf.cell(0, 10, "Attendance Report", ln=True, align="C")
+    pdf.ln(5)
+    
+    # Date info
+    pdf.set_font("Arial", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    if first.get("Date"):
+        report_date = first["Date"]
+        pdf.cell(0, 6, f"Report Date: {report_date}", ln=True)
+        pdf.cell(0, 6, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+    pdf.ln(5)
+
+    # Table headers
+    headers = ["Date", "Name", "Email", "Punch In", "Punch Out", "Duration (hrs)", "Total Hours"]
+    page_width = pdf.w - 2 * pdf.l_margin
+    col_widths = [25, 35, 50, 25, 25, 25, 25]  # Adjusted widths
+    line_height = 8
+
+    # Header styling
+    pdf.set_font("Arial", "B", 9)
+    pdf.set_fill_color(54, 96, 146)  # Professional blue
+    pdf.set_text_color(255, 255, 255)  # White text
+
+    # Draw header row
+    y_start = pdf.get_y()
+    for i, header in enumerate(headers):
+        pdf.cell(col_widths[i], line_height, header, border=1, align="C", fill=True)
+    pdf.ln()
+
+    # Data rows
+    pdf.set_font("Arial", "", 8)
+    pdf.set_text_color(0, 0, 0)
+    
+    current_user = None
+    for i, row in enumerate(chain([first], rows)):
+        # Clean row data
+        clean_row = {k: v for k, v in row.items() if k != "is_first_entry"}
+        
+        # Alternate row colors for better readability
+        if row.get("is_first_entry", True):
+            if i % 2 == 0:
+                pdf.set_fill_color(245, 245, 245)  # Light gray
+            else:
+                pdf.set_fill_color(255, 255, 255)  # White
+            current_user = row.get("Name", "")
+        else:
+            # Use same color as previous row for merged appearance
+            pass
+        
+        # Draw cells
+        row_data = [
+            clean_row.get("Date", ""),
+            clean_row.get("Name", ""),
+            clean_row.get("Email", ""),
+            clean_row.get("Punch In", ""),
+            clean_row.get("Punch Out", ""),
+            str(clean_row.get("Duration (hours)", "")),
+            str(clean_row.get("Total Hours", ""))
+        ]
+        
+        for j, cell_data in enumerate(row_data):
+            pdf.cell(col_widths[j], line_height, str(cell_data), border=1, align="C", fill=True)
+        pdf.ln()
+
+    pdf.output(str(filename))
+    return filename
@@ -0,0 +1,45 @@
+"""
+Signed, expiring download links for export files.
+
+A link names the file, the user it was issued to and an expiry, plus an HMAC-SHA256 of
+all three and of the access token the user was logged in with, under DOWNLOAD_URL_SECRET.
+Changing any of them (another file, another user, a later expiry) invalidates the
+signature, and so does the session ending: logging out (or in again) replaces the
+user's stored access token, so links handed out before stop working. The token itself
+never appears in the URL. Expiries are rounded up to the next DOWNLOAD_URL_TTL_SECONDS
+boundary, so the same session asking for the same file within that window gets the same
+URL and browsers can reuse what they already downloaded.
+"""
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import quote, urlencode
+
+from app.config.settings import DOWNLOAD_URL_SECRET, DOWNLOAD_URL_TTL_SECONDS
+
+DOWNLOAD_PATH = "/attendance/files/"
+
+
+def _signature(name: str, user_id: int, expires: int, access_token: str) -> str:
+    message = f"{name}:{user_id}:{expires}:{access_token}".encode()
+    digest = hmac.new(DOWNLOAD_URL_SECRET.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def sign_download(name: str, user_id: int, access_token: str) -> str:
+    """
+    Relative URL that lets user_id download export file `name` for at least DOWNLOAD_URL_TTL_SECONDS,
+    while access_token is still the user's session.
+    """
+    expires = (int(time.time()) // DOWNLOAD_URL_TTL_SECONDS + 2) * DOWNLOAD_URL_TTL_SECONDS
+    signature = _signature(name, user_id, expires, access_token)
+    query = urlencode({"user_id": user_id, "expires": expires, "signature": signature})
+    return f"{DOWNLOAD_PATH}{quote(name)}?{query}"
+
+
+def verify_download(name: str, user_id: int, expires: int, signature: str, access_token) -> bool:
+    """access_token is the user's current one; None (logged out) fails every link."""
+    if expires < time.time() or not access_token:
+        return False
+    return hmac.compare_digest(signature, _signature(name, user_id, expires, access_token))
@@ -0,0 +1,63 @@
+"""
+Display timezones for exports, and the business date sessions are filed under.
+
+Sessions are stored as naive UTC and dated by the REPORT_TIMEZONE day of their punch-in
+(business_date). ZoneInfo objects are built once per name, and export times are converted
+a batch at a time: format_local_times runs pandas' vectorized tz_convert over a whole
+column and turns the seconds of the day into "HH:MM:SS" through lookup tables instead of
+calling astimezone() and strftime() for every session.
+"""
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.config.settings import DISPLAY_TIMEZONE, REPORT_TIMEZONE
+
+_HOURS_MINUTES = [f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)]
+_SECONDS = [f":{second:02d}" for second in range(60)]
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def resolve_display_timezone(name: Optional[str] = None) -> str:
+    """The requested IANA timezone name (validated), or DISPLAY_TIMEZONE."""
+    name = name or DISPLAY_TIMEZONE
+    get_zone(name)
+    return name
+
+
+def utc_to_local(utc_datetime: Optional[datetime], zone_name: str = DISPLAY_TIMEZONE):
+    """One naive-UTC (or aware) datetime in the given zone."""
+    if utc_datetime is None:
+        return None
+    if utc_datetime.tzinfo is None:
+        utc_datetime = utc_datetime.replace(tzinfo=timezone.utc)
+    return utc_datetime.astimezone(get_zone(zone_name))
+
+
+def business_date(utc_datetime: datetime) -> date:
+    """The REPORT_TIMEZONE calendar day a naive-UTC (or aware) instant falls on."""
+    return utc_to_local(utc_datetime, REPORT_TIMEZONE).date()
+
+
+def format_local_times(values, zone_name: str = DISPLAY_TIMEZONE):
+    """Wall-clock "HH:MM:SS" in zone_name for a sequence of naive-UTC datetimes; None stays None."""
+    if not values:
+        return []
+    import numpy as np  # imported on the first export rather than by every worker at startup
+    import pandas as pd
+
+    local = pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(zone_name)
+    missing = local.isna()
+    seconds = np.nan_to_num((local.hour * 3600 + local.minute * 60 + local.second).to_numpy(dtype=float))
+    return [
+        None if is_missing else _HOURS_MINUTES[second // 60] + _SECONDS[second % 60]
+        for second, is_missing in zip(seconds.astype(np.int64).tolist(), missing.tolist())
+    ]
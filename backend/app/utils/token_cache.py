@@ -0,0 +1,172 @@
+"""
+Cache of validated access tokens for get_current_user.
+
+Entries map a token to a snapshot of its user and expire at the earlier of the token's
+``exp`` and TOKEN_CACHE_TTL_SECONDS. Logins and logouts invalidate a user's entries
+explicitly. Without TOKEN_CACHE_URL the cache is per worker process; with it, every
+worker shares one Redis backend and sees invalidations immediately.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from app.config.settings import TOKEN_CACHE_ENABLED, TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_URL
+from app.models.user import UserRole
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """The User columns request handlers rely on, detached from any DB session."""
+    id: int
+    name: str
+    email: str
+    role: UserRole
+    access_token: str
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=user.id, name=user.name, email=user.email, role=user.role, access_token=user.access_token)
+
+
+class LocalTokenCache:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    backend = "local"
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # token -> (expires_at, snapshot)
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return snapshot
+
+    def set(self, token: str, snapshot: UserSnapshot, expires_at: float):
+        with self._lock:
+            self._entries[token] = (expires_at, snapshot)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in [token for token, (_, snapshot) in self._entries.items() if snapshot.id == user_id]:
+                del self._entries[token]
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisTokenCache:
+    """Shared backend so logouts on one worker are visible to all of them."""
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when TOKEN_CACHE_URL is set
+
+        self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _token_key(token: str):
+        # Never store raw bearer tokens as keys
+        return "auth:token:" + hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _user_key(user_id: int):
+        return f"auth:user:{user_id}"
+
+    def get(self, token: str):
+        raw = self._redis.get(self._token_key(token))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        data["role"] = UserRole(data["role"])
+        return UserSnapshot(**data)
+
+    def set(self, token: str, snapshot: UserSnapshot, expires_at: float):
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return
+        token_key = self._token_key(token)
+        user_key = self._user_key(snapshot.id)
+        data = dict(asdict(snapshot), role=snapshot.role.value)
+        pipe = self._redis.pipeline()
+        pipe.set(token_key, json.dumps(data), ex=ttl)
+        pipe.sadd(user_key, token_key)
+        pipe.expire(user_key, TOKEN_CACHE_TTL_SECONDS)
+        pipe.execute()
+
+    def invalidate(self, token: str):
+        self._redis.delete(self._token_key(token))
+
+    def invalidate_user(self, user_id: int):
+        user_key = self._user_key(user_id)
+        token_keys = self._redis.smembers(user_key)
+        self._redis.delete(user_key, *token_keys)
+
+    def size(self):
+        return None
+
+
+def _build_cache():
+    if not TOKEN_CACHE_ENABLED:
+        return None
+    if TOKEN_CACHE_URL:
+        return RedisTokenCache(TOKEN_CACHE_URL)
+    return LocalTokenCache(TOKEN_CACHE_MAX_SIZE)
+
+
+_cache = _build_cache()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_cached_user(token: str):
+    if _cache is None:
+        return None
+    snapshot = _cache.get(token)
+    _stats["hits" if snapshot else "misses"] += 1
+    return snapshot
+
+
+def cache_user(token: str, snapshot: UserSnapshot, token_exp: float):
+    if _cache is not None:
+        _cache.set(token, snapshot, min(token_exp, time.time() + TOKEN_CACHE_TTL_SECONDS))
+
+
+def invalidate_token(token: str):
+    if _cache is not None and token:
+        _cache.invalidate(token)
+
+
+def invalidate_user_tokens(user_id: int):
+    if _cache is not None:
+        _cache.invalidate_user(user_id)
+
+
+def token_cache_stats():
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": _cache is not None,
+        "backend": _cache.backend if _cache is not None else None,
+        "size": _cache.size() if _cache is not None else 0,
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
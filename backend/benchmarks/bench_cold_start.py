@@ -0,0 +1,178 @@
+"""
+Cold-start report: import time and resident memory of an API worker.
+
+Imports main in fresh interpreters under `python -X importtime` twice: as a worker
+starts now (exporters registered but not imported) and with pandas, openpyxl and fpdf
+preloaded, which is what each worker paid before the lazy registry. Reports wall-clock
+import time, RSS after import, the heaviest top-level imports, and what the first export
+in each format adds. With --workers N it also starts uvicorn with N workers and reports
+the RSS of each one. Requires uvicorn for the --workers part.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cold_start --repeat 5 --workers 2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.bench_login import free_port, seed
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ["pandas", "numpy", "openpyxl", "fpdf", "pyarrow"]
+
+CHILD = """
+import json, sys, time
+def rss_kb():
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+started = time.perf_counter()
+import main
+{preload}
+imported = time.perf_counter() - started
+report = {{"import_ms": imported * 1000, "rss_kb": rss_kb(), "first_export": {{}}}}
+if {measure_exports}:
+    from app.utils.file_exporter import EXPORTERS, get_exporter
+    for export_format in EXPORTERS:
+        started, before = time.perf_counter(), rss_kb()
+        try:
+            get_exporter(export_format)
+        except ImportError as exc:
+            report["first_export"][export_format] = {{"error": str(exc)}}
+            continue
+        report["first_export"][export_format] = {{"ms": (time.perf_counter() - started) * 1000,
+                                                 "rss_kb": rss_kb() - before}}
+report["heavy"] = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps(report))
+"""
+
+# What main imported before the registry (pyarrow was already loaded on demand)
+PRELOAD = "import app.utils.excel_exporter, app.utils.pdf_exporter, pandas"
+
+
+def run_child(env, preload, measure_exports=False):
+    code = CHILD.format(preload=PRELOAD if preload else "", measure_exports=measure_exports, heavy=HEAVY_PACKAGES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def heaviest_packages(importtime_log, limit):
+    """(cumulative ms, package) of the slowest packages in an -X importtime log.
+
+    A package's cost is its largest cumulative entry, i.e. the import that first pulled it
+    in, so it includes whatever that import loaded alongside it.
+    """
+    packages = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if package != "main":
+            packages[package] = max(packages.get(package, 0), int(cumulative) / 1000)
+    return sorted(((ms, package) for package, ms in packages.items()), reverse=True)[:limit]
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+
+
+def worker_pids(pid):
+    """uvicorn worker processes: multiprocessing spawn children of the supervisor."""
+    with open(f"/proc/{pid}/task/{pid}/children") as children:
+        pids = [int(child) for child in children.read().split()]
+    workers = []
+    for child in pids:
+        with open(f"/proc/{child}/cmdline", "rb") as cmdline:
+            if b"spawn_main" in cmdline.read():
+                workers.append(child)
+    return workers
+
+
+def measure_workers(env, workers):
+    port = free_port()
+    workdir = tempfile.mkdtemp()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--app-dir", BACKEND_DIR],
+        cwd=workdir, env=dict(env, PYTHONWARNINGS="ignore")
+    )
+    try:
+        deadline = time.perf_counter() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1)
+                pids = worker_pids(server.pid)
+                if len(pids) == workers:
+                    break
+            except OSError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.2)
+        time.sleep(1)
+        return rss_kb(server.pid), [rss_kb(pid) for pid in pids]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--top", type=int, default=8, help="Packages to list per mode")
+    parser.add_argument("--workers", type=int, default=0, help="Also start uvicorn with this many workers")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(workdir, 'cold.db')}"
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.setdefault("JWT_SECRET", "benchmark-secret")
+    env.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.update(env)
+    seed(database_url, 1)  # migrate up front: workers would race to create the tables
+    run_child(env, preload=True)  # compile bytecode so neither mode pays for it
+
+    results = {}
+    logs = {}
+    for mode, preload in (("lazy exporters", False), ("preloaded exporters", True)):
+        runs = []
+        for _ in range(args.repeat):
+            report, logs[mode] = run_child(env, preload)
+            runs.append(report)
+        results[mode] = runs
+
+    print(f"{'mode':<22} {'import ms':>10} {'RSS MiB':>9}  heavy packages loaded")
+    for mode, runs in results.items():
+        import_ms = statistics.median(run["import_ms"] for run in runs)
+        rss = statistics.median(run["rss_kb"] for run in runs) / 1024
+        print(f"{mode:<22} {import_ms:>10.0f} {rss:>9.1f}  {', '.join(runs[0]['heavy']) or '-'}")
+
+    for mode in results:
+        print(f"\nslowest packages with {mode} (cumulative ms):")
+        for cumulative, name in heaviest_packages(logs[mode], args.top):
+            print(f"  {cumulative:>8.1f}  {name}")
+
+    report, _ = run_child(env, preload=False, measure_exports=True)
+    print("\ndeferred to the first export in each format:")
+    for export_format, cost in report["first_export"].items():
+        if "error" in cost:
+            print(f"  {export_format:<8} unavailable ({cost['error']})")
+        else:
+            print(f"  {export_format:<8} {cost['ms']:>8.0f} ms  +{cost['rss_kb'] / 1024:.1f} MiB")
+
+    if args.workers:
+        supervisor, workers = measure_workers(env, args.workers)
+        print(f"\nuvicorn --workers {args.workers}: supervisor {supervisor / 1024:.1f} MiB, "
+              f"workers {', '.join(f'{rss / 1024:.1f}' for rss in workers)} MiB")
+
+
+if __name__ == "__main__":
+    main()
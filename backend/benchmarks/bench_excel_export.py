@@ -0,0 +1,118 @@
+"""
+Benchmark for export_to_excel against the previous pandas + per-cell styling writer.
+
+Each run happens in a fresh process so peak RSS (ru_maxrss) is measured per export.
+
+Usage (from backend/):
+    python -m benchmarks.bench_excel_export --rows 10000 100000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_rows(count):
+    """Synthetic export rows: three sessions per user-day, like get_attendance_export produces."""
+    rows = []
+    for i in range(count):
+        first = i % 3 == 0
+        rows.append({
+            "Date": "2025-01-15" if first else "",
+            "Name": f"Employee {i // 3}" if first else "",
+            "Email": f"employee{i // 3}@example.com" if first else "",
+            "Punch In": "09:00:00",
+            "Punch Out": "12:30:00" if i % 7 else "In Progress",
+            "Duration (hours)": 3.5,
+            "Total Hours": 8.25 if first else "",
+            "is_first_entry": first,
+        })
+    return rows
+
+
+def legacy_export_to_excel(data, filename):
+    """The previous implementation, kept here only as the comparison baseline."""
+    import pandas as pd
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
+    clean_data = [{k: v for k, v in row.items() if k != "is_first_entry"} for row in data]
+    df = pd.DataFrame(clean_data)
+
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Attendance Report', index=False)
+        worksheet = writer.sheets['Attendance Report']
+
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill("solid", fgColor="366092")
+        header_alignment = Alignment(horizontal="center", vertical="center")
+        for col in range(1, len(df.columns) + 1):
+            cell = worksheet.cell(row=1, column=col)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+
+        thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                             top=Side(style='thin'), bottom=Side(style='thin'))
+        for row in range(1, len(df) + 2):
+            for col in range(1, len(df.columns) + 1):
+                cell = worksheet.cell(row=row, column=col)
+                cell.border = thin_border
+                if row > 1:
+                    cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        for column in worksheet.columns:
+            max_length = max(len(str(cell.value)) for cell in column)
+            worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+    return filename
+
+
+def _run(implementation, rows, queue):
+    if implementation == "current":
+        from app.utils.excel_exporter import export_to_excel as export
+    else:
+        export = legacy_export_to_excel
+
+    data = make_rows(rows)
+    filename = os.path.join(tempfile.mkdtemp(), "bench.xlsx")
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    export(data, filename)
+    elapsed = time.perf_counter() - started
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, baseline, peak, os.path.getsize(filename)))
+    os.remove(filename)
+
+
+def measure(implementation, rows):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run, args=(implementation, rows, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'impl':>8} {'time (s)':>9} {'peak RSS (MB)':>14} {'export RSS (MB)':>16} {'file (KB)':>10}")
+    for rows in args.rows:
+        for implementation in ("legacy", "current"):
+            elapsed, baseline, peak, size = measure(implementation, rows)
+            # ru_maxrss is reported in KB on Linux
+            print(f"{rows:>8} {implementation:>8} {elapsed:>9.2f} {peak / 1024:>14.1f} "
+                  f"{(peak - baseline) / 1024:>16.1f} {size / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark for fetch_all_attendance (GET /attendance/).
+
+Grows the attendance history day by day against a throw-away SQLite database and
+times the admin daily view for "today". The date-scoped query should stay flat
+as history grows, while the old joinedload approach grows with it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_fetch_all_attendance --users 500 --days 0 30 180 730
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_fetch_all_attendance.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, engine  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.models.attendance_session import AttendanceSession  # noqa: E402
+from app.services.attendance_service import fetch_all_attendance  # noqa: E402
+from app.services.attendance_summary_service import rebuild_daily_summary  # noqa: E402
+
+
+# One loop for every call: pooled async connections are bound to the loop that opened them
+loop = asyncio.new_event_loop()
+
+
+def current_fetch_all_attendance(selected_date):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await fetch_all_attendance(selected_date, db)
+    return loop.run_until_complete(run())
+
+
+def legacy_fetch_all_attendance(selected_date):
+    """The previous implementation: load every session of every user, filter in Python."""
+    db = SessionLocal()
+    try:
+        users = db.query(User).options(joinedload(User.attendance_sessions)).all()
+        return [
+            [s for s in user.attendance_sessions if s.date == selected_date]
+            for user in users
+        ]
+    finally:
+        db.close()
+
+
+def seed_users(count):
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": "x",
+                "role": UserRole.employee,
+            }
+            for i in range(count)
+        ])
+
+
+def seed_history(user_count, from_day, to_day):
+    """Insert two sessions per user for every day in [from_day, to_day)."""
+    today = date.today()
+    with engine.begin() as conn:
+        for offset in range(from_day, to_day):
+            day = today - timedelta(days=offset)
+            start = datetime(day.year, day.month, day.day, 4, 0)
+            rows = []
+            for user_id in range(1, user_count + 1):
+                rows.append({"user_id": user_id, "date": day, "punch_in": start,
+                             "punch_out": start + timedelta(hours=4), "duration": 4.0})
+                rows.append({"user_id": user_id, "date": day, "punch_in": start + timedelta(hours=5),
+                             "punch_out": start + timedelta(hours=9), "duration": 4.0})
+            conn.execute(insert(AttendanceSession), rows)
+        rebuild_daily_summary(conn, today - timedelta(days=to_day - 1), today - timedelta(days=from_day))
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(date.today())
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 30, 180, 730])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the current implementation")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed_users(args.users)
+
+    print(f"{'history days':>12} {'sessions':>10} {'current (ms)':>14} {'legacy (ms)':>13}")
+    seeded = 0
+    for days in sorted(args.days):
+        seed_history(args.users, seeded, days)
+        seeded = days
+        current = time_call(current_fetch_all_attendance, args.repeat)
+        legacy = "-" if args.skip_legacy else f"{time_call(legacy_fetch_all_attendance, args.repeat):.1f}"
+        print(f"{days:>12} {days * args.users * 2:>10} {current:>14.1f} {legacy:>13}")
+
+    os.remove(DB_FILE)
+
+
+if __name__ == "__main__":
+    main()
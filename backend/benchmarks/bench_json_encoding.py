@@ -0,0 +1,113 @@
+"""
+Micro-benchmark of response encoding, in ms per 10k rows.
+
+Encodes synthetic payloads the way the endpoints used to (pydantic models from ORM
+objects for /user/, then FastAPI's jsonable_encoder + json.dumps for everything) and the
+way they do now (app.utils.json_response: TypeAdapter.dump_json over SQL row dicts, or
+orjson for the streamed report rows). No database needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json_encoding --rows 10000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def envelope(message, data):
+    return {"success": True, "status_code": 200, "message": message, "data": data}
+
+
+def build_payloads(rows, rng):
+    from app.models.user import User, UserRole
+
+    day = date(2025, 1, 6)
+    users = [User(id=index, name=f"Employee {index}", email=f"employee{index}@example.com",
+                  role=UserRole.employee, hashed_password="x") for index in range(1, rows + 1)]
+    user_rows = [{"id": user.id, "name": user.name, "email": user.email, "role": user.role} for user in users]
+
+    daily = []
+    for user in users:
+        sessions = []
+        punch_in = datetime.combine(day, datetime.min.time()) + timedelta(hours=3, seconds=rng.randrange(3600))
+        for _ in range(rng.randint(0, 3)):
+            punch_out = punch_in + timedelta(seconds=rng.randrange(3600, 4 * 3600))
+            sessions.append({"punch_in": punch_in, "punch_out": punch_out,
+                             "duration": round((punch_out - punch_in).total_seconds() / 3600, 2)})
+            punch_in = punch_out + timedelta(minutes=30)
+        daily.append({
+            "user_id": user.id, "name": user.name, "email": user.email, "date": day,
+            "first_punch_in": sessions[0]["punch_in"] if sessions else None,
+            "last_punch_out": sessions[-1]["punch_out"] if sessions else None,
+            "total_duration": round(sum(s["duration"] for s in sessions), 2) if sessions else None,
+            "sessions": sessions,
+        })
+
+    report = [{"user_id": user.id, "name": user.name, "email": user.email, "date": day,
+               "first_punch_in": None, "last_punch_out": None, "total_hours": 7.5, "worked_hours": 7.25,
+               "sessions": 2, "late": 0, "absent": 0} for user in users]
+    return users, user_rows, daily, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    sys.path.append(BACKEND_DIR)
+    # The models import the engine; nothing here connects to it
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    import warnings
+    from fastapi.encoders import jsonable_encoder
+
+    from app.schemas.attendance_session import DAILY_ATTENDANCE_RESPONSE
+    from app.schemas.user_schema import USER_PAGE_RESPONSE, UserSchema
+    from app.utils.json_response import dumps, orjson
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)  # UserSchema.from_orm
+    users, user_rows, daily, report = build_payloads(args.rows, random.Random(args.seed))
+    page = {"total": None, "limit": args.rows, "next_cursor": None}
+
+    def legacy(content):
+        return json.dumps(jsonable_encoder(content)).encode()
+
+    cases = [
+        ("/user/", "from_orm + jsonable_encoder",
+         lambda: legacy(envelope("Users fetched", dict(page, users=[UserSchema.from_orm(u) for u in users])))),
+        ("/user/", "TypeAdapter over rows",
+         lambda: USER_PAGE_RESPONSE.dump_json(envelope("Users fetched", dict(page, users=user_rows)))),
+        ("/attendance/", "jsonable_encoder",
+         lambda: legacy(envelope("Users attendance fetched", daily))),
+        ("/attendance/", "TypeAdapter over rows",
+         lambda: DAILY_ATTENDANCE_RESPONSE.dump_json(envelope("Users attendance fetched", daily))),
+        ("report rows", "jsonable_encoder per row",
+         lambda: b",".join(json.dumps(jsonable_encoder(row)).encode() for row in report)),
+        ("report rows", "json_response.dumps per row",
+         lambda: b",".join(dumps(row) for row in report)),
+    ]
+
+    print(f"orjson: {'installed' if orjson is not None else 'missing (stdlib fallback)'}, rows: {args.rows}")
+    print(f"{'payload':<14} {'encoder':<28} {'ms / 10k rows':>14} {'speed-up':>9}")
+    baseline = None
+    for index, (payload, name, encode) in enumerate(cases):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            encode()
+            best = min(best, time.perf_counter() - started)
+        per_10k = best * 1000 * 10000 / args.rows
+        if index % 2 == 0:
+            baseline = per_10k
+        print(f"{payload:<14} {name:<28} {per_10k:>14.1f} {baseline / per_10k:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Login storm benchmark: p99 latency of logins and of punches running alongside them.
+
+Starts the API under uvicorn (SQLite, one worker) once with bcrypt verified in the
+serving process's thread pool (PASSWORD_POOL_SIZE=0, the previous behaviour) and once
+with the dedicated password pool, then fires N concurrent logins while a few clients keep
+punching in and out. Requires httpx and uvicorn.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --logins 200 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "Bench@1234"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else float("nan")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(database_url, users):
+    """Create the schema and users in a child process that shares the server's settings."""
+    script = (
+        "from sqlalchemy import insert\n"
+        "from app.core.database import engine\n"
+        "from app.migrations import run_migrations\n"
+        "from app.models.user import User, UserRole\n"
+        "from app.utils.hashing import hash_password\n"
+        "run_migrations(engine)\n"
+        f"hashed = hash_password({PASSWORD!r})\n"
+        "with engine.begin() as conn:\n"
+        f"    conn.execute(insert(User), [{{'name': f'Bench {{i}}', 'email': f'bench{{i}}@example.com',"
+        f" 'hashed_password': hashed, 'role': UserRole.employee}} for i in range({users})])\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, check=True,
+                   env=dict(os.environ, DATABASE_URL=database_url))
+
+
+async def wait_until_up(client):
+    for _ in range(200):
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def login(client, index):
+    started = time.perf_counter()
+    response = await client.post("/auth/login", json={"email": f"bench{index}@example.com", "password": PASSWORD})
+    return time.perf_counter() - started, response
+
+
+async def puncher(client, headers, deadline, latencies, errors):
+    path = "/attendance/punch-in"
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+        path = "/attendance/punch-out" if path.endswith("in") else "/attendance/punch-in"
+
+
+async def drive(base_url, logins, punchers, duration):
+    limits = httpx.Limits(max_connections=logins + punchers + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await wait_until_up(client)
+        punch_headers = []
+        for index in range(punchers):
+            _, response = await login(client, logins + index)
+            punch_headers.append({"Authorization": f"Bearer {response.json()['data']['access_token']}"})
+
+        punch_latencies, punch_errors = [], []
+        deadline = time.perf_counter() + duration
+        punch_tasks = [asyncio.create_task(puncher(client, headers, deadline, punch_latencies, punch_errors))
+                       for headers in punch_headers]
+        results = await asyncio.gather(*[login(client, index) for index in range(logins)])
+        await asyncio.gather(*punch_tasks)
+
+    login_latencies = [elapsed for elapsed, response in results if response.status_code == 200]
+    rejected = sum(1 for _, response in results if response.status_code == 503)
+    return {
+        "login_p50": percentile(login_latencies, 50),
+        "login_p99": percentile(login_latencies, 99),
+        "logins_ok": len(login_latencies),
+        "logins_503": rejected,
+        "punch_p50": percentile(punch_latencies, 50),
+        "punch_p99": percentile(punch_latencies, 99),
+        "punches": len(punch_latencies),
+        "punch_errors": len(punch_errors),
+    }
+
+
+def run_mode(pool_size, args):
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env = dict(os.environ, DATABASE_URL=database_url, PASSWORD_POOL_SIZE=str(pool_size),
+               PASSWORD_QUEUE_DEPTH=str(args.queue_depth), BCRYPT_ROUNDS=str(args.rounds))
+    env.setdefault("JWT_SECRET", "benchmark-secret")
+    env.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.update(env)
+    seed(database_url, args.logins + args.punchers)
+
+    port = free_port()
+    os.makedirs(os.path.join(workdir, "exports"), exist_ok=True)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--app-dir", BACKEND_DIR],
+        cwd=workdir, env=env
+    )
+    try:
+        return asyncio.run(drive(f"http://127.0.0.1:{port}", args.logins, args.punchers, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--punchers", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds the punch clients keep running")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--queue-depth", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    args = parser.parse_args()
+
+    print(f"{'mode':>14} {'login p50/p99 (ms)':>20} {'ok':>5} {'503':>5} {'punch p50/p99 (ms)':>20} {'punches':>8}")
+    for label, pool_size in (("thread pool", 0), (f"process x{args.pool_size}", args.pool_size)):
+        result = run_mode(pool_size, args)
+        print(f"{label:>14} {result['login_p50'] * 1000:>9.0f}/{result['login_p99'] * 1000:<10.0f} "
+              f"{result['logins_ok']:>5} {result['logins_503']:>5} "
+              f"{result['punch_p50'] * 1000:>9.0f}/{result['punch_p99'] * 1000:<10.0f} {result['punches']:>8}")
+
+
+if __name__ == "__main__":
+    main()
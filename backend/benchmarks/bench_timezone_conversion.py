@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of the export time-conversion stage.
+
+Converts N naive-UTC punch times to "HH:MM:SS" wall-clock strings in the display
+timezone three ways: the previous per-session pytz lookup + astimezone + strftime,
+a cached ZoneInfo per session, and app.utils.timezones.format_local_times on
+cursor-sized batches (what iter_attendance_export_rows does). No database needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_timezone_conversion --rows 200000 --tz Asia/Kolkata
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy(values, zone_name):
+    import pytz
+
+    result = []
+    for value in values:
+        # What convert_utc_to_ist did for every session: build both zones, localize, convert, format
+        utc_tz = pytz.timezone("UTC")
+        local_tz = pytz.timezone(zone_name)
+        result.append(utc_tz.localize(value).astimezone(local_tz).strftime("%H:%M:%S") if value else None)
+    return result
+
+
+def cached_zoneinfo(values, zone_name):
+    from app.utils.timezones import get_zone
+
+    zone = get_zone(zone_name)
+    return [value.replace(tzinfo=timezone.utc).astimezone(zone).strftime("%H:%M:%S") if value else None
+            for value in values]
+
+
+def vectorized(values, zone_name, batch_size):
+    from app.utils.timezones import format_local_times
+
+    result = []
+    for offset in range(0, len(values), batch_size):
+        result.extend(format_local_times(values[offset:offset + batch_size], zone_name))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--tz", default="Asia/Kolkata", help="Display timezone (try a DST zone like Europe/London)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per vectorized batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    sys.path.append(BACKEND_DIR)
+
+    rng = random.Random(args.seed)
+    start = datetime(2025, 1, 1)
+    # A year of punch times, with the occasional open session (no punch-out)
+    values = [None if rng.random() < 0.01 else start + timedelta(seconds=rng.randrange(365 * 86400))
+              for _ in range(args.rows)]
+
+    candidates = {
+        "pytz per session": lambda: legacy(values, args.tz),
+        "cached zoneinfo": lambda: cached_zoneinfo(values, args.tz),
+        f"vectorized x{args.batch_size}": lambda: vectorized(values, args.tz, args.batch_size),
+    }
+    expected = None
+    baseline = None
+    print(f"{'method':<22} {'best ms':>10} {'rows/s':>14} {'speed-up':>9}")
+    for name, convert in candidates.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = convert()
+            best = min(best, time.perf_counter() - started)
+        if expected is None:
+            expected, baseline = result, best
+        elif result != expected:
+            raise SystemExit(f"{name} disagrees with the per-session conversion")
+        print(f"{name:<22} {best * 1000:>10.1f} {args.rows / best:>14,.0f} {baseline / best:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
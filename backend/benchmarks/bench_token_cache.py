@@ -0,0 +1,92 @@
+"""
+Load test for the access-token cache in get_current_user.
+
+Sends authenticated GET /attendance/me requests with the cache disabled and enabled
+(each in its own process, against SQLite) and reports SQL statements per request,
+token lookups against the users table, and throughput.
+
+Usage (from backend/):
+    python -m benchmarks.bench_token_cache --requests 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_worker(requests):
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    sys.path.append(BACKEND_DIR)
+    os.chdir(workdir)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    import main
+    from app.core.database import SessionLocal, engine
+    from app.models.user import User, UserRole
+    from app.utils.hashing import hash_password
+
+    with TestClient(main.app) as client:
+        db = SessionLocal()
+        db.add(User(name="Bench", email="bench@example.com",
+                    hashed_password=hash_password("Bench@1234"), role=UserRole.employee))
+        db.commit()
+        db.close()
+
+        login = client.post("/auth/login", json={"email": "bench@example.com", "password": "Bench@1234"})
+        headers = {"Authorization": f"Bearer {login.json()['data']['access_token']}"}
+
+        counts = {"statements": 0, "token_lookups": 0}
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            counts["statements"] += 1
+            if "FROM users" in statement and "access_token" in statement:
+                counts["token_lookups"] += 1
+
+        event.listen(engine, "before_cursor_execute", count)
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get("/attendance/me", headers=headers)
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", count)
+
+    print(json.dumps({
+        "statements_per_request": counts["statements"] / requests,
+        "token_lookups": counts["token_lookups"],
+        "db_queries_per_second": counts["statements"] / elapsed,
+        "requests_per_second": requests / elapsed,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.requests)
+        return
+
+    print(f"{'cache':>8} {'stmts/req':>10} {'token lookups':>14} {'DB queries/s':>13} {'req/s':>8}")
+    for enabled in ("false", "true"):
+        env = dict(os.environ, TOKEN_CACHE_ENABLED=enabled)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_token_cache", "--worker", "--requests", str(args.requests)],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        print(f"{'on' if enabled == 'true' else 'off':>8} {result['statements_per_request']:>10.2f} "
+              f"{result['token_lookups']:>14} {result['db_queries_per_second']:>13.0f} {result['requests_per_second']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Idle-connection check for the live attendance feed.
+
+Starts the API under uvicorn (SQLite, one worker), opens N SSE connections to
+/attendance/live as an admin, and measures the server's resident memory before and
+after. Then one employee punches in and every connection must receive the punch_in
+event. Exits non-zero when delivery fails or memory per connection exceeds the budget.
+Needs a file-descriptor limit above N (ulimit -n). Requires httpx and uvicorn.
+
+Usage (from backend/):
+    python -m benchmarks.live_feed_connections --connections 5000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_login import PASSWORD, free_port, seed, wait_until_up
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not available")
+
+
+async def open_stream(port, token):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((f"GET /attendance/live HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                  f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n").encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(head.split(b"\r\n", 1)[0].decode())
+    return reader, writer
+
+
+async def wait_for_event(reader, name, timeout):
+    marker = f"event: {name}".encode()
+    deadline = time.perf_counter() + timeout
+    buffer = b""
+    while marker not in buffer:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        try:
+            chunk = await asyncio.wait_for(reader.read(4096), remaining)
+        except asyncio.TimeoutError:
+            return False
+        if not chunk:
+            return False
+        buffer += chunk
+    return True
+
+
+async def drive(port, pid, args):
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        await wait_until_up(client)
+        tokens = []
+        for index in range(2):
+            response = await client.post("/auth/login", json={"email": f"bench{index}@example.com", "password": PASSWORD})
+            tokens.append(response.json()["data"]["access_token"])
+        admin_token, employee_token = tokens
+
+        baseline = rss_kb(pid)
+        streams = []
+        started = time.perf_counter()
+        # Batches stay under the listen backlog
+        for offset in range(0, args.connections, args.batch):
+            streams.extend(await asyncio.gather(*[
+                open_stream(port, admin_token) for _ in range(min(args.batch, args.connections - offset))
+            ]))
+        connect_seconds = time.perf_counter() - started
+        await asyncio.sleep(args.settle)
+        connected = rss_kb(pid)
+
+        started = time.perf_counter()
+        await client.post("/attendance/punch-in", headers={"Authorization": f"Bearer {employee_token}"})
+        delivered = await asyncio.gather(*[wait_for_event(reader, "punch_in", args.timeout) for reader, _ in streams])
+        deliver_seconds = time.perf_counter() - started
+        stats = (await client.get("/system/live-feed", headers={"Authorization": f"Bearer {admin_token}"})).json()["data"]
+
+        for _, writer in streams:
+            writer.close()
+
+    per_connection = (connected - baseline) / args.connections
+    print(f"connections:     {len(streams)} opened in {connect_seconds:.1f}s, server reports {stats['connections']}")
+    print(f"server RSS:      {baseline / 1024:.1f} MiB idle -> {connected / 1024:.1f} MiB connected "
+          f"({per_connection:.1f} KiB per connection)")
+    print(f"punch_in event:  delivered to {sum(delivered)}/{len(streams)} in {deliver_seconds * 1000:.0f} ms")
+
+    failures = []
+    if sum(delivered) != args.connections:
+        failures.append(f"{args.connections - sum(delivered)} connections missed the event")
+    if per_connection > args.max_kib_per_connection:
+        failures.append(f"{per_connection:.1f} KiB per connection exceeds {args.max_kib_per_connection} KiB")
+    for failure in failures:
+        print("FAIL", failure)
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500, help="Connections opened concurrently")
+    parser.add_argument("--settle", type=float, default=2, help="Seconds to wait before measuring memory")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds each connection has to receive the event")
+    parser.add_argument("--max-kib-per-connection", type=float, default=64)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(workdir, 'live.db')}"
+    env = dict(os.environ, DATABASE_URL=database_url, LIVE_FEED_MAX_CONNECTIONS=str(args.connections + 100),
+               REQUEST_METRICS_ENABLED="false")
+    env.setdefault("JWT_SECRET", "benchmark-secret")
+    env.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.update(env)
+    seed(database_url, 2)
+    subprocess.run([sys.executable, "-c", (
+        "from sqlalchemy import update\n"
+        "from app.core.database import engine\n"
+        "from app.models.user import User, UserRole\n"
+        "with engine.begin() as conn:\n"
+        "    conn.execute(update(User).where(User.email == 'bench0@example.com').values(role=UserRole.admin))\n"
+    )], cwd=BACKEND_DIR, check=True, env=env)
+
+    port = free_port()
+    os.makedirs(os.path.join(workdir, "exports"), exist_ok=True)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--backlog", str(args.batch * 2), "--app-dir", BACKEND_DIR],
+        cwd=workdir, env=env
+    )
+    try:
+        ok = asyncio.run(drive(port, server.pid, args))
+    finally:
+        server.terminate()
+        server.wait()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
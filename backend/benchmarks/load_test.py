@@ -0,0 +1,75 @@
+"""
+Concurrent load test against a running API instance.
+
+Logs in once, then keeps N clients busy on one endpoint for a fixed duration and reports
+requests/sec and latency percentiles. Run it against a deployment before and after a change
+to compare, e.g. the sync vs async database layer at 500 concurrent clients.
+
+Requires httpx (pip install httpx). Usage (from backend/):
+    python -m benchmarks.load_test --base-url http://localhost:8000 --path /attendance/ \\
+        --email admin@yopmail.com --password Test@1234 --concurrency 500 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def client_loop(client, method, path, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        login = await client.post("/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['data']['access_token']}"}
+
+        latencies, errors = [], []
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            client_loop(client, args.method, args.path, headers, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    print(f"{args.method} {args.path}: {len(latencies)} requests, {len(errors)} errors, "
+          f"{args.concurrency} clients, {elapsed:.1f}s")
+    print(f"  requests/sec: {len(latencies) / elapsed:.1f}")
+    if latencies:
+        print(f"  latency ms: p50={statistics.median(latencies) * 1000:.1f} "
+              f"p95={percentile(latencies, 95) * 1000:.1f} p99={percentile(latencies, 99) * 1000:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/attendance/")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--email", default="admin@yopmail.com")
+    parser.add_argument("--password", default="Test@1234")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=30)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
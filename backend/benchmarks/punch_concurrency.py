@@ -0,0 +1,126 @@
+"""
+Concurrency check for punch-in / punch-out.
+
+Fires N parallel punch-ins per user (double clicks and app retries, some sharing an
+Idempotency-Key), then N parallel punch-outs, through the ASGI app against a throw-away
+SQLite database (or DATABASE_URL). Asserts that each user ends up with exactly one open
+session after the punch-ins and none after the punch-outs, and that retries with the
+same key got the same response. Exits non-zero on failure.
+
+Usage (from backend/):
+    python -m benchmarks.punch_concurrency --users 5 --parallel 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "Bench@1234"
+
+
+async def punch_all(client, path, headers_per_user, parallel, keys):
+    """parallel requests per user; request i uses Idempotency-Key keys[i] (None for no key)."""
+    requests = []
+    for user_headers in headers_per_user:
+        for index in range(parallel):
+            headers = dict(user_headers)
+            if keys[index]:
+                headers["Idempotency-Key"] = keys[index]
+            requests.append(client.post(path, headers=headers))
+    return await asyncio.gather(*requests)
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import func, insert, select
+    import main
+    from app.core.database import AsyncSessionLocal, engine
+    from app.migrations import run_migrations
+    from app.models.attendance_session import AttendanceSession
+    from app.models.user import User, UserRole
+    from app.utils.hashing import hash_password
+
+    run_migrations(engine)
+    hashed = hash_password(PASSWORD)
+    with engine.begin() as conn:
+        first_id = (conn.execute(select(func.max(User.id))).scalar() or 0) + 1
+        conn.execute(insert(User), [
+            {"name": f"Puncher {i}", "email": f"puncher{first_id + i}@example.com",
+             "hashed_password": hashed, "role": UserRole.employee}
+            for i in range(args.users)
+        ])
+        user_ids = list(conn.execute(select(User.id).where(User.id >= first_id)).scalars())
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+        headers_per_user = []
+        for user_id in user_ids:
+            login = await client.post("/auth/login", json={"email": f"puncher{user_id}@example.com", "password": PASSWORD})
+            headers_per_user.append({"Authorization": f"Bearer {login.json()['data']['access_token']}"})
+
+        # Every third request is a retry sharing one key; the rest are independent clicks
+        keys = ["retry-in" if index % 3 == 0 else None for index in range(args.parallel)]
+        responses = await punch_all(client, "/attendance/punch-in", headers_per_user, args.parallel, keys)
+        statuses = Counter(response.status_code for response in responses)
+
+        async with AsyncSessionLocal() as db:
+            open_sessions = dict((await db.execute(
+                select(AttendanceSession.user_id, func.count())
+                .where(AttendanceSession.user_id.in_(user_ids), AttendanceSession.punch_out == None)
+                .group_by(AttendanceSession.user_id)
+            )).all())
+
+        failures = []
+        for user_id in user_ids:
+            if open_sessions.get(user_id, 0) != 1:
+                failures.append(f"user {user_id}: {open_sessions.get(user_id, 0)} open sessions after punch-in")
+        for user_index in range(len(user_ids)):
+            replayed = {responses[user_index * args.parallel + index].text
+                        for index in range(args.parallel) if keys[index]}
+            if len(replayed) > 1:
+                failures.append(f"user {user_ids[user_index]}: {len(replayed)} different responses for one key")
+
+        keys = ["retry-out" if index % 3 == 0 else None for index in range(args.parallel)]
+        out_responses = await punch_all(client, "/attendance/punch-out", headers_per_user, args.parallel, keys)
+        out_statuses = Counter(response.status_code for response in out_responses)
+
+        async with AsyncSessionLocal() as db:
+            still_open = (await db.execute(
+                select(func.count()).select_from(AttendanceSession)
+                .where(AttendanceSession.user_id.in_(user_ids), AttendanceSession.punch_out == None)
+            )).scalar()
+        if still_open:
+            failures.append(f"{still_open} sessions still open after punch-out")
+        closed_per_user = Counter(response.status_code == 200 and "punch_out" in response.json()
+                                  for response in out_responses)
+
+    print(f"punch-in:  {len(responses)} requests, HTTP statuses {dict(statuses)}, "
+          f"open sessions per user {sorted(Counter(open_sessions.values()).items())}")
+    print(f"punch-out: {len(out_responses)} requests, HTTP statuses {dict(out_statuses)}, "
+          f"successful closes {closed_per_user[True]}")
+    for failure in failures:
+        print("FAIL", failure)
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--parallel", type=int, default=100, help="Concurrent punches per user")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'punch.db')}")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    sys.path.append(BACKEND_DIR)
+    os.chdir(workdir)
+
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the API endpoints and the file exporters.
+
+`run` seeds a throw-away SQLite database with app.seed.synthetic_data, then measures
+latency distributions and throughput of /auth/login, /auth/me, the punch endpoints,
+/attendance/me, /attendance/, /attendance/report and /user/ (in-process, through the ASGI app), and of
+export_to_csv / export_to_excel / export_to_pdf at several dataset sizes. Results are
+written as JSON. `compare` checks a result file against a stored baseline and exits
+non-zero when a metric regressed by more than the threshold.
+
+Usage (from backend/):
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --output current.json --baseline baseline.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PASSWORD = "Bench@1234"
+
+
+def summarize(samples, items_per_sample=1):
+    """Latency percentiles in ms and throughput (items per second) for a list of durations in seconds."""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+
+    total = sum(ordered)
+    return {
+        "samples": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+        "throughput_per_s": len(ordered) * items_per_sample / total if total else 0.0,
+    }
+
+
+def time_requests(call, count, warmup=3):
+    for _ in range(warmup):
+        call()
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = call()
+        samples.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}")
+    return summarize(samples)
+
+
+def bench_endpoints(client, users, args):
+    """users: (admin, employee, login_user) emails. Returns {name: stats}."""
+    admin_email, employee_email, login_email = users
+
+    def login(email):
+        response = client.post("/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    admin, employee = login(admin_email), login(employee_email)
+    results = {
+        "POST /auth/login": time_requests(
+            lambda: client.post("/auth/login", json={"email": login_email, "password": BENCH_PASSWORD}),
+            args.login_requests, warmup=1
+        ),
+        "GET /auth/me": time_requests(lambda: client.get("/auth/me", headers=employee), args.requests),
+        "GET /attendance/me": time_requests(lambda: client.get("/attendance/me", headers=employee), args.requests),
+        "GET /attendance/": time_requests(lambda: client.get("/attendance/", headers=admin), args.requests),
+        "GET /user/": time_requests(lambda: client.get("/user/", params={"limit": 50}, headers=admin), args.requests),
+        "GET /user/?search": time_requests(
+            lambda: client.get("/user/", params={"limit": 50, "search": "sharma"}, headers=admin), args.requests
+        ),
+    }
+
+    # A payroll-period report over (up to) the last 31 seeded days; heavier, so fewer samples
+    end = date.today()
+    period = {"start_date": (end - timedelta(days=min(args.days, 31) - 1)).isoformat(), "end_date": end.isoformat()}
+    for group_by in ("day", "user"):
+        results[f"GET /attendance/report?group_by={group_by}"] = time_requests(
+            lambda: client.get("/attendance/report", params=dict(period, group_by=group_by), headers=admin),
+            max(args.requests // 10, 5), warmup=1
+        )
+
+    # Alternate punch-in / punch-out so each call does real work
+    client.post("/attendance/punch-out", headers=employee)
+    punch_in, punch_out = [], []
+    for _ in range(args.requests):
+        for path, samples in (("/attendance/punch-in", punch_in), ("/attendance/punch-out", punch_out)):
+            started = time.perf_counter()
+            response = client.post(path, headers=employee)
+            samples.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"POST {path} -> {response.status_code}")
+    results["POST /attendance/punch-in"] = summarize(punch_in)
+    results["POST /attendance/punch-out"] = summarize(punch_out)
+    return results
+
+
+def bench_exporters(export_rows, args):
+    from app.utils.file_exporter import get_export_filename, get_exporter
+
+    exporters = {export_format: get_exporter(export_format) for export_format in ("csv", "excel", "pdf")}
+    results = {}
+    for size in args.export_sizes:
+        # Repeat the seeded rows when the dataset is smaller than the requested size
+        data = [export_rows[index % len(export_rows)] for index in range(size)]
+        for export_format, exporter in exporters.items():
+            if export_format == "pdf" and size > args.pdf_max_rows:
+                continue
+            samples = []
+            for _ in range(args.export_repeat):
+                filename = get_export_filename("bench", export_format)
+                started = time.perf_counter()
+                exporter(data, filename)
+                samples.append(time.perf_counter() - started)
+                os.remove(filename)
+            results[f"export_to_{export_format}[{size}]"] = summarize(samples, items_per_sample=size)
+    return results
+
+
+def run(args):
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    sys.path.append(BACKEND_DIR)
+    os.chdir(workdir)  # exports/ is created relative to the working directory
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select, update
+    import main
+    from app.core.database import SessionLocal, engine
+    from app.models.user import User, UserRole
+    from app.seed.synthetic_data import seed_synthetic_data
+    from app.services.attendance_service import iter_attendance_export_rows
+
+    seed_synthetic_data(args.users, args.days, args.seed, password=BENCH_PASSWORD, log=lambda message: None)
+
+    with engine.begin() as conn:
+        user_ids = list(conn.execute(select(User.id).order_by(User.id).limit(3)).scalars())
+        # Admin for the admin views, an employee for the personal ones, and a separate login user
+        # (each login rotates that user's token)
+        conn.execute(update(User).where(User.id == user_ids[0]).values(role=UserRole.admin))
+        conn.execute(update(User).where(User.id.in_(user_ids[1:])).values(role=UserRole.employee))
+        emails = list(conn.execute(select(User.email).where(User.id.in_(user_ids)).order_by(User.id)).scalars())
+
+    db = SessionLocal()
+    try:
+        end = date.today()
+        export_rows = list(iter_attendance_export_rows(db, None, end - timedelta(days=args.days - 1), end, export_all=True))
+    finally:
+        db.close()
+
+    with TestClient(main.app) as client:
+        results = bench_endpoints(client, emails, args)
+    results.update(bench_exporters(export_rows, args))
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "days": args.days,
+            "seed": args.seed,
+            "requests": args.requests,
+            "export_sizes": args.export_sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, metric, threshold):
+    """Print a comparison table; returns the names of benchmarks that regressed."""
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>12} {stats[metric]:>12.2f} {'new':>9}")
+            continue
+        change = (stats[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+        # Latencies regress upwards, throughput downwards
+        slowdown = -change if metric == "throughput_per_s" else change
+        flag = ""
+        if slowdown > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {base[metric]:>12.2f} {stats[metric]:>12.2f} {change:>+8.1%}{flag}")
+    for name in baseline["results"].keys() - current["results"].keys():
+        print(f"{name:<36} {baseline['results'][name][metric]:>12.2f} {'-':>12} {'missing':>9}")
+    return regressions
+
+
+def print_results(report):
+    print(f"{'benchmark':<36} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>12}")
+    for name, stats in report["results"].items():
+        print(f"{name:<36} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} {stats['p99_ms']:>10.2f} "
+              f"{stats['throughput_per_s']:>12.1f}")
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed a database and run every benchmark")
+    run_parser.add_argument("--users", type=int, default=500)
+    run_parser.add_argument("--days", type=int, default=30)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+    run_parser.add_argument("--login-requests", type=int, default=20, help="Timed logins (bcrypt bound)")
+    run_parser.add_argument("--export-sizes", type=int, nargs="+", default=[1000, 10000])
+    run_parser.add_argument("--export-repeat", type=int, default=3)
+    run_parser.add_argument("--pdf-max-rows", type=int, default=10000, help="Skip PDF above this many rows")
+    run_parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    run_parser.add_argument("--baseline", help="Compare against this report after running")
+    run_parser.add_argument("--metric", default="p50_ms")
+    run_parser.add_argument("--threshold", type=float, default=0.2)
+
+    compare_parser = commands.add_parser("compare", help="Compare a report against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--metric", default="p50_ms", help="Stat to compare, e.g. p50_ms, p95_ms, p99_ms")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        output = os.path.abspath(args.output) if args.output else None
+        baseline = load(args.baseline) if args.baseline else None
+        report = run(args)
+        if output:
+            with open(output, "w") as file:
+                json.dump(report, file, indent=2)
+            print_results(report)
+        else:
+            print(json.dumps(report, indent=2))
+        current = report
+    else:
+        baseline, current = load(args.baseline), load(args.current)
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.metric, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%} on {args.metric}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,40 @@ from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from contextlib import asynccontextmanager
 
-from app.routes import auth_route,user_route, attendance_routes
-from app.core.database import Base, engine
+from app.routes import auth_route,user_route, attendance_routes, system_route, metrics_route
+from app.config.settings import REQUEST_METRICS_ENABLED
+from app.middlewares.request_timing import RequestTimingMiddleware
+from app.utils.json_response import FastJSONResponse
+from app.utils.export_cache import start_export_sweeper, stop_export_sweeper
+from app.core.database import engine
+from app.migrations import run_migrations
+from app.services.export_job_service import shutdown_export_jobs
+from app.services.password_service import shutdown_password_pool
+from app.core.live_feed import start_live_feed, stop_live_feed
 from app.models import user, attendance_session
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup tasks
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    await start_live_feed()
+    start_export_sweeper()
     yield
-    # Shutdown tasks (if needed)
-    # Example: close DB connections, clean up cache, etc.
+    # Shutdown tasks
+    await stop_export_sweeper()
+    shutdown_export_jobs()
+    shutdown_password_pool()
+    await stop_live_feed()
 
 app = FastAPI(
     title="Employee Record Management API",
     description="API for managing employee records and attendance with role-based access.",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
-# Serve static files for download
-app.mount("/exports", StaticFiles(directory="exports"), name="exports")
-
 # Add CORS (optional)
 app.add_middleware(
     CORSMiddleware,
@@ -33,12 +43,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Last-Modified", "Content-Disposition", "Content-Range"],
 )
 
+# Outermost, so the timing covers every other middleware
+if REQUEST_METRICS_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+
 # Include routers
 app.include_router(auth_route.router, prefix="/auth", tags=["Auth"])
 app.include_router(user_route.router, prefix="/user", tags=["User"])
 app.include_router(attendance_routes.router)
+app.include_router(system_route.router, prefix="/system", tags=["System"])
+app.include_router(metrics_route.router)
 
 # Root route
 @app.get("/")
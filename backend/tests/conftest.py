@@ -0,0 +1,101 @@
+"""
+Tests run against a real SQLite database in a temporary directory.
+
+Settings are read when app.config.settings is imported, so the environment is set
+here, before any test module imports the app. The app (and its migrations) start once
+per session; tests share the database and create their own users.
+"""
+import itertools
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="erms-tests-")
+PASSWORD = "Test@1234"
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'app.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Password checks run in a thread instead of a spawned process pool
+os.environ.setdefault("PASSWORD_POOL_SIZE", "0")
+
+_user_numbers = itertools.count(1)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _work_dir():
+    # Exports are written relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(TEST_DIR)
+    yield
+    os.chdir(cwd)
+
+
+@pytest.fixture(scope="session")
+def client(_work_dir):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """Create a user and log in; returns (id, name, email, headers)."""
+    from app.core.database import SessionLocal
+    from app.models.user import User, UserRole
+    from app.utils.hashing import hash_password
+
+    def make(role=UserRole.employee, name=None):
+        number = next(_user_numbers)
+        db = SessionLocal()
+        try:
+            user = User(name=name or f"Employee {number:04d}", email=f"employee{number}@example.com",
+                        hashed_password=hash_password(PASSWORD), role=role)
+            db.add(user)
+            db.commit()
+            user_id, email, name = user.id, user.email, user.name
+        finally:
+            db.close()
+        response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        token = response.json()["data"]["access_token"]
+        return SimpleNamespace(id=user_id, name=name, email=email, headers={"Authorization": f"Bearer {token}"})
+
+    return make
+
+
+@pytest.fixture
+def admin(make_user):
+    from app.models.user import UserRole
+
+    return make_user(UserRole.admin)
+
+
+@pytest.fixture
+def add_session(client):
+    """Insert a session (naive UTC times) dated by its punch-in and refresh that day's summary."""
+    from app.core.database import SessionLocal, engine
+    from app.models.attendance_session import AttendanceSession
+    from app.services.attendance_summary_service import rebuild_daily_summary
+
+    def add(user_id, punch_in, punch_out=None):
+        day = punch_in.date()
+        duration = round((punch_out - punch_in).total_seconds() / 3600, 2) if punch_out else None
+        db = SessionLocal()
+        try:
+            db.add(AttendanceSession(user_id=user_id, date=day, punch_in=punch_in, punch_out=punch_out,
+                                     duration=duration))
+            db.commit()
+        finally:
+            db.close()
+        with engine.begin() as conn:
+            rebuild_daily_summary(conn, day, day)
+
+    return add
@@ -0,0 +1,64 @@
+import csv
+import io
+from datetime import datetime
+
+
+def _csv(response):
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+def test_streamed_csv_covers_the_requested_range(client, make_user, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 4, 1, 3, 30), datetime(2024, 4, 1, 6, 30))
+    add_session(user.id, datetime(2024, 4, 1, 7, 30), datetime(2024, 4, 1, 12, 30))
+    add_session(user.id, datetime(2024, 4, 2, 3, 30))
+    add_session(user.id, datetime(2024, 4, 3, 3, 30), datetime(2024, 4, 3, 4, 30))
+
+    rows = _csv(client.get("/attendance/download/me", headers=user.headers, params={
+        "stream": True, "start_date": "2024-04-01", "end_date": "2024-04-02", "tz": "UTC",
+    }))
+
+    assert [(row["Date"], row["Punch In"], row["Punch Out"], row["Total Hours"]) for row in rows] == [
+        ("2024-04-01", "03:30:00", "06:30:00", "8.0"),
+        ("", "07:30:00", "12:30:00", ""),
+        ("2024-04-02", "03:30:00", "In Progress", "0"),
+    ]
+
+
+def test_streamed_csv_converts_punch_times_to_the_display_timezone(client, make_user, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 4, 8, 3, 30), datetime(2024, 4, 8, 12, 0))
+
+    rows = _csv(client.get("/attendance/download/me", headers=user.headers, params={
+        "stream": True, "start_date": "2024-04-08", "tz": "Asia/Kolkata",
+    }))
+
+    assert (rows[0]["Punch In"], rows[0]["Punch Out"]) == ("09:00:00", "17:30:00")
+
+
+def test_streamed_company_csv_fills_absent_days(client, make_user, admin, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 4, 16, 4, 0), datetime(2024, 4, 16, 8, 0))
+
+    rows = _csv(client.get("/attendance/download/all", headers=admin.headers, params={
+        "stream": True, "start_date": "2024-04-15", "end_date": "2024-04-17", "tz": "UTC",
+    }))
+
+    mine = [(row["Date"], row["Punch In"]) for row in rows if row["Email"] == user.email]
+    assert mine == [("2024-04-15", "Absent"), ("2024-04-16", "04:00:00"), ("2024-04-17", "Absent")]
+
+
+def test_streaming_is_csv_only(client, make_user):
+    user = make_user()
+    response = client.get("/attendance/download/me", headers=user.headers, params={"stream": True, "format": "pdf"})
+    assert response.json()["success"] is False
+
+
+def test_inverted_range_is_rejected(client, make_user):
+    user = make_user()
+    response = client.get("/attendance/download/me", headers=user.headers, params={
+        "stream": True, "start_date": "2024-04-02", "end_date": "2024-04-01",
+    })
+    assert response.json()["message"] == "end_date must be on or after start_date."
@@ -0,0 +1,83 @@
+from datetime import date, datetime, time
+
+from app.services.attendance_report_service import _utc_offsets
+from app.utils.timezones import get_zone
+
+# Monday to Sunday; LATE_ARRIVAL_AFTER is 09:45 Asia/Kolkata (04:15 UTC)
+RANGE = {"start_date": "2024-06-03", "end_date": "2024-06-09"}
+
+
+def _report(client, user, **params):
+    response = client.get("/attendance/report", headers=user.headers, params=dict(RANGE, **params))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _seed(user, add_session):
+    add_session(user.id, datetime(2024, 6, 3, 3, 30), datetime(2024, 6, 3, 12))  # 09:00 IST
+    add_session(user.id, datetime(2024, 6, 4, 4, 30), datetime(2024, 6, 4, 12))  # 10:00 IST, late
+    add_session(user.id, datetime(2024, 6, 5, 3, 30), datetime(2024, 6, 5, 7, 30))
+    add_session(user.id, datetime(2024, 6, 5, 8, 30), datetime(2024, 6, 5, 12, 30))
+    # Thursday and Friday absent; the weekend is not a working day
+
+
+def test_day_rows_aggregate_sessions_late_arrivals_and_absences(client, make_user, add_session):
+    user = make_user()
+    _seed(user, add_session)
+
+    rows = _report(client, user).json()["data"]["rows"]
+
+    assert [row["date"] for row in rows] == [f"2024-06-0{day}" for day in range(3, 10)]
+    monday, tuesday, wednesday, thursday, friday, saturday, _ = rows
+    assert (monday["sessions"], monday["late"], monday["absent"]) == (1, 0, 0)
+    assert tuesday["late"] == 1
+    assert wednesday["sessions"] == 2
+    assert wednesday["worked_hours"] == 8.0
+    # Span from the first punch-in to the last punch-out, like /attendance/me
+    assert wednesday["total_hours"] == 9.0
+    assert (thursday["absent"], friday["absent"], saturday["absent"]) == (1, 1, 0)
+    assert thursday["first_punch_in"] is None
+
+
+def test_user_totals_and_csv(client, make_user, add_session):
+    user = make_user()
+    _seed(user, add_session)
+
+    [totals] = _report(client, user, group_by="user").json()["data"]["rows"]
+    assert totals["user_id"] == user.id
+    assert (totals["days_present"], totals["absences"], totals["late_arrivals"], totals["sessions"]) == (3, 2, 1, 4)
+    assert totals["worked_hours"] == 24.0
+
+    csv = _report(client, user, group_by="user", format="csv")
+    assert csv.headers["content-disposition"].endswith('_2024-06-03_2024-06-09.csv"')
+    header, row = csv.text.strip().splitlines()
+    assert header.split(",")[:3] == ["user_id", "name", "email"]
+    assert row.startswith(f"{user.id},")
+
+
+def test_employees_only_get_their_own_report(client, make_user, admin):
+    user = make_user()
+    rows = _report(client, user, user_id=admin.id).json()["data"]["rows"]
+    assert {row["user_id"] for row in rows} == {user.id}
+
+    rows = _report(client, admin, user_id=user.id).json()["data"]["rows"]
+    assert {row["user_id"] for row in rows} == {user.id}
+
+
+def test_ranges_are_validated(client, make_user):
+    user = make_user()
+
+    inverted = client.get("/attendance/report", headers=user.headers,
+                          params={"start_date": "2024-06-09", "end_date": "2024-06-03"})
+    too_long = client.get("/attendance/report", headers=user.headers,
+                          params={"start_date": "2020-01-01", "end_date": "2024-06-03"})
+
+    assert inverted.json()["success"] is False
+    assert too_long.json()["success"] is False
+
+
+def test_late_thresholds_follow_daylight_saving_changes():
+    # Europe/London moves from UTC+0 to UTC+1 on 2024-03-31
+    runs = _utc_offsets(date(2024, 3, 29), 5, time(9, 45), get_zone("Europe/London"))
+
+    assert runs == [(0, 0), (2, 3600)]
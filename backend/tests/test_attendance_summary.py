@@ -0,0 +1,123 @@
+from datetime import date, datetime
+
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal, engine
+from app.models.attendance_session import AttendanceSession
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+from app.services.attendance_summary_service import rebuild_daily_summary
+from app.utils.timezones import business_date
+
+DAYS = [date(2024, 2, 5), date(2024, 2, 6), date(2024, 2, 7)]
+
+
+def _summary_rows(conn, user_id):
+    return conn.execute(
+        select(DailyAttendanceSummary.date, DailyAttendanceSummary.session_count, DailyAttendanceSummary.worked_hours)
+        .where(DailyAttendanceSummary.user_id == user_id)
+        .order_by(DailyAttendanceSummary.date)
+    ).all()
+
+
+def _summary(user_id, day):
+    with SessionLocal() as db:
+        return db.execute(select(DailyAttendanceSummary.__table__).where(
+            DailyAttendanceSummary.user_id == user_id,
+            DailyAttendanceSummary.date == day
+        )).mappings().one_or_none()
+
+
+def _punch_ins(user_id):
+    with SessionLocal() as db:
+        return db.execute(
+            select(AttendanceSession.punch_in, AttendanceSession.punch_out)
+            .where(AttendanceSession.user_id == user_id)
+            .order_by(AttendanceSession.punch_in)
+        ).all()
+
+
+def test_punches_maintain_the_daily_summary(client, make_user):
+    user = make_user()
+    today = business_date(datetime.utcnow())
+
+    client.post("/attendance/punch-in", headers=user.headers)
+    summary = _summary(user.id, today)
+    assert summary["session_count"] == 1
+    assert summary["has_open_session"]
+    assert summary["last_out"] is None
+
+    client.post("/attendance/punch-out", headers=user.headers)
+    client.post("/attendance/punch-in", headers=user.headers)
+    summary = _summary(user.id, today)
+    assert summary["session_count"] == 2
+    assert summary["has_open_session"]
+    assert summary["first_in"] == _punch_ins(user.id)[0].punch_in
+
+    client.post("/attendance/punch-out", headers=user.headers)
+    summary = _summary(user.id, today)
+    assert not summary["has_open_session"]
+    assert summary["last_out"] == _punch_ins(user.id)[-1].punch_out
+
+
+def test_own_attendance_is_read_from_the_summary(client, make_user, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 2, 12, 4), datetime(2024, 2, 12, 6))
+    add_session(user.id, datetime(2024, 2, 12, 7), datetime(2024, 2, 12, 10, 30))
+    add_session(user.id, datetime(2024, 2, 13, 4))
+    add_session(user.id, datetime(2024, 2, 14, 4), datetime(2024, 2, 14, 5))
+
+    response = client.get("/attendance/me", headers=user.headers,
+                          params={"start_date": "2024-02-12", "end_date": "2024-02-13"})
+
+    days = response.json()["data"]
+    assert [(day["date"], day["total_hours"], day["worked_hours"], len(day["sessions"])) for day in days] == [
+        ("2024-02-13", 0, 0.0, 1),
+        ("2024-02-12", 6.5, 5.5, 2),
+    ]
+    assert days[1]["first_punch_in"] == "2024-02-12T04:00:00"
+    assert days[1]["last_punch_out"] == "2024-02-12T10:30:00"
+    assert [session["punch_in"] for session in days[1]["sessions"]] == ["2024-02-12T04:00:00", "2024-02-12T07:00:00"]
+    month = client.get("/attendance/me", headers=user.headers, params={"month": 2, "year": 2024}).json()["data"]
+    assert [day["date"] for day in month] == ["2024-02-14", "2024-02-13", "2024-02-12"]
+
+    # Days are whatever the summary holds: a stale row shows until it is refreshed
+    with engine.begin() as conn:
+        conn.execute(DailyAttendanceSummary.__table__.update().where(
+            DailyAttendanceSummary.user_id == user.id, DailyAttendanceSummary.date == date(2024, 2, 12)
+        ).values(worked_hours=8.0))
+    response = client.get("/attendance/me", headers=user.headers, params={"start_date": "2024-02-12"})
+    assert response.json()["data"][0]["worked_hours"] == 8.0
+
+
+def test_rebuild_aggregates_sessions_per_day(make_user):
+    user = make_user()
+    with engine.begin() as conn:
+        conn.execute(insert(AttendanceSession), [
+            {"user_id": user.id, "date": DAYS[0], "punch_in": datetime(2024, 2, 5, 4), "punch_out": datetime(2024, 2, 5, 6),
+             "duration": 2.0},
+            {"user_id": user.id, "date": DAYS[0], "punch_in": datetime(2024, 2, 5, 7), "punch_out": datetime(2024, 2, 5, 8),
+             "duration": 1.0},
+            {"user_id": user.id, "date": DAYS[1], "punch_in": datetime(2024, 2, 6, 4), "punch_out": None,
+             "duration": None},
+        ])
+        rebuild_daily_summary(conn, DAYS[0], DAYS[-1])
+        assert _summary_rows(conn, user.id) == [(DAYS[0], 2, 3.0), (DAYS[1], 1, 0.0)]
+
+
+def test_rebuild_drops_rows_whose_sessions_are_gone(make_user):
+    user = make_user()
+    with engine.begin() as conn:
+        conn.execute(insert(AttendanceSession), [
+            {"user_id": user.id, "date": day, "punch_in": datetime.combine(day, datetime.min.time()),
+             "punch_out": datetime.combine(day, datetime.min.time()).replace(hour=1), "duration": 1.0}
+            for day in DAYS
+        ])
+        rebuild_daily_summary(conn, DAYS[0], DAYS[-1])
+        conn.execute(delete(AttendanceSession).where(
+            AttendanceSession.user_id == user.id,
+            AttendanceSession.date != DAYS[1]
+        ))
+
+        rebuild_daily_summary(conn, DAYS[0], DAYS[-1])
+
+        assert _summary_rows(conn, user.id) == [(DAYS[1], 1, 1.0)]
@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import SessionLocal
+from app.services.attendance_service import iter_attendance_export_columns
+from app.utils import file_exporter
+from app.utils.arrow_exporter import export_batches_to_parquet
+
+
+def _download(client, user, export_format, tmp_path, **params):
+    response = client.get("/attendance/download/me", headers=user.headers, params=dict(format=export_format, **params))
+    assert response.json()["success"], response.text
+    download = client.get(response.json()["data"]["file_url"])
+    assert download.status_code == 200
+    path = tmp_path / f"export.{export_format}"
+    path.write_bytes(download.content)
+    return path
+
+
+def _seed(user, add_session):
+    add_session(user.id, datetime(2024, 8, 5, 3, 30), datetime(2024, 8, 5, 6, 0))
+    add_session(user.id, datetime(2024, 8, 5, 7, 0), datetime(2024, 8, 5, 12, 0))
+    add_session(user.id, datetime(2024, 8, 6, 3, 30))
+
+
+def test_parquet_keeps_timestamps_and_hours_typed(client, make_user, add_session, tmp_path):
+    user = make_user()
+    _seed(user, add_session)
+
+    table = pq.read_table(_download(client, user, "parquet", tmp_path,
+                                    start_date="2024-08-05", end_date="2024-08-06"))
+
+    assert table.schema.field("punch_in").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("duration_hours").type == pa.float64()
+    assert table.schema.field("date").type == pa.date32()
+    rows = table.to_pylist()
+    assert [row["date"] for row in rows] == [date(2024, 8, 5), date(2024, 8, 5), date(2024, 8, 6)]
+    assert rows[0]["punch_in"] == datetime(2024, 8, 5, 3, 30, tzinfo=timezone.utc)
+    assert [row["duration_hours"] for row in rows] == [2.5, 5.0, None]
+    assert rows[2]["punch_out"] is None
+
+
+def test_arrow_ipc_matches_the_parquet_schema(client, make_user, add_session, tmp_path):
+    user = make_user()
+    _seed(user, add_session)
+
+    path = _download(client, user, "arrow", tmp_path, start_date="2024-08-05", end_date="2024-08-06")
+    with pa.ipc.open_file(path) as reader:
+        table = reader.read_all()
+
+    assert table.column_names == file_exporter.EXPORT_COLUMNS
+    assert table.num_rows == 3
+
+
+def test_batches_become_row_groups(client, make_user, add_session, tmp_path):
+    user = make_user()
+    _seed(user, add_session)
+
+    with SessionLocal() as db:
+        batches = iter_attendance_export_columns(db, user.id, date(2024, 8, 5), date(2024, 8, 6), batch_size=2)
+        path = export_batches_to_parquet(batches, tmp_path / "batched.parquet")
+
+    metadata = pq.ParquetFile(path).metadata
+    assert (metadata.num_rows, metadata.num_row_groups) == (3, 2)
+
+
+def test_missing_optional_package_is_a_400(monkeypatch):
+    monkeypatch.setattr(file_exporter.importlib.util, "find_spec", lambda name: None)
+
+    with pytest.raises(HTTPException) as error:
+        file_exporter.check_export_format("parquet")
+    assert error.value.status_code == 400
+    assert "pyarrow" in error.value.detail
+    file_exporter.check_export_format("csv")
@@ -0,0 +1,70 @@
+from datetime import date, datetime
+
+from app.utils.attendance_view_cache import LocalViewCache, make_view
+from app.utils.timezones import business_date
+
+
+def _today():
+    return business_date(datetime.utcnow()).isoformat()
+
+
+def _day(response, user):
+    return next(row for row in response.json()["data"] if row["user_id"] == user.id)
+
+
+def test_unchanged_view_revalidates_with_a_304(client, admin):
+    first = client.get("/attendance/", headers=admin.headers, params={"selected_date": "2024-02-05"})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    again = client.get("/attendance/", headers=dict(admin.headers, **{"If-None-Match": etag}),
+                       params={"selected_date": "2024-02-05"})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    other = client.get("/attendance/", headers=dict(admin.headers, **{"If-None-Match": '"stale"'}),
+                       params={"selected_date": "2024-02-05"})
+    assert other.status_code == 200
+
+
+def test_a_punch_invalidates_todays_view(client, make_user, admin):
+    user = make_user()
+    # Default date is today's business day
+    before = client.get("/attendance/", headers=admin.headers)
+    assert _day(before, user)["sessions"] == []
+
+    client.post("/attendance/punch-in", headers=user.headers)
+
+    after = client.get("/attendance/", headers=dict(admin.headers, **{"If-None-Match": before.headers["ETag"]}),
+                       params={"selected_date": _today()})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert len(_day(after, user)["sessions"]) == 1
+
+
+def test_a_view_computed_across_an_invalidation_is_not_stored():
+    cache = LocalViewCache(max_size=2)
+    day = date(2024, 2, 5)
+
+    generation = cache.generation(day)
+    cache.invalidate(day)  # A punch commits while the view is being computed
+    cache.set(day, make_view(b"{}"), ttl=0, generation=generation)
+    assert cache.get(day) is None
+
+    cache.set(day, make_view(b"{}"), ttl=0, generation=cache.generation(day))
+    assert cache.get(day).body == b"{}"
+
+
+def test_dropped_generations_still_reject_older_views():
+    cache = LocalViewCache(max_size=1)
+    first, second = date(2024, 2, 5), date(2024, 2, 6)
+
+    generation = cache.generation(first)
+    cache.invalidate(first)
+    cache.invalidate(second)  # Evicts first's generation
+
+    cache.set(first, make_view(b"{}"), ttl=0, generation=generation)
+    assert cache.get(first) is None
+    assert cache.size() == 0
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import HTTPException
+from openpyxl import load_workbook
+from openpyxl.cell.cell import MergedCell
+
+from app.utils.excel_exporter import export_to_excel
+from app.utils.file_exporter import CSV_HEADERS
+
+
+def _row(date, name, punch_in, punch_out, duration, total, first=True):
+    values = [date, name, f"{name.lower()}@example.com", punch_in, punch_out, duration, total]
+    if not first:
+        values = ["", "", "", punch_in, punch_out, duration, ""]
+    return dict(zip(CSV_HEADERS, values), is_first_entry=first)
+
+
+ROWS = [
+    _row("2024-06-03", "Asha", "09:00:00", "12:00:00", 3.0, 7.5),
+    _row("", "", "13:00:00", "17:30:00", 4.5, "", first=False),
+    _row("2024-06-03", "Ravi", "10:00:00", "In Progress", 0, 0),
+]
+
+
+def test_rows_are_written_under_the_header(tmp_path):
+    path = export_to_excel(ROWS, tmp_path / "report.xlsx")
+
+    sheet = load_workbook(path)["Attendance Report"]
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0] == CSV_HEADERS
+    assert values[1] == ["2024-06-03", "Asha", "asha@example.com", "09:00:00", "12:00:00", 3, 7.5]
+    assert values[2][3:6] == ["13:00:00", "17:30:00", 4.5]
+    assert values[3][:2] == ["2024-06-03", "Ravi"]
+
+
+def test_extra_sessions_merge_the_per_day_columns(tmp_path):
+    sheet = load_workbook(export_to_excel(ROWS, tmp_path / "report.xlsx"))["Attendance Report"]
+
+    assert {str(cell_range) for cell_range in sheet.merged_cells.ranges} == {"A2:A3", "B2:B3", "C2:C3", "G2:G3"}
+
+
+def test_cells_use_the_shared_named_styles(tmp_path):
+    workbook = load_workbook(export_to_excel(ROWS, tmp_path / "report.xlsx"))
+    sheet = workbook["Attendance Report"]
+
+    assert {"attendance_header", "attendance_cell"} <= set(workbook.style_names)
+    assert {cell.style for cell in sheet[1]} == {"attendance_header"}
+    assert {cell.style for row in sheet.iter_rows(min_row=2) for cell in row
+            if not isinstance(cell, MergedCell)} == {"attendance_cell"}
+    assert sheet["A1"].font.bold
+    assert sheet.column_dimensions["C"].width == len("asha@example.com") + 2
+
+
+def test_empty_export_is_refused(tmp_path):
+    with pytest.raises(HTTPException) as error:
+        export_to_excel([], tmp_path / "report.xlsx")
+    assert error.value.status_code == 404
+
+
+def test_rows_are_streamed_past_the_width_sample(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.utils.excel_exporter.EXCEL_WIDTH_SAMPLE_ROWS", 1)
+
+    # A generator can only be read once, so nothing may collect it before writing
+    sheet = load_workbook(export_to_excel((row for row in ROWS), tmp_path / "report.xlsx"))["Attendance Report"]
+
+    assert sheet.max_row == len(ROWS) + 1
+    # The day's merge spans the sample boundary
+    assert {str(cell_range) for cell_range in sheet.merged_cells.ranges} == {"A2:A3", "B2:B3", "C2:C3", "G2:G3"}
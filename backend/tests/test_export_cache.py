@@ -0,0 +1,84 @@
+import os
+import time
+from datetime import date, datetime
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.services.attendance_service import render_attendance_export
+from app.utils import export_cache
+
+HOUR = 3600
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_cache, "EXPORT_DIR", tmp_path)
+    monkeypatch.setattr(export_cache, "EXPORT_CACHE_TTL_SECONDS", 24 * HOUR)
+    monkeypatch.setattr(export_cache, "EXPORT_CACHE_LEASE_SECONDS", HOUR)
+    return tmp_path
+
+
+def _file(directory, name, size, used_hours_ago, now):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    used = now - used_hours_ago * HOUR
+    os.utime(path, (used, used))
+    return path
+
+
+def _render(user_id):
+    with SessionLocal() as db:
+        return render_attendance_export(db, user_id, "csv", date(2024, 9, 2), date(2024, 9, 3), display_tz="UTC")
+
+
+def test_unchanged_exports_reuse_the_rendered_file(client, make_user, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 9, 2, 4), datetime(2024, 9, 2, 12))
+
+    first = _render(user.id)
+    mtime = os.stat(export_cache.EXPORT_DIR / first).st_mtime
+    assert _render(user.id) == first
+    assert os.stat(export_cache.EXPORT_DIR / first).st_mtime == mtime
+
+    # A punch inside the range changes the data version and with it the name
+    add_session(user.id, datetime(2024, 9, 3, 4), datetime(2024, 9, 3, 12))
+    assert _render(user.id) != first
+
+
+def test_failed_renders_leave_no_file(export_dir):
+    target = export_dir / "report.csv"
+
+    with pytest.raises(RuntimeError), export_cache.publishing(target) as temp:
+        temp.write_text("partial")
+        raise RuntimeError("writer failed")
+
+    assert list(export_dir.iterdir()) == []
+
+
+def test_sweep_expires_old_files_and_evicts_the_least_recently_used(export_dir, monkeypatch):
+    monkeypatch.setattr(export_cache, "MAX_BYTES", 250)
+    now = time.time()
+    expired = _file(export_dir, "expired.csv", 10, 48, now)
+    oldest = _file(export_dir, "oldest.csv", 100, 5, now)
+    older = _file(export_dir, "older.csv", 100, 3, now)
+    recent = _file(export_dir, "recent.csv", 100, 2, now)
+    leased = _file(export_dir, "leased.csv", 100, 0, now)
+    writing = _file(export_dir, export_cache.TEMP_PREFIX + "abc-report.csv", 100, 2, now)
+
+    export_cache.sweep_exports(now)
+
+    # 400 bytes (the leased file counts) against a 250 byte cap: the two least recently used go;
+    # the leased file and the one still being written are never evicted
+    assert not expired.exists() and not oldest.exists() and not older.exists()
+    assert recent.exists() and leased.exists() and writing.exists()
+
+
+def test_only_rendered_files_can_be_found(export_dir):
+    (export_dir / "report.csv").write_text("done")
+    (export_dir / (export_cache.TEMP_PREFIX + "x-report.csv")).write_text("partial")
+
+    assert export_cache.find_export("report.csv") == export_dir / "report.csv"
+    assert export_cache.find_export(export_cache.TEMP_PREFIX + "x-report.csv") is None
+    assert export_cache.find_export("../report.csv") is None
+    assert export_cache.find_export("missing.csv") is None
@@ -0,0 +1,130 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from app.services import export_job_service
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _shutdown_pool():
+    yield
+    export_job_service.shutdown_export_jobs()
+
+
+def _create(client, user, **body):
+    response = client.post("/attendance/export-jobs", headers=user.headers, json=dict(format="csv", timezone="UTC",
+                                                                                        **body))
+    assert response.json()["success"], response.text
+    return response.json()["data"]
+
+
+def _wait(client, user, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/attendance/export-jobs/{job_id}", headers=user.headers).json()["data"]
+        if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.1)
+
+
+def test_job_renders_in_the_pool_and_reports_its_rows(client, make_user, add_session):
+    user = make_user()
+    for day in (1, 2, 3):
+        add_session(user.id, datetime(2024, 5, day, 4), datetime(2024, 5, day, 12))
+
+    job = _wait(client, user, _create(client, user, start_date="2024-05-01", end_date="2024-05-03")["job_id"])
+
+    assert job["status"] == "completed", job
+    assert job["rows_written"] == 3
+    download = client.get(job["file_url"])
+    assert download.status_code == 200
+    assert download.text.count("2024-05-0") == 3
+
+
+def test_job_served_from_the_export_cache_reports_the_cached_rows(client, make_user, add_session):
+    user = make_user()
+    add_session(user.id, datetime(2024, 5, 6, 4), datetime(2024, 5, 6, 8))
+    add_session(user.id, datetime(2024, 5, 6, 9), datetime(2024, 5, 6, 12))
+    first = _wait(client, user, _create(client, user, start_date="2024-05-06")["job_id"])
+
+    again = _wait(client, user, _create(client, user, start_date="2024-05-06")["job_id"])
+
+    assert again["job_id"] != first["job_id"]
+    assert again["file_url"] == first["file_url"]
+    assert again["rows_written"] == first["rows_written"] == 2
+
+
+def test_failed_job_leaves_the_pool_usable(client, make_user, add_session):
+    user = make_user()
+
+    empty = _wait(client, user, _create(client, user, start_date="2024-05-13")["job_id"])
+    assert empty["status"] == "failed"
+    assert empty["error"] == "No attendance records found for selected date."
+
+    add_session(user.id, datetime(2024, 5, 14, 4), datetime(2024, 5, 14, 8))
+    assert _wait(client, user, _create(client, user, start_date="2024-05-14")["job_id"])["status"] == "completed"
+
+
+def test_jobs_are_visible_only_to_their_requesters(client, make_user):
+    owner, other = make_user(), make_user()
+    job = _create(client, owner, start_date="2024-05-20")
+
+    response = client.get(f"/attendance/export-jobs/{job['job_id']}", headers=other.headers)
+
+    assert response.status_code == 404
+    _wait(client, owner, job["job_id"])
+
+
+def test_company_wide_jobs_are_admin_only(client, make_user, admin):
+    employee = make_user()
+
+    response = client.post("/attendance/export-jobs", headers=employee.headers,
+                           json={"format": "csv", "start_date": "2024-05-21", "scope": "all"})
+
+    assert response.json()["status_code"] == 403
+    _wait(client, admin, _create(client, admin, start_date="2024-05-21", scope="all")["job_id"])
+
+
+def test_cached_row_count_matches_the_company_export(make_user, add_session):
+    from app.core.database import SessionLocal
+    from app.services.attendance_service import _export_row_count, iter_attendance_export_columns
+
+    user = make_user()
+    add_session(user.id, datetime(2024, 5, 27, 4), datetime(2024, 5, 27, 8))
+    add_session(user.id, datetime(2024, 5, 27, 9), datetime(2024, 5, 27, 12))
+    with SessionLocal() as db:
+        start, end = datetime(2024, 5, 26).date(), datetime(2024, 5, 28).date()
+        rendered = sum(len(batch["user_id"]) for batch in iter_attendance_export_columns(db, user.id, start, end, True))
+        assert _export_row_count(db, user.id, start, end, export_all=True) == rendered
+
+
+def test_export_version_follows_session_and_user_changes(make_user, add_session):
+    from datetime import date
+
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.services.attendance_service import _export_data_version
+
+    user = make_user()
+    add_session(user.id, datetime(2024, 7, 1, 4), datetime(2024, 7, 1, 12))
+    day = date(2024, 7, 1)
+
+    db = SessionLocal()
+    try:
+        before = _export_data_version(db, user.id, day, day)
+        assert _export_data_version(db, user.id, day, day) == before
+
+        db.get(User, user.id).name = "Renamed Employee"
+        db.commit()
+        renamed = _export_data_version(db, user.id, day, day)
+        assert renamed != before
+    finally:
+        db.close()
+
+    add_session(user.id, datetime(2024, 7, 1, 13), datetime(2024, 7, 1, 14))
+    db = SessionLocal()
+    try:
+        assert _export_data_version(db, user.id, day, day) != renamed
+    finally:
+        db.close()
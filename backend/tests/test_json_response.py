@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from app.models.user import UserRole
+from app.schemas.attendance_session import DAILY_ATTENDANCE_RESPONSE
+from app.utils import json_response
+from app.utils.response import success_response
+
+
+class _Point(BaseModel):
+    x: int
+
+
+CONTENT = {
+    "when": datetime(2024, 5, 1, 9, 30, 15),
+    "day": date(2024, 5, 1),
+    "role": UserRole.admin,
+    "hours": Decimal("7.50"),
+    "tags": {"a"},
+    "point": _Point(x=1),
+    1: "numeric key",
+}
+EXPECTED = {
+    "when": "2024-05-01T09:30:15",
+    "day": "2024-05-01",
+    "role": "admin",
+    "hours": 7.5,
+    "tags": ["a"],
+    "point": {"x": 1},
+    "1": "numeric key",
+}
+
+
+def test_orjson_encodes_the_types_responses_carry():
+    assert json_response.orjson is not None
+    assert json.loads(json_response.dumps(CONTENT)) == EXPECTED
+
+
+def test_standard_library_fallback_encodes_the_same(monkeypatch):
+    monkeypatch.setattr(json_response, "orjson", None)
+
+    assert json.loads(json_response.dumps(CONTENT)) == EXPECTED
+
+
+def test_typed_rows_serialize_like_the_generic_encoder():
+    row = {"user_id": 1, "name": "Asha", "email": "asha@example.com", "date": date(2024, 5, 1),
+           "first_punch_in": datetime(2024, 5, 1, 4), "last_punch_out": None, "total_duration": 2.5,
+           "sessions": [{"punch_in": datetime(2024, 5, 1, 4), "punch_out": None, "duration": None}]}
+    content = success_response("Users attendance fetched successfully", [row])
+
+    assert json.loads(DAILY_ATTENDANCE_RESPONSE.dump_json(content)) == json.loads(json_response.dumps(content))
+
+
+def test_routes_render_through_the_fast_response_class(client, make_user, admin):
+    user = make_user()
+
+    me = client.get("/auth/me", headers=user.headers)
+    users = client.get("/user/", headers=admin.headers, params={"search": user.email})
+
+    assert me.headers["content-type"] == "application/json"
+    assert me.json()["success"]
+    listed = next(row for row in users.json()["data"]["users"] if row["id"] == user.id)
+    assert listed == {"id": user.id, "name": user.name, "email": user.email, "role": "employee"}
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+HEAVY_PACKAGES = ["pandas", "numpy", "openpyxl", "fpdf", "pyarrow"]
+
+PROBE = """
+import json, os, sys
+import {module}
+loaded = lambda: sorted(name for name in {heavy} if name in sys.modules)
+before = loaded()
+{after}
+print(json.dumps({{"before": before, "after": loaded(), "exports": os.path.exists("exports")}}))
+"""
+
+
+def _probe(tmp_path, module, after="pass"):
+    env = dict(os.environ, PYTHONPATH=str(BACKEND), DATABASE_URL=f"sqlite:///{tmp_path / 'probe.db'}")
+    code = PROBE.format(module=module, heavy=HEAVY_PACKAGES, after=after)
+    # A fresh interpreter: the test session has long since imported everything
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_importing_the_attendance_routes_loads_no_export_library(tmp_path):
+    result = _probe(tmp_path, "app.routes.attendance_routes")
+
+    assert result["before"] == []
+    # Creating exports/ is no longer an import side effect
+    assert result["exports"] is False
+
+
+def test_a_format_loads_its_writer_on_first_use(tmp_path):
+    result = _probe(tmp_path, "app.utils.file_exporter",
+                    after="app.utils.file_exporter.get_exporter('excel')")
+
+    assert result["before"] == []
+    assert "openpyxl" in result["after"]
+    assert "fpdf" not in result["after"] and "pyarrow" not in result["after"]
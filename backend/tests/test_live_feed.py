@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from app.core import live_feed
+from app.core.live_feed import RESYNC, LiveEvent, RedisBroker, Subscription
+
+
+def _event(kind, user_id):
+    return LiveEvent.from_payload({"type": kind, "user_id": user_id})
+
+
+def _kinds(batch):
+    return [(event.type, event.user_id) for event in batch]
+
+
+def _batch(subscription):
+    return asyncio.run(subscription.next_batch(0.01))
+
+
+def test_every_delta_is_kept_in_publish_order():
+    subscription = Subscription(limit=10)
+    for event in (_event("punch_in", 1), _event("punch_in", 2), _event("punch_out", 1), _event("punch_in", 1)):
+        subscription.offer(event)
+
+    assert _kinds(_batch(subscription)) == [("punch_in", 1), ("punch_in", 2), ("punch_out", 1), ("punch_in", 1)]
+    assert _batch(subscription) == []
+
+
+def test_overflow_replaces_the_backlog_with_one_resync():
+    subscription = Subscription(limit=3)
+    for user_id in range(1, 6):
+        subscription.offer(_event("punch_in", user_id))
+
+    # The fourth event overflowed the buffer; the fifth arrived before the resync was taken
+    assert _kinds(_batch(subscription)) == [(RESYNC, None)]
+    assert subscription.dropped == 5
+    assert subscription.resyncs == 1
+
+    subscription.offer(_event("punch_out", 1))
+    assert _kinds(_batch(subscription)) == [("punch_out", 1)]
+
+
+def test_employee_subscriptions_only_see_their_own_events_and_resyncs():
+    subscription = Subscription(user_id=2, limit=10)
+    subscription.offer(_event("punch_in", 1))
+    subscription.offer(_event("punch_in", 2))
+    assert _kinds(_batch(subscription)) == [("punch_in", 2)]
+
+    subscription.offer(live_feed.RESYNC_EVENT)
+    assert _kinds(_batch(subscription)) == [(RESYNC, None)]
+
+
+class _BrokenConnection(Exception):
+    pass
+
+
+class _FakePubSub:
+    def __init__(self, messages, fail):
+        self._messages = messages
+        self._fail = fail
+        self.closed = False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        for message in self._messages:
+            yield {"data": message}
+        if self._fail:
+            raise _BrokenConnection()
+        await asyncio.Event().wait()  # Connected, idle
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _FakeRedis:
+    def __init__(self, *pubsubs):
+        self._pubsubs = list(pubsubs)
+        self.created = []
+
+    def pubsub(self, ignore_subscribe_messages):
+        self.created.append(self._pubsubs.pop(0))
+        return self.created[-1]
+
+
+def test_redis_listener_resubscribes_and_resyncs_after_a_dropped_connection(monkeypatch):
+    monkeypatch.setattr(live_feed, "RECONNECT_DELAY_SECONDS", 0)
+    message = json.dumps({"type": "punch_in", "user_id": 7}).encode()
+    first = _FakePubSub([message, b"not json"], fail=True)
+    second = _FakePubSub([message], fail=False)
+    broker = RedisBroker.__new__(RedisBroker)
+    broker._redis = _FakeRedis(first, second)
+    delivered = []
+
+    async def run():
+        await broker.start(delivered.append)
+        for _ in range(100):
+            if len(delivered) == 3:
+                break
+            await asyncio.sleep(0)
+        broker._listener.cancel()
+
+    asyncio.run(run())
+
+    assert _kinds(delivered) == [("punch_in", 7), (RESYNC, None), ("punch_in", 7)]
+    assert first.closed and second.closed
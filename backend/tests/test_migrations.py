@@ -0,0 +1,215 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.cli.rebuild_attendance_summary import rebuild_in_batches
+from app.core.database import Base
+from app.migrations import load_migrations, run_migrations, schema_migrations
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+
+# The schema main.py's create_all produced before versioned migrations existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        hashed_password VARCHAR(255) NOT NULL,
+        role VARCHAR(11) NOT NULL,
+        access_token VARCHAR(255)
+    )""",
+    "CREATE INDEX ix_users_id ON users (id)",
+    """CREATE TABLE attendance_sessions (
+        id INTEGER NOT NULL PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users (id),
+        date DATE NOT NULL,
+        punch_in DATETIME NOT NULL,
+        punch_out DATETIME,
+        duration FLOAT,
+        created_at DATETIME,
+        updated_at DATETIME
+    )""",
+    "CREATE INDEX ix_attendance_sessions_id ON attendance_sessions (id)",
+]
+
+# device_punch_events as v003 created it, with event_id unique across all devices
+DEVICE_EVENTS_V003 = """CREATE TABLE device_punch_events (
+    id INTEGER NOT NULL PRIMARY KEY,
+    event_id VARCHAR(100) NOT NULL UNIQUE,
+    device_id VARCHAR(100),
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    timestamp DATETIME NOT NULL,
+    direction VARCHAR(3) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    reason VARCHAR(255),
+    created_at DATETIME
+)"""
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make(name):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+def _generated_columns(engine):
+    """PRAGMA table_xinfo marks generated columns hidden=2 (VIRTUAL) or 3 (STORED)."""
+    with engine.connect() as conn:
+        columns = conn.execute(text("PRAGMA table_xinfo(attendance_sessions)")).mappings().all()
+    return {column["name"]: column["hidden"] for column in columns if column["hidden"]}
+
+
+def test_upgrade_from_baseline(make_engine):
+    engine = make_engine("baseline.db")
+    day = date(2025, 1, 6)
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO users (id, name, email, hashed_password, role) "
+            "VALUES (1, 'Asha', 'asha@example.com', 'x', 'employee')"
+        ))
+        # Two sessions left open on the same day: the later one must survive the unique index
+        conn.execute(text(
+            "INSERT INTO attendance_sessions (user_id, date, punch_in, punch_out, duration) VALUES "
+            "(1, :day, '2025-01-06 04:00:00.000000', '2025-01-06 06:00:00.000000', 2.0), "
+            "(1, :day, '2025-01-06 07:00:00.000000', NULL, NULL), "
+            "(1, :day, '2025-01-06 08:00:00.000000', NULL, NULL)"
+        ), {"day": day.isoformat()})
+
+    run_migrations(engine)
+    # Startup leaves the history backfill to the one-off command
+    assert rebuild_in_batches(engine, window_days=1) == 1
+
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+        open_sessions = conn.execute(text(
+            "SELECT punch_in FROM attendance_sessions WHERE punch_out IS NULL"
+        )).scalars().all()
+        summary = conn.execute(select(DailyAttendanceSummary.__table__)).mappings().one()
+    assert applied == {migration.VERSION for migration in load_migrations()}
+    assert open_sessions == ["2025-01-06 08:00:00.000000"]
+    assert summary["session_count"] == 3
+    assert summary["worked_hours"] == 2.0
+    assert summary["has_open_session"]
+
+    inspector = inspect(engine)
+    session_indexes = {index["name"] for index in inspector.get_indexes("attendance_sessions")}
+    model_indexes = {index.name for index in Base.metadata.tables["attendance_sessions"].indexes}
+    assert model_indexes <= session_indexes
+    assert set(Base.metadata.tables) <= set(inspector.get_table_names())
+    assert "updated_at" in {column["name"] for column in inspector.get_columns("users")}
+
+
+def test_upgrade_is_idempotent(make_engine):
+    engine = make_engine("fresh.db")
+    run_migrations(engine)
+    run_migrations(engine)
+    with engine.connect() as conn:
+        assert conn.execute(select(schema_migrations.c.version)).scalars().all() == sorted(
+            migration.VERSION for migration in load_migrations()
+        )
+
+
+def test_fresh_and_migrated_schemas_agree(make_engine):
+    fresh = make_engine("fresh.db")
+    run_migrations(fresh)
+
+    migrated = make_engine("migrated.db")
+    with migrated.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+    run_migrations(migrated)
+
+    assert _generated_columns(fresh) == _generated_columns(migrated) == {"open_user_id": 2}
+    for table in ("attendance_sessions", "users"):
+        assert ({index["name"] for index in inspect(fresh).get_indexes(table)}
+                == {index["name"] for index in inspect(migrated).get_indexes(table)})
+
+
+def test_migrations_do_not_run_without_the_lock():
+    lock_conn = MagicMock()
+    lock_conn.execute.return_value.scalar.return_value = 0  # GET_LOCK timed out
+    engine = MagicMock(dialect=SimpleNamespace(name="mysql"))
+    engine.connect.return_value.__enter__.return_value = lock_conn
+
+    with pytest.raises(RuntimeError, match="another process is still migrating"):
+        run_migrations(engine)
+
+    assert lock_conn.execute.call_count == 1
+    engine.begin.assert_not_called()
+
+
+def test_device_event_ids_become_unique_per_device(make_engine):
+    engine = make_engine("devices.db")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA + [DEVICE_EVENTS_V003]:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO users (id, name, email, hashed_password, role) "
+            "VALUES (1, 'Asha', 'asha@example.com', 'x', 'employee')"
+        ))
+        conn.execute(text(
+            "INSERT INTO device_punch_events (event_id, device_id, user_id, timestamp, direction, status) "
+            "VALUES ('42', 'gate-1', 1, '2025-01-06 04:00:00', 'in', 'accepted')"
+        ))
+
+    run_migrations(engine)
+
+    insert_event = text(
+        "INSERT INTO device_punch_events (event_id, device_id, user_id, timestamp, direction, status) "
+        "VALUES ('42', :device, 1, '2025-01-06 12:00:00', 'out', 'accepted')"
+    )
+    with engine.begin() as conn:
+        conn.execute(insert_event, {"device": "gate-2"})
+        assert conn.execute(text("SELECT count(*) FROM device_punch_events")).scalar() == 2
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(insert_event, {"device": "gate-1"})
+
+    fresh = make_engine("fresh.db")
+    run_migrations(fresh)
+    assert ({index["name"] for index in inspect(fresh).get_indexes("device_punch_events")}
+            == {index["name"] for index in inspect(engine).get_indexes("device_punch_events")})
+    assert inspect(engine).get_unique_constraints("device_punch_events") == []
+
+
+def test_sessions_left_open_on_earlier_days_block_a_second_open_session(make_engine):
+    engine = make_engine("open.db")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO users (id, name, email, hashed_password, role) "
+            "VALUES (1, 'Asha', 'asha@example.com', 'x', 'employee')"
+        ))
+        # Left open yesterday, then punched in again today
+        conn.execute(text(
+            "INSERT INTO attendance_sessions (user_id, date, punch_in, punch_out, duration) VALUES "
+            "(1, '2025-01-05', '2025-01-05 04:00:00.000000', NULL, NULL), "
+            "(1, '2025-01-06', '2025-01-06 04:00:00.000000', NULL, NULL)"
+        ))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        sessions = conn.execute(text(
+            "SELECT date, punch_out, duration FROM attendance_sessions ORDER BY punch_in"
+        )).all()
+    assert sessions == [("2025-01-05", "2025-01-05 04:00:00.000000", 0), ("2025-01-06", None, None)]
+
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO attendance_sessions (user_id, date, punch_in) "
+            "VALUES (1, '2025-01-07', '2025-01-07 04:00:00.000000')"
+        ))
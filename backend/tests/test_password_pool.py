@@ -0,0 +1,50 @@
+import asyncio
+import os
+import signal
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import password_service
+from app.utils.hashing import hash_password
+
+HASH = hash_password("Test@1234")
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(password_service, "PASSWORD_POOL_SIZE", 1)
+    password_service.shutdown_password_pool()
+    yield
+    password_service.shutdown_password_pool()
+
+
+def _verify(password):
+    return asyncio.run(password_service.verify_password_async(password, HASH))
+
+
+def test_checks_run_in_the_process_pool(process_pool):
+    assert _verify("Test@1234") == (True, None)
+    assert _verify("wrong")[0] is False
+    assert password_service._executor is not None
+
+
+def test_pool_is_replaced_after_a_worker_dies(process_pool):
+    _verify("Test@1234")
+    broken = password_service._executor
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    assert _verify("Test@1234") == (True, None)
+    assert password_service._executor is not broken
+    assert _verify("Test@1234") == (True, None)
+
+
+def test_admission_is_bounded(monkeypatch):
+    monkeypatch.setattr(password_service, "PASSWORD_QUEUE_DEPTH", 0)
+
+    with pytest.raises(HTTPException) as error:
+        _verify("Test@1234")
+
+    assert error.value.status_code == 503
+    assert password_service.password_pool_stats()["in_flight"] == 0
@@ -0,0 +1,27 @@
+import re
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.file_exporter import CSV_HEADERS
+from app.utils.pdf_exporter import export_to_pdf
+
+
+def _row(number):
+    values = ["2024-06-03", f"Employee {number}", f"employee{number}@example.com", "09:00:00", "17:00:00", 8.0, 8.0]
+    return dict(zip(CSV_HEADERS, values), is_first_entry=True)
+
+
+def test_rows_are_drawn_from_a_generator(tmp_path):
+    path = export_to_pdf((_row(number) for number in range(60)), tmp_path / "report.pdf")
+
+    content = path.read_bytes()
+    assert content.startswith(b"%PDF")
+    # Sixty rows do not fit on one landscape page
+    assert len(re.findall(rb"/Type\s*/Page\b", content)) >= 2
+
+
+def test_empty_export_is_refused(tmp_path):
+    with pytest.raises(HTTPException) as error:
+        export_to_pdf(iter(()), tmp_path / "report.pdf")
+    assert error.value.status_code == 404
@@ -0,0 +1,164 @@
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.attendance_session import AttendanceSession
+from app.models.daily_attendance_summary import DailyAttendanceSummary
+from app.models.device_punch_event import DevicePunchEvent
+
+DAY = date(2024, 3, 4)
+
+
+def _event(event_id, user, direction, hour, minute=0):
+    return {"event_id": event_id, "device_id": "gate-1", "user_id": user.id,
+            "timestamp": f"2024-03-04T{hour:02d}:{minute:02d}:00Z", "direction": direction}
+
+
+def _upload(client, admin, *events):
+    response = client.post("/attendance/punches/bulk", json={"events": list(events)}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def _sessions(user):
+    with SessionLocal() as db:
+        return db.execute(
+            select(AttendanceSession.punch_in, AttendanceSession.punch_out, AttendanceSession.duration)
+            .where(AttendanceSession.user_id == user.id)
+            .order_by(AttendanceSession.punch_in)
+        ).all()
+
+
+def _statuses(result):
+    return {row["event_id"]: row["status"] for row in result["results"]}
+
+
+def test_events_are_paired_in_timestamp_order_within_a_batch(client, make_user, admin):
+    user = make_user()
+    result = _upload(client, admin,
+                     _event(f"{user.id}-out-2", user, "out", 17),
+                     _event(f"{user.id}-in-2", user, "in", 13),
+                     _event(f"{user.id}-out-1", user, "out", 12),
+                     _event(f"{user.id}-in-1", user, "in", 9))
+
+    assert result["accepted"] == 4
+    assert _sessions(user) == [
+        (datetime(2024, 3, 4, 9), datetime(2024, 3, 4, 12), 3.0),
+        (datetime(2024, 3, 4, 13), datetime(2024, 3, 4, 17), 4.0),
+    ]
+    with SessionLocal() as db:
+        summary = db.execute(select(DailyAttendanceSummary.session_count, DailyAttendanceSummary.worked_hours).where(
+            DailyAttendanceSummary.user_id == user.id, DailyAttendanceSummary.date == DAY
+        )).one()
+    assert tuple(summary) == (2, 7.0)
+
+
+def test_replayed_upload_is_reported_as_duplicates(client, make_user, admin):
+    user = make_user()
+    events = [_event(f"{user.id}-in", user, "in", 9), _event(f"{user.id}-out", user, "out", 17)]
+    _upload(client, admin, *events)
+
+    replay = _upload(client, admin, *events)
+
+    assert replay["duplicates"] == 2
+    assert set(_statuses(replay).values()) == {"duplicate"}
+    assert len(_sessions(user)) == 1
+
+
+def test_rejected_event_is_applied_once_its_predecessor_arrives(client, make_user, admin):
+    user = make_user()
+    punch_out = _event(f"{user.id}-out", user, "out", 17)
+
+    early = _upload(client, admin, punch_out)
+    assert _statuses(early) == {punch_out["event_id"]: "rejected"}
+    assert _sessions(user) == []
+
+    # The device resends its buffer once the punch-in reaches it
+    later = _upload(client, admin, _event(f"{user.id}-in", user, "in", 9), punch_out)
+
+    assert set(_statuses(later).values()) == {"accepted"}
+    assert _sessions(user) == [(datetime(2024, 3, 4, 9), datetime(2024, 3, 4, 17), 8.0)]
+    with SessionLocal() as db:
+        stored = db.execute(select(DevicePunchEvent.status).where(
+            DevicePunchEvent.event_id == punch_out["event_id"]
+        )).scalars().all()
+    assert stored == ["accepted"]
+
+    assert _statuses(_upload(client, admin, punch_out)) == {punch_out["event_id"]: "duplicate"}
+
+
+def test_only_admins_can_upload(client, make_user):
+    user = make_user()
+    response = client.post("/attendance/punches/bulk", json={"events": [_event(f"{user.id}-in", user, "in", 9)]},
+                           headers=user.headers)
+    assert response.json()["status_code"] == 403
+    assert _sessions(user) == []
+
+
+def test_event_ids_are_unique_per_device(client, make_user, admin):
+    user = make_user()
+    punch_in = _event(f"{user.id}-1", user, "in", 9)
+    punch_out = dict(_event(f"{user.id}-1", user, "out", 17), device_id="gate-2")
+
+    result = _upload(client, admin, punch_in, punch_out)
+
+    assert [(row["device_id"], row["status"]) for row in result["results"]] == [
+        ("gate-1", "accepted"), ("gate-2", "accepted")
+    ]
+    assert len(_sessions(user)) == 1
+
+
+def test_sessions_are_dated_by_the_business_day(client, make_user, admin):
+    user = make_user()
+    # 20:00 UTC is 01:30 the next morning in REPORT_TIMEZONE (Asia/Kolkata)
+    _upload(client, admin, _event(f"{user.id}-in", user, "in", 20), _event(f"{user.id}-out", user, "out", 23))
+
+    with SessionLocal() as db:
+        dates = db.execute(select(AttendanceSession.date).where(AttendanceSession.user_id == user.id)).scalars().all()
+    assert dates == [date(2024, 3, 5)]
+
+
+def test_session_closed_concurrently_is_not_overwritten(client, make_user, admin):
+    from sqlalchemy import event
+
+    from app.core.database import async_engine
+
+    user = make_user()
+    _upload(client, admin, _event(f"{user.id}-in", user, "in", 9))
+
+    def close_meanwhile(conn, cursor, statement, parameters, context, executemany):
+        # An app punch-out commits between the batch reading the open session and closing it
+        if statement.lstrip().startswith("SELECT attendance_sessions.id") and "punch_out IS NULL" in statement:
+            other = conn.connection.cursor()
+            other.execute("UPDATE attendance_sessions SET punch_out = '2024-03-04 12:00:00.000000', duration = 3.0 "
+                          "WHERE user_id = ? AND punch_out IS NULL", (user.id,))
+            other.close()
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", close_meanwhile)
+    try:
+        response = client.post("/attendance/punches/bulk", headers=admin.headers,
+                               json={"events": [_event(f"{user.id}-out", user, "out", 17)]})
+    finally:
+        event.remove(async_engine.sync_engine, "after_cursor_execute", close_meanwhile)
+
+    assert response.json()["status_code"] == 400
+    assert "closed concurrently" in response.json()["message"]
+    # The simulated close ran in the batch's own transaction, so the rollback undid it too
+    assert _sessions(user) == [(datetime(2024, 3, 4, 9), None, None)]
+
+
+def test_punch_out_after_midnight_closes_the_previous_days_session(client, make_user, admin):
+    user = make_user()
+    evening = {"event_id": f"{user.id}-in", "device_id": "gate-1", "user_id": user.id,
+               "timestamp": "2024-03-04T14:00:00Z", "direction": "in"}
+    morning = {"event_id": f"{user.id}-out", "device_id": "gate-1", "user_id": user.id,
+               "timestamp": "2024-03-05T02:00:00Z", "direction": "out"}
+
+    # Separate uploads, so the punch-out finds the session already stored
+    _upload(client, admin, evening)
+    result = _upload(client, admin, morning)
+
+    assert _statuses(result) == {f"{user.id}-out": "accepted"}
+    [session] = _sessions(user)
+    assert session.duration == 12
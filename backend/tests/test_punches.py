@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.attendance_session import AttendanceSession
+
+
+def _sessions(user_id):
+    with SessionLocal() as db:
+        return db.execute(
+            select(AttendanceSession.date, AttendanceSession.punch_in, AttendanceSession.punch_out)
+            .where(AttendanceSession.user_id == user_id)
+            .order_by(AttendanceSession.punch_in)
+        ).all()
+
+
+def test_punch_in_replays_with_the_same_idempotency_key(client, make_user):
+    user = make_user()
+    headers = dict(user.headers, **{"Idempotency-Key": "punch-in-1"})
+
+    first = client.post("/attendance/punch-in", headers=headers)
+    replay = client.post("/attendance/punch-in", headers=headers)
+
+    assert first.json()["success"]
+    assert replay.json() == first.json()
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert len(_sessions(user.id)) == 1
+
+    # A new key is a new request, refused while the session is open
+    again = client.post("/attendance/punch-in", headers=dict(user.headers, **{"Idempotency-Key": "punch-in-2"}))
+    assert again.json()["status_code"] == 400
+    assert len(_sessions(user.id)) == 1
+
+
+def test_idempotency_key_is_bound_to_its_endpoint(client, make_user):
+    user = make_user()
+    headers = dict(user.headers, **{"Idempotency-Key": "shared"})
+    client.post("/attendance/punch-in", headers=headers)
+
+    response = client.post("/attendance/punch-out", headers=headers)
+
+    assert response.status_code == 422
+    assert _sessions(user.id)[0].punch_out is None
+
+
+def test_punch_out_replays_without_closing_twice(client, make_user):
+    user = make_user()
+    client.post("/attendance/punch-in", headers=user.headers)
+    headers = dict(user.headers, **{"Idempotency-Key": "punch-out-1"})
+
+    first = client.post("/attendance/punch-out", headers=headers)
+    replay = client.post("/attendance/punch-out", headers=headers)
+
+    assert first.status_code == 200
+    assert first.json()["punch_out"] is not None
+    assert replay.json() == first.json()
+    [session] = _sessions(user.id)
+    assert session.punch_out is not None
+
+
+def test_a_session_left_open_on_an_earlier_day_is_the_one_punched_out(client, make_user, add_session):
+    user = make_user()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    add_session(user.id, yesterday)
+
+    refused = client.post("/attendance/punch-in", headers=user.headers)
+    assert refused.json()["status_code"] == 400
+
+    response = client.post("/attendance/punch-out", headers=user.headers)
+    assert response.status_code == 200
+    [session] = _sessions(user.id)
+    assert session.date == yesterday.date()
+    assert session.punch_out is not None
+    assert response.json()["duration"] >= 24
+
+    assert client.post("/attendance/punch-in", headers=user.headers).json()["success"]
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.config.settings import DOWNLOAD_URL_TTL_SECONDS
+from app.utils import signed_downloads
+from app.utils.signed_downloads import sign_download, verify_download
+
+
+def _parts(url):
+    parts = urlsplit(url)
+    query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    return parts.path.rsplit("/", 1)[1], int(query["user_id"]), int(query["expires"]), query["signature"]
+
+
+def _freeze(monkeypatch, now):
+    monkeypatch.setattr(signed_downloads, "time", SimpleNamespace(time=lambda: now))
+
+
+def test_link_verifies_for_its_file_user_and_session_only():
+    name, user_id, expires, signature = _parts(sign_download("report.csv", 7, "token-1"))
+
+    assert name == "report.csv" and user_id == 7
+    assert "token-1" not in sign_download("report.csv", 7, "token-1")
+    assert verify_download(name, user_id, expires, signature, "token-1")
+    assert not verify_download("other.csv", user_id, expires, signature, "token-1")
+    assert not verify_download(name, 8, expires, signature, "token-1")
+    assert not verify_download(name, user_id, expires + DOWNLOAD_URL_TTL_SECONDS, signature, "token-1")
+    assert not verify_download(name, user_id, expires, signature, "token-2")
+    assert not verify_download(name, user_id, expires, signature, None)
+
+
+def test_link_is_stable_within_a_window_and_lasts_at_least_the_ttl(monkeypatch):
+    start = 1_700_000_000 // DOWNLOAD_URL_TTL_SECONDS * DOWNLOAD_URL_TTL_SECONDS
+    _freeze(monkeypatch, start)
+    url = sign_download("report.csv", 7, "token-1")
+    _freeze(monkeypatch, start + DOWNLOAD_URL_TTL_SECONDS - 1)
+    assert sign_download("report.csv", 7, "token-1") == url
+
+    _, _, expires, signature = _parts(url)
+    _freeze(monkeypatch, start + DOWNLOAD_URL_TTL_SECONDS * 2 - 1)
+    assert verify_download("report.csv", 7, expires, signature, "token-1")
+    _freeze(monkeypatch, expires + 1)
+    assert not verify_download("report.csv", 7, expires, signature, "token-1")
+
+
+@pytest.fixture
+def export_url(client, make_user, admin):
+    user = make_user()
+    event = {"device_id": "gate-1", "user_id": user.id, "timestamp": "2024-03-05T10:00:00Z"}
+    client.post("/attendance/punches/bulk", headers=admin.headers, json={"events": [
+        dict(event, event_id=f"{user.id}-in", direction="in"),
+        dict(event, event_id=f"{user.id}-out", timestamp="2024-03-05T12:00:00Z", direction="out"),
+    ]})
+    response = client.get("/attendance/download/me", headers=user.headers,
+                          params={"format": "csv", "start_date": "2024-03-05"})
+    body = response.json()
+    assert body["success"], body
+    return user, body["data"]["file_url"]
+
+
+def test_signed_link_downloads_without_a_token(client, export_url):
+    user, url = export_url
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert user.email in response.text
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda query: query.replace("user_id=", "user_id=9"),
+    lambda query: query.replace("signature=", "signature=x"),
+])
+def test_tampered_link_is_refused(client, export_url, tamper):
+    _, url = export_url
+    path, query = url.split("?")
+
+    assert client.get(f"{path}?{tamper(query)}").status_code == 403
+
+
+def test_expired_link_is_refused(client, export_url, monkeypatch):
+    _, url = export_url
+    _, _, expires, _ = _parts(url)
+
+    _freeze(monkeypatch, expires + 1)
+
+    assert client.get(url).status_code == 403
+
+
+def test_link_stops_working_after_logout(client, export_url):
+    user, url = export_url
+
+    assert client.post("/auth/logout", headers=user.headers).json()["success"]
+
+    assert client.get(url).status_code == 403
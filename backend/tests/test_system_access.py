@@ -0,0 +1,53 @@
+import pytest
+
+from app.routes import metrics_route
+
+SYSTEM_STATS = ["/system/db-pool", "/system/password-pool", "/system/daily-view-cache", "/system/live-feed",
+                "/system/export-cache"]
+
+
+@pytest.mark.parametrize("path", SYSTEM_STATS)
+def test_system_stats_are_admin_only(client, make_user, admin, path):
+    employee = make_user()
+
+    assert client.get(path, headers=employee.headers).json()["status_code"] == 403
+    assert client.get(path, headers=admin.headers).json()["success"]
+
+
+@pytest.mark.parametrize("path", ["/attendance/", "/attendance/download/all?format=csv&start_date=2024-01-01"])
+def test_company_wide_attendance_is_admin_only(client, make_user, admin, path):
+    employee = make_user()
+
+    assert client.get(path, headers=employee.headers).json()["status_code"] == 403
+    assert client.get(path, headers=admin.headers).json().get("status_code") != 403
+
+
+def test_metrics_require_an_admin(client, make_user, admin):
+    employee = make_user()
+
+    assert client.get("/metrics").status_code in (401, 403)
+    assert client.get("/metrics", headers=employee.headers).status_code == 403
+    response = client.get("/metrics", headers=admin.headers)
+    assert response.status_code == 200
+    assert "# TYPE http_requests_total counter" in response.text
+
+
+def test_metrics_accept_the_scrape_token(client, monkeypatch):
+    monkeypatch.setattr(metrics_route, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_metrics_label_requests_with_the_full_route_template(client, admin):
+    client.get("/user/", headers=admin.headers)
+    client.get("/auth/me", headers=admin.headers)
+    client.get("/attendance/export-jobs/no-such-job", headers=admin.headers)
+
+    metrics = client.get("/metrics", headers=admin.headers).text
+
+    assert 'http_requests_total{method="GET",route="/user/",status="200"}' in metrics
+    assert 'http_requests_total{method="GET",route="/auth/me",status="200"}' in metrics
+    assert 'route="/attendance/export-jobs/{job_id}"' in metrics
+    assert 'route="/me"' not in metrics
+    assert 'route="/"' not in metrics
@@ -0,0 +1,54 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.utils.timezones import business_date, format_local_times, get_zone, resolve_display_timezone, utc_to_local
+
+
+def test_zones_are_built_once_per_name():
+    assert get_zone("Asia/Kolkata") is get_zone("Asia/Kolkata")
+
+
+def test_unknown_display_timezones_are_rejected():
+    assert resolve_display_timezone("Europe/Berlin") == "Europe/Berlin"
+    with pytest.raises(ValueError, match="Unknown timezone"):
+        resolve_display_timezone("Mars/Olympus_Mons")
+
+
+def test_naive_utc_is_converted_to_the_requested_zone():
+    local = utc_to_local(datetime(2024, 1, 15, 20, 0), "America/New_York")
+
+    assert (local.date(), local.hour) == (date(2024, 1, 15), 15)
+    assert utc_to_local(datetime(2024, 1, 15, 20, 0, tzinfo=timezone.utc), "UTC").hour == 20
+    assert utc_to_local(None, "UTC") is None
+
+
+def test_business_date_follows_the_report_timezone():
+    # 18:30 UTC is midnight in Asia/Kolkata, the default REPORT_TIMEZONE
+    assert business_date(datetime(2024, 1, 15, 18, 29)) == date(2024, 1, 15)
+    assert business_date(datetime(2024, 1, 15, 18, 30)) == date(2024, 1, 16)
+
+
+def test_batches_are_formatted_as_wall_clock_times():
+    values = [datetime(2024, 3, 9, 15, 5, 7), None, datetime(2024, 3, 11, 15, 5, 7)]
+
+    # New York moves to daylight time on 2024-03-10
+    assert format_local_times(values, "America/New_York") == ["10:05:07", None, "11:05:07"]
+    assert format_local_times(values, "Asia/Kolkata") == ["20:35:07", None, "20:35:07"]
+    assert format_local_times([], "UTC") == []
+
+
+def test_seeded_shifts_start_in_the_report_timezone():
+    import random
+
+    from app.seed.synthetic_data import SHIFT_START_JITTER_MINUTES, generate_day
+
+    rng = random.Random(7)
+    day = date(2024, 6, 3)
+    starts = [sessions[0]["punch_in"] for sessions in (generate_day(rng, 1, day, False, datetime(2024, 6, 3))
+                                                        for _ in range(50)) if sessions]
+
+    assert starts and all(business_date(start) == day for start in starts)
+    # 09:30 Asia/Kolkata is 04:00 UTC
+    assert all(abs((start - datetime(2024, 6, 3, 4, 0)).total_seconds()) <= SHIFT_START_JITTER_MINUTES * 60
+               for start in starts)
@@ -0,0 +1,70 @@
+import time
+
+from app.models.user import UserRole
+from app.utils.token_cache import LocalTokenCache, UserSnapshot, token_cache_stats
+
+
+def _snapshot(user_id, token="token"):
+    return UserSnapshot(id=user_id, name="Asha", email="asha@example.com", role=UserRole.employee,
+                        access_token=token)
+
+
+def test_entries_expire():
+    cache = LocalTokenCache(max_size=10)
+    cache.set("live", _snapshot(1), time.time() + 60)
+    cache.set("stale", _snapshot(1), time.time() - 1)
+
+    assert cache.get("live") == _snapshot(1)
+    assert cache.get("stale") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LocalTokenCache(max_size=2)
+    expires = time.time() + 60
+    cache.set("a", _snapshot(1), expires)
+    cache.set("b", _snapshot(2), expires)
+    cache.get("a")
+    cache.set("c", _snapshot(3), expires)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.size() == 2
+
+
+def test_invalidate_user_drops_only_their_tokens():
+    cache = LocalTokenCache(max_size=10)
+    expires = time.time() + 60
+    cache.set("a1", _snapshot(1), expires)
+    cache.set("a2", _snapshot(1), expires)
+    cache.set("b", _snapshot(2), expires)
+
+    cache.invalidate_user(1)
+
+    assert cache.get("a1") is None and cache.get("a2") is None
+    assert cache.get("b") == _snapshot(2)
+
+
+def test_repeat_requests_are_served_from_the_cache(client, make_user):
+    user = make_user()
+    client.get("/auth/me", headers=user.headers)
+    hits = token_cache_stats()["hits"]
+
+    assert client.get("/auth/me", headers=user.headers).json()["data"]["email"] == user.email
+    assert token_cache_stats()["hits"] == hits + 1
+
+
+def test_logout_revokes_a_cached_token(client, make_user):
+    user = make_user()
+    assert client.get("/auth/me", headers=user.headers).status_code == 200
+
+    client.post("/auth/logout", headers=user.headers)
+
+    assert client.get("/auth/me", headers=user.headers).status_code == 401
+
+
+def test_stats_are_admin_only(client, make_user, admin):
+    employee = make_user()
+
+    assert client.get("/auth/token-cache/stats", headers=employee.headers).json()["status_code"] == 403
+    stats = client.get("/auth/token-cache/stats", headers=admin.headers).json()["data"]
+    assert stats["enabled"] and stats["backend"] == "local"
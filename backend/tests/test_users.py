@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.user import User
+
+
+def _pages(client, headers, **params):
+    """Every page of GET /user/, following next_cursor; returns the pages' user lists."""
+    pages, cursor = [], None
+    while True:
+        response = client.get("/user/", params=dict(params, cursor=cursor) if cursor else params, headers=headers)
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        pages.append(data["users"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def _all_users(*order_by):
+    with SessionLocal() as db:
+        return [row.id for row in db.execute(select(User.id).order_by(*order_by))]
+
+
+@pytest.mark.parametrize("sort_by, sort_order, order_by", [
+    ("id", "desc", [User.id.desc()]),
+    ("name", "asc", [User.name.asc(), User.id.asc()]),
+    ("name", "desc", [User.name.desc(), User.id.desc()]),
+    ("email", "asc", [User.email.asc(), User.id.asc()]),
+])
+def test_cursor_paging_visits_every_user_once(client, make_user, admin, sort_by, sort_order, order_by):
+    # Equal names make the id tie-breaker matter
+    for _ in range(4):
+        make_user(name="Same Name")
+    make_user()
+
+    pages = _pages(client, admin.headers, limit=3, sort_by=sort_by, sort_order=sort_order)
+
+    assert all(len(page) == 3 for page in pages[:-1])
+    assert [user["id"] for page in pages for user in page] == _all_users(*order_by)
+
+
+def test_rows_inserted_before_the_cursor_do_not_shift_later_pages(client, make_user, admin):
+    for number in range(6):
+        make_user(name=f"Paging {number}")
+    params = {"sort_by": "name", "sort_order": "asc"}
+    first = client.get("/user/", params=dict(params, limit=2), headers=admin.headers).json()["data"]
+    seen = [user["id"] for user in first["users"]]
+
+    # Sorts ahead of the first page; offset paging would repeat a row on the next page
+    inserted = make_user(name="!Inserted meanwhile")
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get("/user/", params=dict(params, limit=100, cursor=cursor), headers=admin.headers).json()["data"]
+        seen += [user["id"] for user in page["users"]]
+        cursor = page["next_cursor"]
+
+    assert seen == [user_id for user_id in _all_users(User.name.asc(), User.id.asc()) if user_id != inserted.id]
+
+
+def test_cursor_must_match_the_sort(client, admin):
+    first = client.get("/user/", params={"limit": 1, "sort_by": "name", "sort_order": "asc"}, headers=admin.headers)
+    cursor = first.json()["data"]["next_cursor"]
+
+    response = client.get("/user/", params={"limit": 1, "sort_by": "email", "sort_order": "asc", "cursor": cursor},
+                          headers=admin.headers)
+    assert response.status_code == 400
+
+    response = client.get("/user/", params={"cursor": "not-a-cursor"}, headers=admin.headers)
+    assert response.status_code == 400